@@ -25,10 +25,8 @@ pl.close("all")
 
 data = pl.loadtxt("data/mmlotka_nt_12000_400.csv", delimiter=" ", skiprows=1)
 
-dN = 1
-
-t = data[::dN,0]
-b_rel = data[:-1:dN, 3:]
+t = data[:,0]
+b_rel = data[:-1, 3:]
 
 max_switches = [5, 2, 3]
 
@@ -40,8 +38,10 @@ binapprox.set_n_max_switches(n_max_switches=max_switches)
 #binapprox.set_min_up_times([2.0, 2.0, 2.0])
 #binapprox.set_cia_norm("row_sum_norm")
 
-combina = pycombina.CombinaBnB(binapprox)
-combina.solve(max_iter= int(5e6), max_cpu_time=3.6e3)
+# solve on successively refined time grids, starting from at most 250
+# time intervals, instead of solving on all 12000 time intervals at once
+combina = pycombina.CombinaMultilevel(binapprox, n_t_coarse=250)
+combina.solve(max_iter=int(5e6), max_cpu_time=3.6e3)
 
 b_bin = pl.asarray(binapprox.b_bin)
 
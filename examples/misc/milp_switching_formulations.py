@@ -0,0 +1,65 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+# Compare the standard and the compact formulation of the maximum switching
+# and dwell time constraints of CombinaMILP on the Lotka-Volterra data
+
+import argparse as ap
+import io
+import contextlib
+
+import numpy as np
+
+from pycombina import BinApprox, CombinaMILP
+
+parser = ap.ArgumentParser()
+parser.add_argument('--max_switches', metavar='count', type=int, nargs=3, default=[5, 2, 3], help='specify maximum number of switches')
+parser.add_argument('--min_up_times', metavar='secs', type=float, nargs=3, default=None, help='specify minimum up-times')
+parser.add_argument('--dN', metavar='count', type=int, default=60, help='use every dN-th time point of the data only')
+parser.add_argument('--solver', type=str, choices=['gurobi', 'highs'], default=None, metavar='name', help='specify MILP solver')
+parser.add_argument('--time_limit', metavar='secs', type=float, default=300.0, help='time limit of the MILP solver per formulation')
+args = parser.parse_args()
+
+data = np.loadtxt("../data/mmlotka_nt_12000_400.csv", delimiter = " ", skiprows = 1)
+
+t = data[::args.dN, 0]
+b_rel = data[:-1:args.dN, 3:]
+
+print("{:>11s} {:>10s} {:>12s} {:>10s} {:>10s} {:>10s}  {}".format("formulation", \
+    "variables", "constraints", "setup [s]", "solve [s]", "eta", "status"))
+
+for switching_formulation in ["standard", "compact"]:
+
+    binapprox = BinApprox(t = t, b_rel = b_rel, binary_threshold = 1e-3)
+    binapprox.set_n_max_switches(n_max_switches = args.max_switches)
+
+    if args.min_up_times is not None:
+        binapprox.set_min_up_times(args.min_up_times)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+
+        combina = CombinaMILP(binapprox, solver = args.solver, \
+            switching_formulation = switching_formulation)
+        combina.solve(gurobi_opts = {"TimeLimit": args.time_limit, "OutputFlag": 0}, \
+            highs_opts = {"time_limit": args.time_limit})
+
+    print("{:>11s} {:>10d} {:>12d} {:>10.2f} {:>10.2f} {:>10.6f}  {}".format( \
+        switching_formulation, *combina.model_size, combina.setup_time, \
+        combina.solution_time, binapprox.eta, combina.status))
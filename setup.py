@@ -33,5 +33,9 @@ setup(
                 *glob.glob("src/combina_bnb_solver/**/*.cpp"),
             ],
         ),
+        Pybind11Extension(
+            name="pycombina._combina_sur_solver",
+            sources=glob.glob("src/combina_sur_solver/*.cpp"),
+        ),
     ]
 )
@@ -0,0 +1,93 @@
+/*
+ * AlignedAllocator.hpp
+ *
+ * This file is part of pycombina.
+ *
+ * Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+ *
+ * pycombina is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Lesser General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * pycombina is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU Lesser General Public License for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+ *
+ */
+
+#ifndef __COMBINA_ALIGNED_ALLOCATOR_HPP
+#define __COMBINA_ALIGNED_ALLOCATOR_HPP
+
+#include <cstddef>
+#include <cstdint>
+#include <cstdlib>
+#include <new>
+#include <vector>
+
+
+/**
+ * \brief Allocator returning memory aligned to a given power of two.
+ *
+ * The raw pointer obtained from malloc is stored immediately before the
+ * aligned block, so that the allocator works without C++17 aligned new.
+ */
+template <class T, std::size_t Alignment>
+class AlignedAllocator {
+public:
+    typedef T value_type;
+
+    template <class U>
+    struct rebind {
+        typedef AlignedAllocator<U, Alignment> other;
+    };
+
+    AlignedAllocator() noexcept {}
+
+    template <class U>
+    AlignedAllocator(const AlignedAllocator<U, Alignment>&) noexcept {}
+
+    T* allocate(std::size_t n) {
+        void* raw = std::malloc(n * sizeof(T) + Alignment + sizeof(void*));
+        if(!raw) {
+            throw std::bad_alloc();
+        }
+
+        std::uintptr_t start = reinterpret_cast<std::uintptr_t>(raw) + sizeof(void*);
+        std::uintptr_t aligned = (start + Alignment - 1) & ~std::uintptr_t(Alignment - 1);
+        reinterpret_cast<void**>(aligned)[-1] = raw;
+
+        return reinterpret_cast<T*>(aligned);
+    }
+
+    void deallocate(T* p, std::size_t) noexcept {
+        if(p) {
+            std::free(reinterpret_cast<void**>(p)[-1]);
+        }
+    }
+};
+
+template <class T, class U, std::size_t Alignment>
+bool operator==(const AlignedAllocator<T, Alignment>&, const AlignedAllocator<U, Alignment>&) {
+    return true;
+}
+
+template <class T, class U, std::size_t Alignment>
+bool operator!=(const AlignedAllocator<T, Alignment>&, const AlignedAllocator<U, Alignment>&) {
+    return false;
+}
+
+/// Alignment of the solver data buffers, one cache line.
+static const std::size_t COMBINA_ALIGNMENT = 64;
+
+/// Number of doubles processed per SIMD instruction (AVX).
+static const unsigned int COMBINA_SIMD_WIDTH = 4;
+
+template <class T>
+using aligned_vector = std::vector<T, AlignedAllocator<T, COMBINA_ALIGNMENT>>;
+
+#endif /* end of include guard: __COMBINA_ALIGNED_ALLOCATOR_HPP */
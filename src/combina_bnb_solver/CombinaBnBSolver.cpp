@@ -55,11 +55,11 @@ static Value get_with_default(const Map& map, const Key& key, const Value& def)
 }
 
 
-CombinaBnBSolver::CombinaBnBSolver(std::vector<double> const & dt, 
-                       std::vector<std::vector<double>> const & b_rel,
+CombinaBnBSolver::CombinaBnBSolver(double const * dt, 
+                       double const * b_rel,
                        
-                       unsigned int const & n_c,
-                       unsigned int const & n_t,
+                       unsigned int const n_c,
+                       unsigned int const n_t,
 
                        std::vector<unsigned int> const & n_max_switches,
                        std::vector<double> const & min_up_time,
@@ -67,36 +67,34 @@ CombinaBnBSolver::CombinaBnBSolver(std::vector<double> const & dt,
                        std::vector<double> const & max_up_time,
                        std::vector<double> const & total_max_up_time,
 
-                       std::vector<std::vector<unsigned int>> const & b_valid,
+                       unsigned char const * b_valid,
                        std::vector<std::vector<unsigned int>> const & b_adjacencies,
 
                        unsigned int const & b_active_pre)
 
-    : dt(dt),
-      b_rel(b_rel),
-
-      n_c(n_c),
+    : n_c(n_c),
       n_t(n_t),
 
+      n_c_stride(((n_c + COMBINA_SIMD_WIDTH - 1) / COMBINA_SIMD_WIDTH) * COMBINA_SIMD_WIDTH),
+
       n_max_switches(n_max_switches),
       min_up_time(min_up_time),
       min_down_time(min_down_time),
       max_up_time(max_up_time),
       total_max_up_time(total_max_up_time),
 
-      b_valid(b_valid),
-      b_adjacencies(b_adjacencies),
-
       b_active_pre(b_active_pre),
-
-      sum_eta(2, std::vector<std::vector<double>> (b_rel.size(), 
-        std::vector<double> (b_rel[0].size()))),
+      eta_pre(n_c, 0.0),
+      up_time_pre(0.0),
 
       node_queue(nullptr),
       best_node(nullptr),
       ub_bnb(0.0),
 
-      b_bin(b_rel.size(), std::vector<unsigned int>(b_rel[0].size(), 0)),
+      b_bin(size_t(n_c) * n_t, 0),
+
+      warm_start_available(false),
+      eta_warm_start(0.0),
   
       n_iter(0),
       n_print(0),
@@ -116,6 +114,7 @@ CombinaBnBSolver::CombinaBnBSolver(std::vector<double> const & dt,
 
 {
 
+    pack_problem_data(dt, b_rel, b_valid, b_adjacencies);
     prepare_bnb();
 
 }
@@ -126,6 +125,45 @@ CombinaBnBSolver::~CombinaBnBSolver(){
 }
 
 
+void CombinaBnBSolver::pack_problem_data(double const * dt_in,
+    double const * b_rel_in, unsigned char const * b_valid_in,
+    std::vector<std::vector<unsigned int>> const & b_adjacencies_in) {
+
+    const size_t n_rows = size_t(n_t) + 1;
+
+    dt.assign(n_rows, 0.0);
+    std::copy(dt_in, dt_in + n_t, dt.begin());
+
+    b_rel.assign(n_rows * n_c_stride, 0.0);
+    b_valid.assign(n_rows * n_c_stride, 0);
+
+    for(unsigned int i = 0; i < n_c; i++) {
+
+        double const * b_rel_i = b_rel_in + size_t(i) * n_t;
+        unsigned char const * b_valid_i = b_valid_in + size_t(i) * n_t;
+
+        for(unsigned int j = 0; j < n_t; j++) {
+
+            b_rel[size_t(j) * n_c_stride + i] = b_rel_i[j];
+            b_valid[size_t(j) * n_c_stride + i] = b_valid_i[j];
+        }
+    }
+
+    b_adjacencies.assign(size_t(n_c) * n_c, 0);
+
+    for(unsigned int i = 0; i < n_c; i++) {
+
+        for(unsigned int k = 0; k < n_c; k++) {
+
+            b_adjacencies[size_t(i) * n_c + k] = (unsigned char)(b_adjacencies_in[i][k]);
+        }
+    }
+
+    sum_eta_rel.assign(n_rows * n_c_stride, 0.0);
+    sum_eta_bin.assign(n_rows * n_c_stride, 0.0);
+}
+
+
 void CombinaBnBSolver::prepare_bnb() {
 
     compute_initial_upper_bound();
@@ -136,31 +174,223 @@ void CombinaBnBSolver::prepare_bnb() {
 
 void CombinaBnBSolver::compute_initial_upper_bound() {
 
+    // deviations can grow by at most the length of the time horizon, the
+    // bound is doubled so that solutions attaining this value are not pruned
+
+    double eta_pre_max = 0.0;
+
+    for(unsigned int i = 0; i < eta_pre.size(); i++) {
+
+        eta_pre_max = fmax(eta_pre_max, fabs(eta_pre[i]));
+    }
+
+    ub_bnb = eta_pre_max;
+
     for(unsigned int i = 0; i < n_t; i++) {
 
         ub_bnb += dt[i];
     }
+
+    ub_bnb *= 2.0;
 }
 
 
 void CombinaBnBSolver::precompute_sum_of_etas() {
 
+    // row n_t holds the empty sums and is already zero
+
+    for(int j = n_t-1; j >= 0; j--) {
+
+        const size_t row = size_t(j) * n_c_stride;
+        const double dt_j = dt[j];
+
+        double const * b_rel_j = &b_rel[row];
+        double const * sum_rel_next = &sum_eta_rel[row + n_c_stride];
+        double const * sum_bin_next = &sum_eta_bin[row + n_c_stride];
+        double * sum_rel_j = &sum_eta_rel[row];
+        double * sum_bin_j = &sum_eta_bin[row];
+
+        for(unsigned int i = 0; i < n_c; i++) {
+
+            sum_rel_j[i] = sum_rel_next[i] + dt_j * b_rel_j[i];
+            sum_bin_j[i] = sum_bin_next[i] + dt_j * (b_rel_j[i] - 1.0);
+        }
+    }
+}
+
+
+void CombinaBnBSolver::set_eta_pre(std::vector<double> const & eta_pre_in) {
+
+    if(eta_pre_in.size() != n_c) {
+
+        throw std::invalid_argument("eta_pre must be of size n_c.");
+    }
+
+    eta_pre = eta_pre_in;
+
+    compute_initial_upper_bound();
+}
+
+
+void CombinaBnBSolver::set_up_time_pre(double const up_time_pre_in) {
+
+    up_time_pre = up_time_pre_in;
+}
+
+
+void CombinaBnBSolver::reset_solution() {
+
+    // a solution or warm start of a previous problem is not kept
+
+    std::fill(b_bin.begin(), b_bin.end(), 0);
+    seq_b_active.clear();
+    seq_t_start.clear();
+
+    warm_start_available = false;
+    status = 1;
+}
+
+
+void CombinaBnBSolver::shift(double const * dt_tail, double const * b_rel_tail,
+    unsigned int const n_shift) {
+
+    if((n_shift == 0) || (n_shift >= n_t)) {
+
+        throw std::invalid_argument("The time horizon can be shifted by 1 to n_t-1 time intervals.");
+    }
+
+    const unsigned int n_keep = n_t - n_shift;
+
+    // the rows of the remaining time intervals are moved to the front, the
+    // zero row at time point n_t stays in place
+
+    std::copy(dt.begin() + n_shift, dt.begin() + n_t, dt.begin());
+    std::copy(b_rel.begin() + size_t(n_shift) * n_c_stride,
+        b_rel.begin() + size_t(n_t) * n_c_stride, b_rel.begin());
+
+    std::copy(dt_tail, dt_tail + n_shift, dt.begin() + n_keep);
+
     for(unsigned int i = 0; i < n_c; i++) {
 
-        sum_eta[0][i][n_t-1] = dt[n_t-1] * (b_rel[i][n_t-1]);
-        sum_eta[1][i][n_t-1] = dt[n_t-1] * (b_rel[i][n_t-1] - 1.0);
+        double const * b_rel_i = b_rel_tail + size_t(i) * n_shift;
 
-        for(int j = n_t-2; j >= 0; j--) {
+        for(unsigned int j = 0; j < n_shift; j++) {
 
-            sum_eta[0][i][j] = sum_eta[0][i][j+1] + dt[j] * b_rel[i][j];
-            sum_eta[1][i][j] = sum_eta[1][i][j+1] + dt[j] * (b_rel[i][j] - 1.0);
+            b_rel[size_t(n_keep + j) * n_c_stride + i] = b_rel_i[j];
         }
     }
+
+    precompute_sum_of_etas();
+    reset_solution();
+}
+
+
+void CombinaBnBSolver::set_b_valid(unsigned char const * b_valid_in) {
+
+    for(unsigned int i = 0; i < n_c; i++) {
+
+        unsigned char const * b_valid_i = b_valid_in + size_t(i) * n_t;
+
+        for(unsigned int j = 0; j < n_t; j++) {
+
+            b_valid[size_t(j) * n_c_stride + i] = b_valid_i[j];
+        }
+    }
+
+    reset_solution();
+}
+
+
+void CombinaBnBSolver::set_constraints(std::vector<unsigned int> const & n_max_switches_in,
+    std::vector<double> const & min_up_time_in,
+    std::vector<double> const & min_down_time_in,
+    std::vector<double> const & max_up_time_in,
+    std::vector<double> const & total_max_up_time_in,
+    unsigned int const & b_active_pre_in) {
+
+    if((n_max_switches_in.size() != n_c) || (min_up_time_in.size() != n_c) ||
+        (min_down_time_in.size() != n_c) || (max_up_time_in.size() != n_c) ||
+        (total_max_up_time_in.size() != n_c)) {
+
+        throw std::invalid_argument("All constraints must be of size n_c.");
+    }
+
+    n_max_switches = n_max_switches_in;
+    min_up_time = min_up_time_in;
+    min_down_time = min_down_time_in;
+    max_up_time = max_up_time_in;
+    total_max_up_time = total_max_up_time_in;
+    b_active_pre = b_active_pre_in;
+
+    reset_solution();
+}
+
+
+void CombinaBnBSolver::set_warm_start(unsigned char const * b_bin_ws) {
+
+    std::vector<double> eta(eta_pre);
+
+    eta_warm_start = 0.0;
+    b_bin_warm_start.assign(b_bin_ws, b_bin_ws + size_t(n_c) * n_t);
+    seq_b_active_warm_start.clear();
+    seq_t_start_warm_start.clear();
+
+    for(unsigned int j = 0; j < n_t; j++) {
+
+        double const * b_rel_j = &b_rel[size_t(j) * n_c_stride];
+        unsigned int b_active = n_c;
+
+        for(unsigned int i = 0; i < n_c; i++) {
+
+            if(b_bin_ws[size_t(i) * n_t + j]) {
+
+                b_active = i;
+            }
+        }
+
+        for(unsigned int i = 0; i < n_c; i++) {
+
+            eta[i] += dt[j] * (b_rel_j[i] - double(b_active == i));
+            eta_warm_start = fmax(eta_warm_start, fabs(eta[i]));
+        }
+
+        if(seq_b_active_warm_start.empty() || (seq_b_active_warm_start.back() != b_active)) {
+
+            seq_b_active_warm_start.push_back(b_active);
+            seq_t_start_warm_start.push_back(j);
+        }
+    }
+
+    warm_start_available = true;
 }
 
 
 void CombinaBnBSolver::run(bool use_warm_start) {
 
+    // the solver can be run repeatedly, e. g., after shifting the horizon
+
+    n_iter = 0;
+    n_print = 0;
+    user_interrupt = false;
+
+    compute_initial_upper_bound();
+
+    if(use_warm_start) {
+
+        if(!warm_start_available) {
+
+            throw std::runtime_error("No solution available for warm-starting.");
+        }
+
+        // the warm start is kept as solution unless a strictly better
+        // solution is found during the search
+
+        ub_bnb = fmin(ub_bnb, eta_warm_start);
+        b_bin = b_bin_warm_start;
+        seq_b_active = seq_b_active_warm_start;
+        seq_t_start = seq_t_start_warm_start;
+    }
+
     if(!node_queue) {
         node_queue = NodeQueue::create(this);
     }
@@ -192,12 +422,24 @@ bool CombinaBnBSolver::control_activation_forbidden(
     std::vector<double> total_up_time_child_test(total_up_time_parent);
     unsigned int depth_child_test(depth_child);
 
-    if (sigma_child[b_active_child] >= n_max_switches[b_active_child]) {
+    // the maximum up-time applies to each activation of a control
+
+    if (b_active_child != b_active_parent) {
+
+        up_time_child_test[b_active_child] = 0.0;
+    }
+
+    // a control without remaining switches can still be continued from
+    // b_active_pre, which is not a switch
+
+    if ((b_active_child != b_active_parent) &&
+        (sigma_child[b_active_child] >= n_max_switches[b_active_child])) {
 
         return true;
     }
         
-    if ((b_active_parent < n_c) && (sigma_child[b_active_parent] >= n_max_switches[b_active_parent])) {
+    if ((b_active_child != b_active_parent) && (b_active_parent < n_c) &&
+        (sigma_child[b_active_parent] >= n_max_switches[b_active_parent])) {
 
         return true;
     }
@@ -208,14 +450,22 @@ bool CombinaBnBSolver::control_activation_forbidden(
         return true;
     }
         
-    if ((b_active_parent < n_c) && (b_adjacencies[b_active_child][b_active_parent] == 0)) {
+    if ((b_active_parent < n_c) && (b_adjacencies[size_t(b_active_child) * n_c + b_active_parent] == 0)) {
 
         return true;
     }
 
+    // a control that cannot be switched off anymore stays active until the
+    // end of the time horizon, which must be valid on all remaining time
+    // intervals and within the maximum up-times
+
+    const bool active_until_end = (b_active_child == b_active_parent) ?
+        (n_max_switches[b_active_child] == 0) :
+        ((b_active_parent < n_c) && (sigma_child[b_active_child] + 1 == n_max_switches[b_active_child]));
+
     do {
 
-        if (b_valid[b_active_child][depth_child_test] != 1) {
+        if (b_valid[size_t(depth_child_test) * n_c_stride + b_active_child] != 1) {
 
             return true;
         }
@@ -225,7 +475,8 @@ bool CombinaBnBSolver::control_activation_forbidden(
         total_up_time_child_test[b_active_child] += dt[depth_child_test];
         depth_child_test++;
 
-    } while((min_up_time[b_active_child] > min_up_time_fulfilled) && (depth_child_test < n_t));
+    } while(((min_up_time[b_active_child] > min_up_time_fulfilled) || active_until_end) &&
+        (depth_child_test < n_t));
 
     return (up_time_child_test[b_active_child] > max_up_time[b_active_child] ||
         total_up_time_child_test[b_active_child] > total_max_up_time[b_active_child]);
@@ -244,24 +495,43 @@ void CombinaBnBSolver::compute_child_node_properties(
     if (b_active_child == b_active_parent) {
         min_up_time_fulfilled = min_up_time[b_active_child];
     }
+    else {
+        up_time_child[b_active_child] = 0.0;
+    }
+
+    if (*depth_child == 0) {
+
+        // controls without any switches keep their state on the whole
+        // time horizon, so their deviations are added at once
+
+        for(unsigned int i = 0; i < n_c; i++) {
+
+            if (n_max_switches[i] == 0) {
+
+                eta_child[i] += (i == b_active_child) ? sum_eta_bin[i] : sum_eta_rel[i];
+            }
+        }
+    }
 
     do {
 
+        const double dt_j = dt[*depth_child];
+        double const * b_rel_j = &b_rel[size_t(*depth_child) * n_c_stride];
+
         for(unsigned int i = 0; i < n_c; i++){
 
             if(sigma_child[i] < n_max_switches[i]) {
             
-                eta_child[i] += dt[*depth_child] * 
-                    (b_rel[i][*depth_child] - double(b_active_child == i));
+                eta_child[i] += dt_j * (b_rel_j[i] - double(b_active_child == i));
                 
             }
 
-            min_down_time_child[i] = fmax(0, min_down_time_child[i] - dt[*depth_child]);
+            min_down_time_child[i] = fmax(0, min_down_time_child[i] - dt_j);
         }
 
-        min_up_time_fulfilled += dt[*depth_child];
-        up_time_child[b_active_child] += dt[*depth_child];
-        total_up_time_child[b_active_child] += dt[*depth_child];
+        min_up_time_fulfilled += dt_j;
+        up_time_child[b_active_child] += dt_j;
+        total_up_time_child[b_active_child] += dt_j;
         
         (*depth_child)++;
 
@@ -269,26 +539,46 @@ void CombinaBnBSolver::compute_child_node_properties(
     } while((min_up_time[b_active_child] > min_up_time_fulfilled) && (*depth_child < n_t));
 
 
-    if ((b_active_child != b_active_parent) && (b_active_parent < n_c)) {
+    if ((b_active_child == b_active_parent) && (n_max_switches[b_active_child] == 0)) {
+
+        // b_active_pre is continued and cannot be switched off anymore
+
+        const size_t row = size_t(*depth_child) * n_c_stride;
+
+        for (unsigned int i = 0; i < n_c; i++) {
+
+            if (sigma_child[i] < n_max_switches[i]) {
+
+                eta_child[i] += sum_eta_rel[row + i];
+            }
+        }
+
+        *depth_child = n_t;
+    }
+    else if ((b_active_child != b_active_parent) && (b_active_parent < n_c)) {
 
         sigma_child[b_active_parent]++;
         sigma_child[b_active_child]++;
         min_down_time_child[b_active_parent]= fmax(0, min_down_time[b_active_parent] - dt[*depth_child]);
 
+        const size_t row = size_t(*depth_child) * n_c_stride;
+
         if (sigma_child[b_active_parent] == n_max_switches[b_active_parent]) {
 
-            eta_child[b_active_parent] += sum_eta[0][b_active_parent][*depth_child];
+            eta_child[b_active_parent] += sum_eta_rel[row + b_active_parent];
         }
 
         if (sigma_child[b_active_child] == n_max_switches[b_active_child]) {
 
-            eta_child[b_active_child] += sum_eta[1][b_active_child][*depth_child];
+            eta_child[b_active_child] += sum_eta_bin[row + b_active_child];
+
+            double const * sum_rel_j = &sum_eta_rel[row];
 
             for (unsigned int i = 0; i < n_c; i++) {
 
                 if (sigma_child[i] < n_max_switches[i]) {
 
-                    eta_child[i] += sum_eta[0][i][*depth_child];
+                    eta_child[i] += sum_rel_j[i];
                 }
             }
 
@@ -541,12 +831,19 @@ void CombinaBnBSolver::add_nodes_to_queue(const NodePtr& parent_node) {
             depth_child = parent_node->get_depth();
         }
         else {
-            eta_child = std::vector<double>(n_c, 0.0);
+            eta_child = eta_pre;
             sigma_child = std::vector<unsigned int>(n_c, 0);
             min_down_time_child = std::vector<double>(n_c, 0.0);
             up_time_child = std::vector<double>(n_c, 0.0);
             total_up_time_child = std::vector<double>(n_c, 0.0);
             depth_child = 0;
+
+            // the activation of b_active_pre started prior to the time
+            // horizon, which counts towards its maximum up-time only
+
+            if (b_active_pre < n_c) {
+                up_time_child[b_active_pre] = up_time_pre;
+            }
         }
 
         if (!control_activation_forbidden(b_active_child,
@@ -600,6 +897,16 @@ void CombinaBnBSolver::retrieve_solution() {
 
     NodePtr active_node = best_node;
 
+    // without a new best node, the previous solution or the warm start
+    // is kept
+    const bool solution_found = bool(active_node);
+
+    if(solution_found) {
+        std::fill(b_bin.begin(), b_bin.end(), 0);
+        seq_b_active.clear();
+        seq_t_start.clear();
+    }
+
     while(active_node) {
         NodePtr parent_node = active_node->get_parent();
         node_range_begin = parent_node ? parent_node->get_depth() : 0;
@@ -607,11 +914,26 @@ void CombinaBnBSolver::retrieve_solution() {
         const size_t b_active = active_node->get_b_active();
         size_t idx = active_node->get_depth() - 1;
         do {
-            b_bin[b_active][idx] = 1;
+            b_bin[b_active * n_t + idx] = 1;
         } while(idx-- > node_range_begin);
 
+        // the path is traversed backwards, so the segment of a node starts
+        // where the segment of its parent ends
+        if(!seq_b_active.empty() && (seq_b_active.back() == b_active)) {
+            seq_t_start.back() = node_range_begin;
+        }
+        else {
+            seq_b_active.push_back(b_active);
+            seq_t_start.push_back(node_range_begin);
+        }
+
         active_node = std::move(parent_node);
     }
+
+    if(solution_found) {
+        std::reverse(seq_b_active.begin(), seq_b_active.end());
+        std::reverse(seq_t_start.begin(), seq_t_start.end());
+    }
    
     best_node.reset();
 
@@ -642,17 +964,29 @@ double CombinaBnBSolver::get_eta() const {
 }
 
 
-const std::vector<double>& CombinaBnBSolver::get_dt() const {
-    return dt;
+double const * CombinaBnBSolver::get_dt() const {
+    return dt.data();
 }
 
 
-std::vector<std::vector<unsigned int>> CombinaBnBSolver::get_b_bin() const {
+const std::vector<unsigned char>& CombinaBnBSolver::get_b_bin() const {
 
     return b_bin;
 }
 
 
+const std::vector<unsigned int>& CombinaBnBSolver::get_seq_b_active() const {
+
+    return seq_b_active;
+}
+
+
+const std::vector<unsigned int>& CombinaBnBSolver::get_seq_t_start() const {
+
+    return seq_t_start;
+}
+
+
 unsigned int CombinaBnBSolver::get_status() const {
 
     return status;
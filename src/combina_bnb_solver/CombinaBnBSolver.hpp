@@ -28,6 +28,7 @@
 #include <map>
 #include <vector>
 
+#include "AlignedAllocator.hpp"
 #include "combina_fwd.hpp"
 
 
@@ -35,11 +36,14 @@ class CombinaBnBSolver {
 
 public:
 
-    CombinaBnBSolver(std::vector<double> const & dt,
-               std::vector<std::vector<double>> const & b_rel,
+    // dt (n_t), b_rel (n_c x n_t) and b_valid (n_c x n_t) are row-major
+    // views on memory owned by the caller, which are read once during
+    // construction and packed into the time-major layout of the solver.
+    CombinaBnBSolver(double const * dt,
+               double const * b_rel,
                
-               unsigned int const & n_c,
-               unsigned int const & n_t,
+               unsigned int const n_c,
+               unsigned int const n_t,
                
                std::vector<unsigned int> const & n_max_switches,
                std::vector<double> const & min_up_time,
@@ -47,7 +51,7 @@ public:
                std::vector<double> const & max_up_time,
                std::vector<double> const & total_max_up_time,
 
-               std::vector<std::vector<unsigned int>> const & b_valid,
+               unsigned char const * b_valid,
                std::vector<std::vector<unsigned int>> const & b_adjacencies,
 
                unsigned int const & b_active_pre);
@@ -67,12 +71,45 @@ public:
     void set_verbosity(int v) { verbosity = v; }
     double get_solution_time() const {return solution_time; }
 
+    // accumulated deviations per control at the first time point, must be
+    // set prior to the warm start
+    void set_eta_pre(std::vector<double> const & eta_pre);
+
+    // time the control active prior to the time horizon has been active
+    // prior to it, counts towards the maximum up-time of its activation
+    void set_up_time_pre(double const up_time_pre);
+
+    // b_bin_warm_start (n_c x n_t) is a row-major binary solution that
+    // provides the initial upper bound when running with warm start
+    void set_warm_start(unsigned char const * b_bin_warm_start);
+
+    // shifts the time horizon by n_shift time intervals, the packed
+    // buffers are moved in place and dt_tail (n_shift) and b_rel_tail
+    // (n_c x n_shift, row-major) are appended at the end of the horizon
+    void shift(double const * dt_tail, double const * b_rel_tail,
+        unsigned int const n_shift);
+
+    // b_valid (n_c x n_t) is a row-major view that replaces the valid
+    // controls on the whole time horizon
+    void set_b_valid(unsigned char const * b_valid);
+
+    // replaces the constraints and the control active prior to the time
+    // horizon, e. g., for the next step of a receding horizon
+    void set_constraints(std::vector<unsigned int> const & n_max_switches,
+        std::vector<double> const & min_up_time,
+        std::vector<double> const & min_down_time,
+        std::vector<double> const & max_up_time,
+        std::vector<double> const & total_max_up_time,
+        unsigned int const & b_active_pre);
+
     void run(bool use_warm_start);
     void stop();
 
     double get_eta() const;
-    const std::vector<double>& get_dt() const;
-    std::vector<std::vector<unsigned int>> get_b_bin() const;
+    double const * get_dt() const;
+    const std::vector<unsigned char>& get_b_bin() const;
+    const std::vector<unsigned int>& get_seq_b_active() const;
+    const std::vector<unsigned int>& get_seq_t_start() const;
     unsigned int get_status() const;
     unsigned long get_num_sol() const;
     unsigned int get_num_time() const;
@@ -82,7 +119,11 @@ public:
 
 private:
     
+    void pack_problem_data(double const * dt_in, double const * b_rel_in,
+        unsigned char const * b_valid_in,
+        std::vector<std::vector<unsigned int>> const & b_adjacencies_in);
     void prepare_bnb();
+    void reset_solution();
     void compute_initial_upper_bound();
     void precompute_sum_of_etas();
 
@@ -121,32 +162,52 @@ private:
 
 */
 
-    std::vector<double> dt;
-    std::vector<std::vector<double>> b_rel;
-
     unsigned int n_c;
     unsigned int n_t;
 
+    // row stride of the time-major buffers, n_c padded to the SIMD width
+    unsigned int n_c_stride;
+
+    // dt and all time-major buffers hold an additional zero row for
+    // time point n_t, which is reached when a node completes the horizon
+    aligned_vector<double> dt;
+    aligned_vector<double> b_rel;
+
     std::vector<unsigned int> n_max_switches;
     std::vector<double> min_up_time;
     std::vector<double> min_down_time;
     std::vector<double> max_up_time;
     std::vector<double> total_max_up_time;
 
-    std::vector<std::vector<unsigned int>> b_valid;
-    std::vector<std::vector<unsigned int>> b_adjacencies;
+    aligned_vector<unsigned char> b_valid;
+
+    // b_adjacencies[b_active_child * n_c + b_active_parent]
+    std::vector<unsigned char> b_adjacencies;
 
     std::vector<double> min_down_time_pre;
     unsigned int b_active_pre;
+    std::vector<double> eta_pre;
+    double up_time_pre;
 
-    std::vector<std::vector<std::vector<double>>> sum_eta;
+    // sums of dt * b_rel (sum_eta_rel) and dt * (b_rel - 1) (sum_eta_bin)
+    // from each time point until the end of the time horizon
+    aligned_vector<double> sum_eta_rel;
+    aligned_vector<double> sum_eta_bin;
 
     std::shared_ptr<NodeQueue> node_queue;
     NodePtr best_node;
 
     double ub_bnb;
 
-    std::vector<std::vector<unsigned int>> b_bin;
+    std::vector<unsigned char> b_bin;
+    std::vector<unsigned int> seq_b_active;
+    std::vector<unsigned int> seq_t_start;
+
+    bool warm_start_available;
+    double eta_warm_start;
+    std::vector<unsigned char> b_bin_warm_start;
+    std::vector<unsigned int> seq_b_active_warm_start;
+    std::vector<unsigned int> seq_t_start_warm_start;
 
     long n_iter;
     long n_print;
@@ -77,6 +77,8 @@ public:
           monitors(std::move(monitor.monitors))
     {}
 
+    void add_monitor(MonitorPtr monitor) { monitors.push_front(monitor); }    ///< Adds a monitor to be notified.
+
     virtual void on_start_search();
     virtual void on_create(const NodePtr& node);
     virtual void on_select(const NodePtr& node);
@@ -21,20 +21,43 @@
  *
  */
 
+#include <algorithm>
+#include <cstdint>
 #include <map>
+#include <memory>
+#include <stdexcept>
 #include <vector>
 
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <pybind11/stl.h>
  
 #include "CombinaBnBSolver.hpp"
 #include "NodeQueue.hpp"
+#include "monitors/IncumbentMonitor.hpp"
 #include "monitors/VbcMonitor.hpp"
 
 namespace py = pybind11;
 
 
+// C-contiguous NumPy arrays that can be viewed without conversion
+using double_array = py::array_t<double, py::array::c_style>;
+using uint8_array = py::array_t<std::uint8_t, py::array::c_style>;
+
+
 // function prototypes
+static std::unique_ptr<CombinaBnBSolver> combina_wrap_init(double_array dt,
+    double_array b_rel, std::vector<unsigned int> const & n_max_switches,
+    std::vector<double> const & min_up_time, std::vector<double> const & min_down_time,
+    std::vector<double> const & max_up_time, std::vector<double> const & total_max_up_time,
+    uint8_array b_valid, std::vector<std::vector<unsigned int>> const & b_adjacencies,
+    unsigned int b_active_pre);
+static void combina_wrap_shift(CombinaBnBSolver& solver, double_array dt_tail,
+    double_array b_rel_tail);
+static void combina_wrap_set_b_valid(CombinaBnBSolver& solver, uint8_array b_valid);
+static void combina_wrap_set_warm_start(CombinaBnBSolver& solver, uint8_array b_bin);
+static py::array_t<std::uint8_t> combina_wrap_get_b_bin(CombinaBnBSolver const & solver);
+static py::tuple combina_wrap_get_switching_sequence(CombinaBnBSolver const & solver);
 static void combina_wrap_run(CombinaBnBSolver& solver, bool use_warm_start, py::kwargs kwargs);
 
 
@@ -50,25 +73,33 @@ PYBIND11_MODULE(_combina_bnb_solver, m)
 
     // set up combina solver interface
     py::class_<CombinaBnBSolver>(m, "CombinaBnBSolver")
-        .def(py::init<std::vector<double> const &,
-                      std::vector<std::vector<double>> const &,
+        // the solver reads dt, b_rel and b_valid in place, so these arrays
+        // are not converted implicitly
+        .def(py::init(&combina_wrap_init),
+            py::arg("dt").noconvert(), py::arg("b_rel").noconvert(),
+
+            py::arg("n_max_switches"), py::arg("min_up_time"),
+            py::arg("min_down_time"), py::arg("max_up_time"),
+            py::arg("total_max_up_time"),
 
-                      unsigned int const &,
-                      unsigned int const &,
+            py::arg("b_valid").noconvert(), py::arg("b_adjacencies"),
 
-                      std::vector<unsigned int> const &,
-                      std::vector<double> const &,
-                      std::vector<double> const &,
-                      std::vector<double> const &,
-                      std::vector<double> const &,
-                      
-                      std::vector<std::vector<unsigned int>> &,
-                      std::vector<std::vector<unsigned int>> &,
+            py::arg("b_active_pre"))
 
-                      unsigned int const &>())
+        .def("set_eta_pre", &CombinaBnBSolver::set_eta_pre, py::arg("eta_pre"))
+        .def("set_up_time_pre", &CombinaBnBSolver::set_up_time_pre, py::arg("up_time_pre"))
+        .def("shift", &combina_wrap_shift, py::arg("dt_tail").noconvert(),
+            py::arg("b_rel_tail").noconvert())
+        .def("set_b_valid", &combina_wrap_set_b_valid, py::arg("b_valid").noconvert())
+        .def("set_constraints", &CombinaBnBSolver::set_constraints,
+            py::arg("n_max_switches"), py::arg("min_up_time"),
+            py::arg("min_down_time"), py::arg("max_up_time"),
+            py::arg("total_max_up_time"), py::arg("b_active_pre"))
+        .def("set_warm_start", &combina_wrap_set_warm_start, py::arg("b_bin").noconvert())
 
         .def("get_eta", &CombinaBnBSolver::get_eta)
-        .def("get_b_bin", &CombinaBnBSolver::get_b_bin)
+        .def("get_b_bin", &combina_wrap_get_b_bin)
+        .def("get_switching_sequence", &combina_wrap_get_switching_sequence)
         .def("get_status", &CombinaBnBSolver::get_status)
         .def("get_solution_time", &CombinaBnBSolver::get_solution_time)
 
@@ -79,6 +110,122 @@ PYBIND11_MODULE(_combina_bnb_solver, m)
 }
 
 
+static std::unique_ptr<CombinaBnBSolver> combina_wrap_init(double_array dt,
+    double_array b_rel, std::vector<unsigned int> const & n_max_switches,
+    std::vector<double> const & min_up_time, std::vector<double> const & min_down_time,
+    std::vector<double> const & max_up_time, std::vector<double> const & total_max_up_time,
+    uint8_array b_valid, std::vector<std::vector<unsigned int>> const & b_adjacencies,
+    unsigned int b_active_pre) {
+
+    if(b_rel.ndim() != 2) {
+        throw std::invalid_argument("b_rel must be a two-dimensional array.");
+    }
+
+    const unsigned int n_c = b_rel.shape(0);
+    const unsigned int n_t = b_rel.shape(1);
+
+    if((dt.ndim() != 1) || (dt.shape(0) != n_t)) {
+        throw std::invalid_argument("dt must be a vector of length n_t.");
+    }
+
+    if((b_valid.ndim() != 2) || (b_valid.shape(0) != n_c) || (b_valid.shape(1) != n_t)) {
+        throw std::invalid_argument("b_valid must be of the same shape as b_rel.");
+    }
+
+    double const * dt_data = dt.data();
+    double const * b_rel_data = b_rel.data();
+    unsigned char const * b_valid_data = b_valid.data();
+
+    // preparation of the solver does not touch any Python objects
+    std::unique_ptr<CombinaBnBSolver> solver;
+    {
+        py::gil_scoped_release release;
+        solver.reset(new CombinaBnBSolver(dt_data, b_rel_data, n_c, n_t,
+            n_max_switches, min_up_time, min_down_time, max_up_time,
+            total_max_up_time, b_valid_data, b_adjacencies, b_active_pre));
+    }
+
+    return solver;
+}
+
+
+static void combina_wrap_shift(CombinaBnBSolver& solver, double_array dt_tail,
+    double_array b_rel_tail) {
+
+    const unsigned int n_c = solver.get_num_ctrl();
+
+    if(dt_tail.ndim() != 1) {
+        throw std::invalid_argument("dt_tail must be a vector.");
+    }
+
+    const unsigned int n_shift = dt_tail.shape(0);
+
+    if((b_rel_tail.ndim() != 2) || (b_rel_tail.shape(0) != n_c) || (b_rel_tail.shape(1) != n_shift)) {
+        throw std::invalid_argument("b_rel_tail must be of shape (n_c, len(dt_tail)).");
+    }
+
+    solver.shift(dt_tail.data(), b_rel_tail.data(), n_shift);
+}
+
+
+static void combina_wrap_set_b_valid(CombinaBnBSolver& solver, uint8_array b_valid) {
+
+    const unsigned int n_c = solver.get_num_ctrl();
+    const unsigned int n_t = solver.get_num_time();
+
+    if((b_valid.ndim() != 2) || (b_valid.shape(0) != n_c) || (b_valid.shape(1) != n_t)) {
+        throw std::invalid_argument("b_valid must be of the same shape as b_rel.");
+    }
+
+    solver.set_b_valid(b_valid.data());
+}
+
+
+static void combina_wrap_set_warm_start(CombinaBnBSolver& solver, uint8_array b_bin) {
+
+    const unsigned int n_c = solver.get_num_ctrl();
+    const unsigned int n_t = solver.get_num_time();
+
+    if((b_bin.ndim() != 2) || (b_bin.shape(0) != n_c) || (b_bin.shape(1) != n_t)) {
+        throw std::invalid_argument("b_bin must be of the same shape as b_rel.");
+    }
+
+    auto b = b_bin.unchecked<2>();
+    for(unsigned int j = 0; j < n_t; j++) {
+        unsigned int n_active = 0;
+        for(unsigned int i = 0; i < n_c; i++) {
+            n_active += (b(i, j) != 0);
+        }
+        if(n_active != 1) {
+            throw std::invalid_argument("Exactly one control must be active per time interval in b_bin.");
+        }
+    }
+
+    solver.set_warm_start(b_bin.data());
+}
+
+
+static py::array_t<std::uint8_t> combina_wrap_get_b_bin(CombinaBnBSolver const & solver) {
+    const std::vector<unsigned char>& b_bin = solver.get_b_bin();
+
+    py::array_t<std::uint8_t> result(std::vector<py::ssize_t>{
+        solver.get_num_ctrl(), solver.get_num_time()});
+    std::copy(b_bin.begin(), b_bin.end(), result.mutable_data());
+
+    return result;
+}
+
+
+static py::tuple combina_wrap_get_switching_sequence(CombinaBnBSolver const & solver) {
+    const std::vector<unsigned int>& b_active = solver.get_seq_b_active();
+    const std::vector<unsigned int>& t_start = solver.get_seq_t_start();
+
+    return py::make_tuple(
+        py::array_t<unsigned int>(b_active.size(), b_active.data()),
+        py::array_t<unsigned int>(t_start.size(), t_start.data()));
+}
+
+
 static void combina_wrap_run(CombinaBnBSolver& solver, bool use_warm_start, py::kwargs kwargs) {
     // create specialized node queue
     if(kwargs.contains("strategy")) {
@@ -139,9 +286,34 @@ static void combina_wrap_run(CombinaBnBSolver& solver, bool use_warm_start, py::
         solver.set_verbosity(py::cast<int>(kwargs["verbosity"]));
     }
 
+    // report new incumbents during this run if requested, in addition to
+    // the installed monitor
+    const MonitorPtr monitor = solver.get_monitor();
+
+    if(kwargs.contains("incumbent_callback") && !kwargs["incumbent_callback"].is_none()) {
+        auto inc_mon = std::make_shared<IncumbentMonitor>(&solver,
+            py::reinterpret_borrow<py::function>(kwargs["incumbent_callback"]));
+
+        if(monitor) {
+            auto multi_mon = std::make_shared<MultiMonitor>(&solver);
+            multi_mon->add_monitor(monitor);
+            multi_mon->add_monitor(inc_mon);
+            solver.set_monitor(multi_mon);
+        }
+        else {
+            solver.set_monitor(inc_mon);
+        }
+    }
+
     // invoke run function
-    {
+    try {
         py::gil_scoped_release release;
         solver.run(use_warm_start);
     }
+    catch(...) {
+        solver.set_monitor(monitor);
+        throw;
+    }
+
+    solver.set_monitor(monitor);
 }
@@ -0,0 +1,75 @@
+/*
+ * monitors/IncumbentMonitor.cpp
+ *
+ * This file is part of pycombina.
+ *
+ * Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+ *
+ * pycombina is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Lesser General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * pycombina is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU Lesser General Public License for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+ *
+ */
+
+#include <vector>
+
+#include <pybind11/numpy.h>
+
+#include "IncumbentMonitor.hpp"
+#include "../CombinaBnBSolver.hpp"
+#include "../Node.hpp"
+
+namespace py = pybind11;
+
+
+IncumbentMonitor::IncumbentMonitor(CombinaBnBSolver* solver, py::function callback)
+    : MonitorBase(solver),
+      callback_(std::move(callback))
+{}
+
+
+IncumbentMonitor::~IncumbentMonitor() {
+    // the callback is released while holding the interpreter lock
+    py::gil_scoped_acquire lock;
+    callback_ = py::function();
+}
+
+
+void IncumbentMonitor::on_change(const NodePtr& node, NodeState state) {
+    if(state != NODE_INTEGER) {
+        return;
+    }
+
+    const size_t n_c = solver->get_num_ctrl();
+    const size_t n_t = solver->get_num_time();
+
+    // each node of the path activates its control from the depth of its
+    // parent on until its own depth
+    std::vector<unsigned char> b_bin(n_c * n_t, 0);
+
+    for(NodePtr active_node = node; active_node; active_node = active_node->get_parent()) {
+        NodePtr parent_node = active_node->get_parent();
+        const size_t node_range_begin = parent_node ? parent_node->get_depth() : 0;
+        const size_t b_active = active_node->get_b_active();
+
+        for(size_t idx = node_range_begin; idx < active_node->get_depth(); ++idx) {
+            b_bin[b_active * n_t + idx] = 1;
+        }
+    }
+
+    py::gil_scoped_acquire lock;
+
+    py::array_t<unsigned char> b_bin_array({n_c, n_t});
+    std::copy(b_bin.begin(), b_bin.end(), b_bin_array.mutable_data());
+
+    callback_(node->get_lb(), b_bin_array);
+}
@@ -0,0 +1,54 @@
+/*
+ * monitors/IncumbentMonitor.hpp
+ *
+ * This file is part of pycombina.
+ *
+ * Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+ *
+ * pycombina is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Lesser General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * pycombina is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU Lesser General Public License for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+ *
+ */
+
+#ifndef __COMBINA_INCUMBENT_MONITOR_HPP
+#define __COMBINA_INCUMBENT_MONITOR_HPP
+
+#include <pybind11/pybind11.h>
+
+#include "../combina_fwd.hpp"
+#include "../Monitor.hpp"
+
+
+/**
+ * \brief Monitor class reporting new incumbents to a Python callback.
+ *
+ * Whenever the solver finds a new best integer node, the callback is
+ * invoked with the objective value and the binary controls (n_c x n_t) of
+ * the node, e. g., for passing the incumbent on to another solver running
+ * concurrently. The Python interpreter lock is acquired for the duration
+ * of the callback only.
+ */
+class IncumbentMonitor : public MonitorBase {
+private:
+    pybind11::function callback_;   ///< Callback receiving (eta, b_bin).
+
+public:
+    IncumbentMonitor(CombinaBnBSolver* solver, pybind11::function callback);
+    IncumbentMonitor(const IncumbentMonitor&) = delete;
+    IncumbentMonitor(IncumbentMonitor&&) = delete;
+    virtual ~IncumbentMonitor();
+
+    virtual void on_change(const NodePtr& node, NodeState state);
+};
+
+#endif /* end of include guard: __COMBINA_INCUMBENT_MONITOR_HPP */
@@ -150,7 +150,7 @@ void BestThenDiveNodeQueue::clear() {
 }
 
 double BestThenDiveNodeQueue::adjusted_lower_bound(const NodePtr& node) const {
-    const std::vector<double>& dt = solver->get_dt();
+    double const * dt = solver->get_dt();
     const std::vector<unsigned int>& max_sigma = solver->get_num_max_switches();
     const std::vector<unsigned int>& sigma = node->get_sigma();
     
@@ -161,7 +161,7 @@ double BestThenDiveNodeQueue::adjusted_lower_bound(const NodePtr& node) const {
         min_rem_sigma = std::min(min_rem_sigma, *max_it++ - *cur_it++);
     }
 
-    const double rem_time = std::accumulate(std::next(dt.cbegin(), node->get_depth()), dt.cend(), 0.0);
+    const double rem_time = std::accumulate(dt + node->get_depth(), dt + solver->get_num_time(), 0.0);
     return node->get_lb() + rem_time / (3 + 2 * min_rem_sigma);
 }
 
@@ -0,0 +1,462 @@
+/*
+ *
+ * CombinaSURSolver.cpp
+ *
+ * This file is part of pycombina.
+ *
+ * Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+ *
+ * pycombina is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Lesser General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * pycombina is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU Lesser General Public License for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+ *
+ */
+
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <limits>
+#include <stdexcept>
+
+#include "CombinaSURSolver.hpp"
+
+
+CombinaSURSolver::CombinaSURSolver(double const * dt,
+                       double const * b_rel,
+
+                       unsigned int const n_c,
+                       unsigned int const n_t,
+
+                       std::vector<unsigned int> const & n_max_switches,
+                       std::vector<double> const & min_up_time,
+                       std::vector<double> const & min_down_time,
+                       std::vector<double> const & max_up_time,
+                       std::vector<double> const & total_max_up_time,
+
+                       unsigned char const * b_valid,
+                       std::vector<std::vector<unsigned int>> const & b_adjacencies,
+
+                       unsigned int const b_active_pre)
+
+    : n_c(n_c),
+      n_t(n_t),
+
+      dt(dt, dt + n_t),
+      tau(n_t + 1, 0.0),
+      b_rel(size_t(n_c) * n_t),
+
+      n_max_switches(n_max_switches),
+      min_up_time(min_up_time),
+      min_down_time(min_down_time),
+      max_up_time(max_up_time),
+      total_max_up_time(total_max_up_time),
+
+      b_valid(size_t(n_c) * n_t),
+      b_adjacencies(size_t(n_c) * n_c, 1),
+
+      b_active_pre(b_active_pre),
+      eta_pre(n_c, 0.0),
+      up_time_pre(0.0),
+
+      valid_until(size_t(n_c) * n_t),
+
+      t_on(0.0),
+      max_dt(0.0),
+
+      b_active_t(n_t, 0),
+
+      b_bin(size_t(n_c) * n_t, 0),
+
+      solution_time(0.0),
+      status(1)
+
+{
+
+    for(unsigned int i = 0; i < n_c; i++) {
+        for(unsigned int j = 0; j < n_t; j++) {
+            this->b_rel[size_t(j) * n_c + i] = b_rel[size_t(i) * n_t + j];
+            this->b_valid[size_t(j) * n_c + i] = b_valid[size_t(i) * n_t + j];
+        }
+    }
+
+    for(unsigned int i = 0; i < std::min<size_t>(n_c, b_adjacencies.size()); i++) {
+        for(unsigned int k = 0; k < std::min<size_t>(n_c, b_adjacencies[i].size()); k++) {
+            this->b_adjacencies[size_t(i) * n_c + k] = (unsigned char)(b_adjacencies[i][k]);
+        }
+    }
+
+    for(unsigned int j = 0; j < n_t; j++) {
+        tau[j + 1] = tau[j] + dt[j];
+        max_dt = std::max(max_dt, dt[j]);
+    }
+
+    precompute_valid_until();
+
+}
+
+
+std::vector<std::string> const & CombinaSURSolver::get_strategies() {
+
+    static std::vector<std::string> const strategies {"sur", "sur_dt", "sur_sr", "nfr"};
+
+    return strategies;
+}
+
+
+std::vector<std::string> const & CombinaSURSolver::get_cia_norms() {
+
+    static std::vector<std::string> const cia_norms {"max_norm", "column_sum_norm", "row_sum_norm"};
+
+    return cia_norms;
+}
+
+
+void CombinaSURSolver::set_eta_pre(std::vector<double> const & eta_pre) {
+
+    if(eta_pre.size() != n_c) {
+        throw std::invalid_argument("eta_pre must contain one value per control.");
+    }
+
+    this->eta_pre = eta_pre;
+}
+
+
+void CombinaSURSolver::set_up_time_pre(double const up_time_pre) {
+
+    this->up_time_pre = up_time_pre;
+}
+
+
+void CombinaSURSolver::precompute_valid_until() {
+
+    for(unsigned int j = n_t; j-- > 0;) {
+        for(unsigned int i = 0; i < n_c; i++) {
+
+            const size_t k = size_t(j) * n_c + i;
+
+            if(b_valid[k] == 0) {
+                valid_until[k] = tau[j];
+            }
+            else {
+                valid_until[k] = (j + 1 < n_t) ? valid_until[k + n_c] : tau[n_t];
+            }
+        }
+    }
+}
+
+
+bool CombinaSURSolver::control_activation_admissible(unsigned int const b_active_child,
+    unsigned int const b_active_parent, unsigned int const j) const {
+
+    const unsigned int c = b_active_child;
+    const unsigned int p = b_active_parent;
+
+    if((b_valid[size_t(j) * n_c + c] == 0) || (tau[j] - t_off[c] < min_down_time[c])) {
+        return false;
+    }
+
+    unsigned int sigma_child = sigma[c];
+
+    if(p < n_c) {
+
+        if((b_adjacencies[size_t(c) * n_c + p] == 0) ||
+            (sigma[c] >= n_max_switches[c]) || (sigma[p] >= n_max_switches[p])) {
+
+            return false;
+        }
+
+        sigma_child++;
+    }
+
+    // the control must stay valid and within its up-time limits for its
+    // minimum up-time, or until the end of the time horizon if it cannot
+    // be switched off anymore; the maximum up-time applies to the new
+    // activation, the total maximum up-time to all activations
+
+    const double t_rest = tau[n_t] - tau[j];
+    const double t_block = (sigma_child >= n_max_switches[c]) ? t_rest :
+        std::min(std::max(min_up_time[c], dt[j]), t_rest);
+
+    return (valid_until[size_t(j) * n_c + c] - tau[j] >= t_block) &&
+        (t_block <= max_up_time[c]) &&
+        (up_time[c] + t_block <= total_max_up_time[c]);
+}
+
+
+bool CombinaSURSolver::control_continuation_admissible(unsigned int const b_active,
+    unsigned int const j) const {
+
+    // the current activation of the control active prior to the time
+    // horizon includes its up-time prior to the time horizon
+
+    return (b_valid[size_t(j) * n_c + b_active] != 0) &&
+        (b_adjacencies[size_t(b_active) * n_c + b_active] != 0) &&
+        (tau[j+1] - std::max(t_on, tau[0] - up_time_pre) <= max_up_time[b_active]) &&
+        (up_time[b_active] + dt[j] <= total_max_up_time[b_active]);
+}
+
+
+unsigned int CombinaSURSolver::select_control(Strategy const strategy,
+    unsigned int const b_active_parent, unsigned int const j, bool* admissible) const {
+
+    const unsigned int p = b_active_parent;
+    const bool continuation = (p < n_c) && control_continuation_admissible(p, j);
+
+    // the active control cannot be switched off within its minimum up-time
+    // or without remaining switches
+
+    if((p < n_c) && ((tau[j] - t_on < min_up_time[p]) || (sigma[p] >= n_max_switches[p]))) {
+
+        *admissible = continuation;
+        return p;
+    }
+
+    // first admissible control with the largest accumulated deviation, in
+    // total (b_best) and apart from the active control (c_best)
+
+    unsigned int b_best = n_c;
+    unsigned int c_best = n_c;
+
+    for(unsigned int i = 0; i < n_c; i++) {
+
+        if(i == p) {
+
+            if(!continuation) {
+                continue;
+            }
+        }
+        else {
+
+            if(!control_activation_admissible(i, p, j)) {
+                continue;
+            }
+
+            if((c_best == n_c) || (eta_i[i] > eta_i[c_best])) {
+                c_best = i;
+            }
+        }
+
+        if((b_best == n_c) || (eta_i[i] > eta_i[b_best])) {
+            b_best = i;
+        }
+    }
+
+    *admissible = (b_best < n_c);
+
+    if(!continuation || (c_best == n_c) || (strategy == SUR_DT)) {
+        return b_best;
+    }
+
+    // the active control is kept until the deviation of another control
+    // exceeds a threshold, which is one time interval for next-forced
+    // rounding and depends on the switches remaining per remaining time
+    // for switch-budget-aware rounding
+
+    double threshold;
+
+    if(strategy == NFR) {
+
+        threshold = std::max(eta_i[p], max_dt);
+    }
+    else {
+
+        const unsigned int n_switches_remaining = std::min(
+            n_max_switches[p] - sigma[p], n_max_switches[c_best] - sigma[c_best]);
+
+        threshold = eta_i[p] + 0.5 * (tau[n_t] - tau[j]) / (n_switches_remaining + 1);
+    }
+
+    return (eta_i[c_best] > threshold) ? c_best : p;
+}
+
+
+void CombinaSURSolver::activate_control(unsigned int const b_active_child,
+    unsigned int const b_active_parent, unsigned int const j) {
+
+    if(b_active_child != b_active_parent) {
+
+        if(b_active_parent < n_c) {
+
+            sigma[b_active_parent]++;
+            sigma[b_active_child]++;
+            t_off[b_active_parent] = tau[j];
+        }
+
+        t_on = tau[j];
+    }
+
+    up_time[b_active_child] += dt[j];
+}
+
+
+CombinaSURSolver::Strategy CombinaSURSolver::parse_strategy(std::string const & strategy_name) {
+
+    // strategies are listed in the order of their enumeration
+    std::vector<std::string> const & strategies = get_strategies();
+    auto strategy_it = std::find(strategies.begin(), strategies.end(), strategy_name);
+
+    if(strategy_it == strategies.end()) {
+        throw std::invalid_argument("Unknown rounding strategy '" + strategy_name + "'.");
+    }
+
+    return Strategy(strategy_it - strategies.begin());
+}
+
+
+bool CombinaSURSolver::round(Strategy const strategy, double const * b_rel_in,
+    size_t const c_stride, size_t const t_stride, double* eta_out) {
+
+    eta_i = eta_pre;
+    sigma.assign(n_c, 0);
+    up_time.assign(n_c, 0.0);
+    t_off.assign(n_c, -std::numeric_limits<double>::infinity());
+    t_on = -std::numeric_limits<double>::infinity();
+
+    std::vector<double> eta_row_sum(n_c, 0.0);
+    double eta_max = 0.0;
+    double eta_column_sum = 0.0;
+
+    bool feasible = true;
+    unsigned int b_active_parent = b_active_pre;
+
+    for(unsigned int j = 0; j < n_t; j++) {
+
+        double const * b_rel_j = b_rel_in + j * t_stride;
+
+        // the first control with the largest accumulated deviation is
+        // activated by Sum-Up-Rounding
+        unsigned int b_active = 0;
+
+        for(unsigned int i = 0; i < n_c; i++) {
+
+            eta_i[i] += b_rel_j[i * c_stride] * dt[j];
+
+            if(eta_i[i] > eta_i[b_active]) {
+                b_active = i;
+            }
+        }
+
+        if(strategy != SUR) {
+
+            bool admissible;
+            const unsigned int b_selected = select_control(strategy, b_active_parent, j, &admissible);
+
+            // if no admissible control exists, the rounding continues with
+            // Sum-Up-Rounding and the solution is marked as infeasible
+
+            if(admissible) {
+                b_active = b_selected;
+            }
+            else {
+                feasible = false;
+            }
+        }
+
+        activate_control(b_active, b_active_parent, j);
+        b_active_parent = b_active;
+
+        eta_i[b_active] -= dt[j];
+        b_active_t[j] = b_active;
+
+        double eta_column = 0.0;
+
+        for(unsigned int i = 0; i < n_c; i++) {
+
+            const double eta_abs = std::fabs(eta_i[i]);
+
+            eta_max = std::max(eta_max, eta_abs);
+            eta_column += eta_abs;
+            eta_row_sum[i] += eta_abs;
+        }
+
+        eta_column_sum = std::max(eta_column_sum, eta_column);
+    }
+
+    eta_out[0] = eta_max;
+    eta_out[1] = eta_column_sum;
+    eta_out[2] = *std::max_element(eta_row_sum.begin(), eta_row_sum.end());
+
+    return feasible;
+}
+
+
+void CombinaSURSolver::run(std::string const & strategy_name) {
+
+    const Strategy strategy = parse_strategy(strategy_name);
+
+    auto t_start = std::chrono::steady_clock::now();
+
+    double eta[3];
+    const bool feasible = round(strategy, b_rel.data(), 1, n_c, eta);
+
+    std::fill(b_bin.begin(), b_bin.end(), 0);
+    seq_b_active.clear();
+    seq_t_start.clear();
+
+    for(unsigned int j = 0; j < n_t; j++) {
+
+        const unsigned int b_active = b_active_t[j];
+
+        b_bin[size_t(b_active) * n_t + j] = 1;
+
+        if(seq_b_active.empty() || seq_b_active.back() != b_active) {
+            seq_b_active.push_back(b_active);
+            seq_t_start.push_back(j);
+        }
+    }
+
+    for(unsigned int k = 0; k < get_cia_norms().size(); k++) {
+        eta_norms[get_cia_norms()[k]] = eta[k];
+    }
+
+    solution_time = std::chrono::duration<double>(
+        std::chrono::steady_clock::now() - t_start).count();
+
+    // plain Sum-Up-Rounding does not enforce the constraints, so that its
+    // solution is not reported as feasible
+
+    if(strategy == SUR) {
+        status = 4;
+    }
+    else {
+        status = feasible ? 2 : 3;
+    }
+}
+
+
+void CombinaSURSolver::run_batch(std::string const & strategy_name,
+    double const * b_rel_batch, unsigned int const n_s,
+    unsigned char* b_bin_batch, double* eta_batch, unsigned char* feasible_batch) {
+
+    const Strategy strategy = parse_strategy(strategy_name);
+
+    auto t_start = std::chrono::steady_clock::now();
+
+    const size_t n_ct = size_t(n_c) * n_t;
+
+    std::fill(b_bin_batch, b_bin_batch + n_s * n_ct, 0);
+
+    for(unsigned int s = 0; s < n_s; s++) {
+
+        feasible_batch[s] = round(strategy, b_rel_batch + s * n_ct, n_t, 1, eta_batch + 3 * s);
+
+        unsigned char* b_bin_s = b_bin_batch + s * n_ct;
+
+        for(unsigned int j = 0; j < n_t; j++) {
+            b_bin_s[size_t(b_active_t[j]) * n_t + j] = 1;
+        }
+    }
+
+    solution_time = std::chrono::duration<double>(
+        std::chrono::steady_clock::now() - t_start).count();
+}
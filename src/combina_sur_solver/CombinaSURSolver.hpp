@@ -0,0 +1,169 @@
+/*
+ *
+ * CombinaSURSolver.hpp
+ *
+ * This file is part of pycombina.
+ *
+ * Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+ *
+ * pycombina is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Lesser General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * pycombina is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU Lesser General Public License for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+ *
+ */
+
+#ifndef __COMBINA_SUR_SOLVER_HPP
+#define __COMBINA_SUR_SOLVER_HPP
+
+#include <cstddef>
+#include <map>
+#include <string>
+#include <vector>
+
+
+class CombinaSURSolver {
+
+public:
+
+    // dt (n_t), b_rel (n_c x n_t) and b_valid (n_c x n_t) are row-major
+    // views on memory owned by the caller, which are read once during
+    // construction and packed into the time-major layout of the solver.
+    CombinaSURSolver(double const * dt,
+               double const * b_rel,
+
+               unsigned int const n_c,
+               unsigned int const n_t,
+
+               std::vector<unsigned int> const & n_max_switches,
+               std::vector<double> const & min_up_time,
+               std::vector<double> const & min_down_time,
+               std::vector<double> const & max_up_time,
+               std::vector<double> const & total_max_up_time,
+
+               unsigned char const * b_valid,
+               std::vector<std::vector<unsigned int>> const & b_adjacencies,
+
+               unsigned int const b_active_pre);
+
+    // names of the available rounding strategies
+    static std::vector<std::string> const & get_strategies();
+
+    // names of the CIA norms in the order of the objective values of a batch
+    static std::vector<std::string> const & get_cia_norms();
+
+    // accumulated deviations per control at the first time point
+    void set_eta_pre(std::vector<double> const & eta_pre);
+    // up-time of the control active prior to the time horizon prior to it
+    void set_up_time_pre(double const up_time_pre);
+
+    void run(std::string const & strategy);
+
+    // rounds n_s row-major instances b_rel_batch (n_s x n_c x n_t) on the
+    // time grid and with the constraints of the solver and writes the
+    // binary controls to b_bin_batch (n_s x n_c x n_t), the objective
+    // values for all CIA norms (see get_cia_norms) to eta_batch (n_s x 3)
+    // and whether all constraints are fulfilled to feasible_batch (n_s)
+    void run_batch(std::string const & strategy, double const * b_rel_batch,
+        unsigned int const n_s, unsigned char* b_bin_batch, double* eta_batch,
+        unsigned char* feasible_batch);
+
+    std::map<std::string, double> const & get_eta_norms() const { return eta_norms; }
+    double get_solution_time() const { return solution_time; }
+    unsigned int get_status() const { return status; }
+    unsigned int get_num_time() const { return n_t; }
+    unsigned int get_num_ctrl() const { return n_c; }
+
+    const std::vector<unsigned char>& get_b_bin() const { return b_bin; }
+    const std::vector<unsigned int>& get_seq_b_active() const { return seq_b_active; }
+    const std::vector<unsigned int>& get_seq_t_start() const { return seq_t_start; }
+
+
+private:
+
+    enum Strategy { SUR, SUR_DT, SUR_SR, NFR };
+
+    static Strategy parse_strategy(std::string const & strategy_name);
+
+    // rounds the relaxed controls b_rel_in[i * c_stride + j * t_stride],
+    // stores the active control per time interval in b_active_t and the
+    // objective values for all CIA norms in eta_out, returns whether all
+    // constraints are fulfilled, which is not checked for plain
+    // Sum-Up-Rounding
+    bool round(Strategy const strategy, double const * b_rel_in,
+        size_t const c_stride, size_t const t_stride, double* eta_out);
+
+    void precompute_valid_until();
+
+    bool control_activation_admissible(unsigned int const b_active_child,
+        unsigned int const b_active_parent, unsigned int const j) const;
+    bool control_continuation_admissible(unsigned int const b_active,
+        unsigned int const j) const;
+
+    unsigned int select_control(Strategy const strategy, unsigned int const b_active_parent,
+        unsigned int const j, bool* admissible) const;
+
+    void activate_control(unsigned int const b_active_child,
+        unsigned int const b_active_parent, unsigned int const j);
+
+    unsigned int n_c;
+    unsigned int n_t;
+
+    std::vector<double> dt;
+
+    // start times of the time intervals relative to the first time point,
+    // including the final time point
+    std::vector<double> tau;
+
+    // b_rel[j * n_c + i] and b_valid[j * n_c + i] for control i on time
+    // interval j
+    std::vector<double> b_rel;
+
+    std::vector<unsigned int> n_max_switches;
+    std::vector<double> min_up_time;
+    std::vector<double> min_down_time;
+    std::vector<double> max_up_time;
+    std::vector<double> total_max_up_time;
+
+    std::vector<unsigned char> b_valid;
+
+    // b_adjacencies[b_active_child * n_c + b_active_parent]
+    std::vector<unsigned char> b_adjacencies;
+
+    unsigned int b_active_pre;
+    std::vector<double> eta_pre;
+    double up_time_pre;
+
+    // end of the interval of consecutive valid time intervals of a control
+    // starting at time interval j, stored as valid_until[j * n_c + i]
+    std::vector<double> valid_until;
+
+    // rounding state at the current time interval
+    std::vector<double> eta_i;
+    std::vector<unsigned int> sigma;
+    std::vector<double> up_time;
+    std::vector<double> t_off;
+    double t_on;
+    double max_dt;
+
+    std::vector<unsigned int> b_active_t;
+
+    std::map<std::string, double> eta_norms;
+
+    std::vector<unsigned char> b_bin;
+    std::vector<unsigned int> seq_b_active;
+    std::vector<unsigned int> seq_t_start;
+
+    double solution_time;
+    unsigned int status;
+};
+
+#endif /* end of include guard: __COMBINA_SUR_SOLVER_HPP */
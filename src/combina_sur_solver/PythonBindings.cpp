@@ -0,0 +1,197 @@
+/*
+ *
+ * PythonBindings.cpp
+ *
+ * This file is part of pycombina.
+ *
+ * Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+ *
+ * pycombina is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Lesser General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * pycombina is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU Lesser General Public License for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+ *
+ */
+
+
+#include <algorithm>
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <stdexcept>
+#include <vector>
+
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <pybind11/stl.h>
+
+#include "CombinaSURSolver.hpp"
+
+namespace py = pybind11;
+
+
+// C-contiguous NumPy arrays that can be viewed without conversion
+using double_array = py::array_t<double, py::array::c_style>;
+using uint8_array = py::array_t<std::uint8_t, py::array::c_style>;
+
+
+// function prototypes
+static std::unique_ptr<CombinaSURSolver> combina_sur_wrap_init(double_array dt,
+    double_array b_rel, std::vector<unsigned int> const & n_max_switches,
+    std::vector<double> const & min_up_time, std::vector<double> const & min_down_time,
+    std::vector<double> const & max_up_time, std::vector<double> const & total_max_up_time,
+    uint8_array b_valid, std::vector<std::vector<unsigned int>> const & b_adjacencies,
+    unsigned int b_active_pre);
+static py::array_t<std::uint8_t> combina_sur_wrap_get_b_bin(CombinaSURSolver const & solver);
+static py::tuple combina_sur_wrap_get_switching_sequence(CombinaSURSolver const & solver);
+static void combina_sur_wrap_run(CombinaSURSolver& solver, std::string const & strategy);
+static py::tuple combina_sur_wrap_run_batch(CombinaSURSolver& solver,
+    std::string const & strategy, double_array b_rel_batch);
+
+
+PYBIND11_MODULE(_combina_sur_solver, m)
+{
+    py::class_<CombinaSURSolver>(m, "CombinaSURSolver")
+        .def(py::init(&combina_sur_wrap_init),
+            py::arg("dt").noconvert(), py::arg("b_rel").noconvert(),
+
+            py::arg("n_max_switches"), py::arg("min_up_time"),
+            py::arg("min_down_time"), py::arg("max_up_time"),
+            py::arg("total_max_up_time"),
+
+            py::arg("b_valid").noconvert(), py::arg("b_adjacencies"),
+
+            py::arg("b_active_pre"))
+
+        .def("set_eta_pre", &CombinaSURSolver::set_eta_pre, py::arg("eta_pre"))
+        .def("set_up_time_pre", &CombinaSURSolver::set_up_time_pre, py::arg("up_time_pre"))
+
+        .def("get_eta_norms", &CombinaSURSolver::get_eta_norms)
+        .def("get_b_bin", &combina_sur_wrap_get_b_bin)
+        .def("get_switching_sequence", &combina_sur_wrap_get_switching_sequence)
+        .def("get_status", &CombinaSURSolver::get_status)
+        .def("get_solution_time", &CombinaSURSolver::get_solution_time)
+
+        .def_property_readonly_static("strategies", [](py::object) { return CombinaSURSolver::get_strategies(); })
+        .def_property_readonly_static("cia_norms", [](py::object) { return CombinaSURSolver::get_cia_norms(); })
+
+        .def("run", &combina_sur_wrap_run, py::arg("strategy"))
+        .def("run_batch", &combina_sur_wrap_run_batch, py::arg("strategy"),
+            py::arg("b_rel_batch").noconvert());
+}
+
+
+static std::unique_ptr<CombinaSURSolver> combina_sur_wrap_init(double_array dt,
+    double_array b_rel, std::vector<unsigned int> const & n_max_switches,
+    std::vector<double> const & min_up_time, std::vector<double> const & min_down_time,
+    std::vector<double> const & max_up_time, std::vector<double> const & total_max_up_time,
+    uint8_array b_valid, std::vector<std::vector<unsigned int>> const & b_adjacencies,
+    unsigned int b_active_pre) {
+
+    if(b_rel.ndim() != 2) {
+        throw std::invalid_argument("b_rel must be a two-dimensional array.");
+    }
+
+    const unsigned int n_c = b_rel.shape(0);
+    const unsigned int n_t = b_rel.shape(1);
+
+    if((dt.ndim() != 1) || (dt.shape(0) != n_t)) {
+        throw std::invalid_argument("dt must be a vector of length n_t.");
+    }
+
+    if(n_c < 1) {
+        throw std::invalid_argument("b_rel must contain at least one control.");
+    }
+
+    if((b_valid.ndim() != 2) || (b_valid.shape(0) != n_c) || (b_valid.shape(1) != n_t)) {
+        throw std::invalid_argument("b_valid must be of the same shape as b_rel.");
+    }
+
+    for(auto const & values : {n_max_switches.size(), min_up_time.size(), min_down_time.size(),
+        max_up_time.size(), total_max_up_time.size(), b_adjacencies.size()}) {
+
+        if(values != n_c) {
+            throw std::invalid_argument("Constraints must be specified for each control.");
+        }
+    }
+
+    double const * dt_data = dt.data();
+    double const * b_rel_data = b_rel.data();
+    unsigned char const * b_valid_data = b_valid.data();
+
+    std::unique_ptr<CombinaSURSolver> solver;
+    {
+        py::gil_scoped_release release;
+        solver.reset(new CombinaSURSolver(dt_data, b_rel_data, n_c, n_t,
+            n_max_switches, min_up_time, min_down_time, max_up_time,
+            total_max_up_time, b_valid_data, b_adjacencies, b_active_pre));
+    }
+
+    return solver;
+}
+
+
+static py::array_t<std::uint8_t> combina_sur_wrap_get_b_bin(CombinaSURSolver const & solver) {
+    const std::vector<unsigned char>& b_bin = solver.get_b_bin();
+
+    py::array_t<std::uint8_t> result(std::vector<py::ssize_t>{
+        solver.get_num_ctrl(), solver.get_num_time()});
+    std::copy(b_bin.begin(), b_bin.end(), result.mutable_data());
+
+    return result;
+}
+
+
+static py::tuple combina_sur_wrap_get_switching_sequence(CombinaSURSolver const & solver) {
+    const std::vector<unsigned int>& b_active = solver.get_seq_b_active();
+    const std::vector<unsigned int>& t_start = solver.get_seq_t_start();
+
+    return py::make_tuple(
+        py::array_t<unsigned int>(b_active.size(), b_active.data()),
+        py::array_t<unsigned int>(t_start.size(), t_start.data()));
+}
+
+
+static void combina_sur_wrap_run(CombinaSURSolver& solver, std::string const & strategy) {
+    py::gil_scoped_release release;
+    solver.run(strategy);
+}
+
+
+static py::tuple combina_sur_wrap_run_batch(CombinaSURSolver& solver,
+    std::string const & strategy, double_array b_rel_batch) {
+
+    const unsigned int n_c = solver.get_num_ctrl();
+    const unsigned int n_t = solver.get_num_time();
+
+    if((b_rel_batch.ndim() != 3) || (b_rel_batch.shape(1) != n_c) || (b_rel_batch.shape(2) != n_t)) {
+        throw std::invalid_argument("b_rel_batch must be of shape (n_s, n_c, n_t).");
+    }
+
+    const unsigned int n_s = b_rel_batch.shape(0);
+    const unsigned int n_norms = CombinaSURSolver::get_cia_norms().size();
+
+    py::array_t<std::uint8_t> b_bin_batch(std::vector<py::ssize_t>{n_s, n_c, n_t});
+    py::array_t<double> eta_batch(std::vector<py::ssize_t>{n_s, n_norms});
+    py::array_t<bool> feasible_batch(n_s);
+
+    double const * b_rel_data = b_rel_batch.data();
+    unsigned char* b_bin_data = b_bin_batch.mutable_data();
+    double* eta_data = eta_batch.mutable_data();
+    unsigned char* feasible_data = reinterpret_cast<unsigned char*>(feasible_batch.mutable_data());
+
+    {
+        py::gil_scoped_release release;
+        solver.run_batch(strategy, b_rel_data, n_s, b_bin_data, eta_data, feasible_data);
+    }
+
+    return py::make_tuple(b_bin_batch, eta_batch, feasible_batch);
+}
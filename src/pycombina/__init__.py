@@ -18,27 +18,87 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with pycombina. If not, see <http://www.gnu.org/licenses/>.
 
-import os
+import importlib
 
 from ._binary_approximation import BinApprox
 
-try:
-    import gurobipy
+# solvers and functions are imported on first access, so that importing the
+# package does not load the solver extensions, SciPy and Gurobi; names
+# map to the modules providing them
 
-    if gurobipy.gurobi.version() < (8, 0, 0):
-        raise ImportError
+_lazy_attributes = {
 
-    from ._combina_milp import CombinaMILP
-except ImportError:
-    print("- gurobipy version > 8.0.0 not found, CombinaMILP disabled.\n")
+    "SharedBinApprox": "._shared",
+    "CombinaMILP": "._combina_milp",     # requires SciPy, uses Gurobi if available
+    "CombinaBnB": "._combina_bnb",       # requires the BnB solver extension
+    "CombinaMPC": "._combina_mpc",
+    "CombinaMultilevel": "._combina_multilevel",
+    "CombinaWindowed": "._combina_windowed",
+    "CombinaSUR": "._combina_sur",       # requires the SUR solver extension
+    "stream_round": "._stream",          # requires both solver extensions
+    "SolveService": "._service",
+    "SolutionCache": "._cache",
+}
 
-try:
-    from ._combina_bnb import CombinaBnB
-except ImportError:
-    print("- BnB solver extension not found, CombinaBnB disabled.\n")
+__all__ = ["BinApprox", "is_available"] + list(_lazy_attributes)
 
-try:
-    from ._combina_sur import CombinaSUR
-except ImportError:
-    print("- Sum-Up-Rounding solver extension not found, CombinaSUR disabled.\n")
 
+def __getattr__(name: str):
+
+    if name not in _lazy_attributes:
+
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    try:
+        module = importlib.import_module(_lazy_attributes[name], __name__)
+
+    except ImportError as err:
+
+        # raised as AttributeError, so that hasattr() works as expected;
+        # "from pycombina import ..." raises an ImportError nonetheless
+
+        raise AttributeError("{} is not available: {}".format(name, err)) from err
+
+    value = getattr(module, name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list:
+
+    return sorted(set(globals()) | set(_lazy_attributes))
+
+
+def is_available(name: str) -> bool:
+
+    '''
+    Check whether a solver or function of pycombina can be used, i. e.,
+    whether the solver extensions or packages it requires are installed.
+    The solver is imported for this purpose, if it has not been imported
+    before.
+
+    Usage::
+
+        >>> import pycombina
+
+        >>> if pycombina.is_available("CombinaBnB"):
+        ...     combina = pycombina.CombinaBnB(binapprox)
+
+    :param name: Name of the solver or function, e. g., **CombinaBnB**,
+                 **CombinaMILP** or **CombinaSUR**.
+
+    '''
+
+    if name not in _lazy_attributes:
+
+        raise ValueError("name must be one of " + \
+            ", ".join("'{}'".format(n) for n in _lazy_attributes) + ".")
+
+    try:
+        __getattr__(name)
+
+    except AttributeError:
+        return False
+
+    return True
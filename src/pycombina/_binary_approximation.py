@@ -25,6 +25,9 @@ from typing import Union
 
 from abc import ABC
 
+from ._evaluation import evaluate_b_bin
+from ._storage import save_arrays, load_arrays
+
 class BinApproxBase(ABC):
 
     @property
@@ -140,6 +143,41 @@ class BinApproxBase(ABC):
            raise AttributeError("b_bin not yet available.")
 
 
+    @property
+    def switching_sequence(self) -> tuple:
+
+        '''
+        Get the binary solution of the binary approximation problem in
+        run-length form, i. e., a tuple of the indices of the controls active
+        per segment of constant control and of the indices of the time
+        intervals at which these segments start. E. g., the following output
+
+            >>> print(binapprox.switching_sequence)
+            (array([2, 0, 1]), array([0, 12, 57]))
+
+        indicates that control 2 is active on the time intervals 0 to 11,
+        control 0 on the time intervals 12 to 56 and control 1 from
+        time interval 57 until the end of the time horizon.
+        '''
+
+        try:
+            return self._switching_sequence
+
+        except AttributeError:
+            pass
+
+        return self._determine_switching_sequence(self.b_bin)
+
+
+    @staticmethod
+    def _determine_switching_sequence(b_bin: np.ndarray) -> tuple:
+
+        b_active = np.argmax(b_bin, axis = 0)
+        t_start = np.flatnonzero(np.r_[True, b_active[1:] != b_active[:-1]])
+
+        return b_active[t_start], t_start
+
+
     @property
     def n_max_switches(self) -> np.ndarray:
 
@@ -224,6 +262,38 @@ class BinApproxBase(ABC):
             return np.zeros(self.n_c)
 
 
+    @property
+    def eta_pre(self) -> np.ndarray:
+
+        '''
+        Get the accumulated deviations of the binary from the relaxed controls
+        at the first time point of the time grid.
+        '''
+
+        try:
+            return self._eta_pre
+
+        except AttributeError:
+
+            return np.zeros(self.n_c)
+
+
+    @property
+    def up_time_pre(self) -> float:
+
+        '''
+        Get the time the control active at time grid point "t-1" has been
+        active prior to the first time point of the time grid.
+        '''
+
+        try:
+            return self._up_time_pre
+
+        except AttributeError:
+
+            return 0.0
+
+
     @property
     def cia_norm(self):
 
@@ -280,6 +350,34 @@ class BinApproxBase(ABC):
 
         self._b_bin = b_bin
 
+        try:
+            del self._switching_sequence
+
+        except AttributeError:
+            pass
+
+
+    def set_switching_sequence(self, b_active: Union[list, np.ndarray], \
+        t_start: Union[list, np.ndarray]) -> None:
+
+        b_active = np.atleast_1d(np.squeeze(b_active))
+        t_start = np.atleast_1d(np.squeeze(t_start))
+
+        if not (b_active.ndim == 1 and b_active.shape == t_start.shape):
+
+            raise ValueError("b_active and t_start must be vectors of equal length.")
+
+        if not (np.all(b_active < self.n_c) and np.all(t_start < self.n_t)):
+
+            raise ValueError("Indices in b_active and t_start must be smaller " + \
+                "than the number of controls and time intervals.")
+
+        if not (t_start.size == 0 or t_start[0] == 0) or np.any(t_start[1:] <= t_start[:-1]):
+
+            raise ValueError("Values in t_start must start at 0 and be strictly increasing.")
+
+        self._switching_sequence = (b_active, t_start)
+
 
     def set_eta(self, eta: Union[int, float]) -> None:
 
@@ -314,14 +412,36 @@ class BinApprox(BinApproxBase):
                              it is considered 0, and if it is bigger than
                              1-binary_threshold it is considered 1.
 
-    :param reduce_problem_size_before_solve: Setting this flag has no effect in
-                                             the current version of pycombina.
+    :param reduce_problem_size_before_solve: If set, consecutive time intervals on
+                                             which the same single control is forced
+                                             by the valid controls per interval
+                                             are merged prior to solving. This does
+                                             not change the optimal solution and
+                                             is only applied for "max_norm".
+
+    :param copy: If set, b_rel is copied and the given array is never
+                 modified. Otherwise, a given array of floating point values
+                 is used without duplication and values are clamped
+                 according to binary_threshold in place. Read-only arrays,
+                 e. g., memory-mapped files, are only copied if values have
+                 to be clamped. *Default:* False.
 
     :raises: ValueError, AttributeError, RuntimeError
 
     '''
 
 
+    # settings stored by save() in addition to the time points, the relaxed
+    # controls and the valid controls, if they have been specified
+    _stored_settings = ["b_adjacencies", "n_max_switches", "min_up_times", \
+        "min_down_times", "max_up_times", "total_max_up_times", "b_bin_pre", \
+        "eta_pre", "up_time_pre", "cia_norm"]
+
+    # arrays that scale with the number of time points, which are shared
+    # rather than copied where possible
+    _large_arrays = ("t", "b_rel", "b_valid")
+
+
     def _set_time_points_t(self, t: Union[list, np.ndarray]) -> None:
 
         t = np.squeeze(t)
@@ -338,11 +458,11 @@ class BinApprox(BinApproxBase):
 
 
     def _set_relaxed_binaries_b_rel(self, b_rel: Union[list, np.ndarray], \
-        binary_threshold: float) -> None:
+        binary_threshold: float, copy: bool) -> None:
 
         self._binary_threshold = binary_threshold
 
-        b_rel = np.atleast_2d(b_rel)
+        b_rel = np.atleast_2d(np.asarray(b_rel, dtype = float))
 
         if not b_rel.shape[1] == self._t.size-1:
 
@@ -352,17 +472,30 @@ class BinApprox(BinApproxBase):
 
             raise ValueError("One dimension of b_rel must be |t|-1.")
 
-        if not (np.all(b_rel >= 0) and np.all(b_rel <= 1)):
+        if not (b_rel.min() >= 0 and b_rel.max() <= 1):
 
             raise ValueError("All elements of the relaxed binary input " + \
                 "must be 0 <= b <= 1.")
 
         clamped_down = b_rel < self._binary_threshold
         clamped_up = b_rel > 1.0 - self._binary_threshold
-        clamped_count = np.count_nonzero(np.logical_or(clamped_down, clamped_up), axis=0)
+        clamped = np.logical_or(clamped_down, clamped_up)
+        clamped_count = np.count_nonzero(clamped, axis = 0)
 
-        b_rel[clamped_down] = 0
-        b_rel[clamped_up] = 1
+        clamping_required = np.any(b_rel[clamped_down] != 0) or \
+            np.any(b_rel[clamped_up] != 1)
+
+        # without copy, a given array of floating point values is used
+        # without duplication and clamped in place, unless it is read-only
+
+        if copy or (clamping_required and not b_rel.flags.writeable):
+
+            b_rel = b_rel.copy()
+
+        if clamping_required:
+
+            b_rel[clamped_down] = 0
+            b_rel[clamped_up] = 1
 
         self._b_rel = b_rel
         self._clamped = clamped_count
@@ -370,7 +503,11 @@ class BinApprox(BinApproxBase):
 
     def _initialize_valid_controls(self) -> None:
 
-        self._b_valid = np.ones((self.n_c, self.n_t), dtype = int)
+        # all controls are valid by default, which is represented by a
+        # read-only view until the valid controls are modified
+
+        self._b_valid = np.broadcast_to(np.ones(1, dtype = int), (self.n_c, self.n_t))
+        self._b_valid_modified = False
 
 
     def _initialize_control_adjacency(self) -> None:
@@ -395,11 +532,12 @@ class BinApprox(BinApproxBase):
 
 
     def __init__(self, t: Union[list, np.ndarray], b_rel: Union[list, np.ndarray], \
-        binary_threshold: float = 1e-3, reduce_problem_size_before_solve: bool = False) -> None:
+        binary_threshold: float = 1e-3, reduce_problem_size_before_solve: bool = False, \
+        copy: bool = False) -> None:
 
         self._set_time_points_t(t = t)
         self._set_relaxed_binaries_b_rel(b_rel = b_rel, \
-            binary_threshold = binary_threshold)
+            binary_threshold = binary_threshold, copy = copy)
 
         self._determine_number_of_control_intervals()
         self._determine_number_of_controls()
@@ -546,8 +684,10 @@ class BinApprox(BinApproxBase):
 
         '''
         Set the maximum up-times per control, i. e., the maximum time that a
-        control can stay active once it has been activated. By default,
-        the maximum up-times are the total duration of the time horizon.
+        control can stay active once it has been activated. The activation
+        of the control active prior to the time horizon includes the time
+        given by :meth:`set_up_time_pre`. By default, the maximum up-times
+        are the total duration of the time horizon.
 
         Usage::
 
@@ -672,6 +812,68 @@ class BinApprox(BinApproxBase):
         self._b_bin_pre = b_bin_pre
 
 
+    def set_eta_pre(self, eta_pre: Union[list, np.ndarray]) -> None:
+
+        '''
+        Define the accumulated deviations integral_t_s^t_0 (b_rel-b_bin)*dt
+        per control at the first time point of the time grid, e. g., if the
+        problem continues a previously solved problem on the time horizon
+        [t_s, t_0]. By default, these are 0.
+
+        Usage::
+
+            >>> from pycombina import BinApprox
+
+            >>> t = [0, ..., 9.0, 9.5, 10.0]
+            >>> b_rel = [[0.0      , ..., 0.558401, 0.558401, 0.558401],
+            ...          [0.0      , ..., 0.0     , 0.0     , 0.0     ],
+            ...          [1.0      , ..., 0.441599, 0.441599, 0.441599]])
+
+            >>> binapprox = BinApprox(t, b_rel)
+            >>> binapprox.set_eta_pre([0.2, 0.0, -0.2])
+
+        :param eta_pre: Accumulated deviations per binary control at the
+                        first time point.
+        '''
+
+        eta_pre = np.asarray(eta_pre, dtype = float)
+
+        try:
+            if not np.atleast_1d(np.squeeze(eta_pre)).ndim == 1:
+                raise ValueError
+
+            if not eta_pre.size == self.n_c:
+                raise ValueError
+
+        except ValueError:
+            raise ValueError("The number of values in eta_pre " + \
+                "must be equal to the number of binary controls.")
+
+        self._eta_pre = eta_pre
+
+
+    def set_up_time_pre(self, up_time_pre: Union[int, float]) -> None:
+
+        '''
+        Define the time the control active at time point t_0-1, see
+        :meth:`set_b_bin_pre`, has been active prior to the first time point
+        of the time grid, which counts towards the maximum up-time of its
+        current activation, e. g., if the problem continues a previously
+        solved problem. By default, this is 0.
+
+        :param up_time_pre: Up-time of the control active prior to the time
+                            horizon.
+        '''
+
+        up_time_pre = float(up_time_pre)
+
+        if not up_time_pre >= 0:
+
+            raise ValueError("up_time_pre must be non-negative.")
+
+        self._up_time_pre = up_time_pre
+
+
     def set_valid_controls_for_interval(self, dt: tuple, \
         b_bin_valid: Union[list, np.ndarray]) -> None:
 
@@ -725,7 +927,57 @@ class BinApprox(BinApproxBase):
             b_bin_valid = b_bin_valid.T
 
         idx_interval = np.logical_and(self.t[:-1] >= dt[0], self.t[:-1] < dt[1])
+
+        if not self._b_valid.flags.writeable:
+
+            self._b_valid = np.array(self._b_valid)
+
         self._b_valid[:, idx_interval] = b_bin_valid
+        self._b_valid_modified = True
+
+
+    def set_valid_controls(self, b_valid: Union[list, np.ndarray]) -> None:
+
+        '''
+        Specify the valid binary controls for all time intervals at once,
+        which is more convenient than repeated calls of
+        :meth:`set_valid_controls_for_interval` for valid controls that
+        change frequently on the time grid.
+
+        Usage::
+
+            >>> from pycombina import BinApprox
+
+            >>> t = [0, ..., 9.0, 9.5, 10.0]
+            >>> b_rel = [[0.0      , ..., 0.558401, 0.558401, 0.558401],
+            ...          [0.0      , ..., 0.0     , 0.0     , 0.0     ],
+            ...          [1.0      , ..., 0.441599, 0.441599, 0.441599]])
+
+            >>> binapprox = BinApprox(t, b_rel)
+
+            >>> # Allow activation of control 0 only on every second interval
+            >>> b_valid = np.ones(binapprox.b_rel.shape, dtype = int)
+            >>> b_valid[0, 1::2] = 0
+            >>> binapprox.set_valid_controls(b_valid)
+
+        :param b_valid: Two-dimensional array of the same shape as b_rel
+                        that indicates the allowed binary controls per
+                        time interval.
+        '''
+
+        b_valid = np.atleast_2d(b_valid)
+
+        if not b_valid.shape == (self.n_c, self.n_t):
+
+            raise ValueError("b_valid must be of the same shape as b_rel.")
+
+        if not np.all((b_valid == 0) | (b_valid == 1)):
+
+            raise ValueError("All elements in b_valid " + \
+                "must be either 0 or 1.")
+
+        self._b_valid = b_valid.astype(int)
+        self._b_valid_modified = True
 
 
     def set_valid_control_transitions(self, b_i: int, \
@@ -824,6 +1076,173 @@ class BinApprox(BinApproxBase):
 
         self._cia_norm = cia_norm
 
+
+    def _get_arrays(self) -> dict:
+
+        # arrays describing the problem as restored by _from_arrays()
+
+        arrays = {
+            "t": self._t,
+            "b_rel": self._b_rel,
+            "binary_threshold": self._binary_threshold,
+            "reduce_problem_size_before_solve": self._reduce_problem_size_before_solve,
+        }
+
+        if self._b_valid_modified:
+
+            # the default of all controls valid is not stored; valid
+            # controls restored from read-only or shared arrays are
+            # stored nonetheless
+            arrays["b_valid"] = self._b_valid
+
+        for setting in self._stored_settings:
+
+            try:
+                arrays[setting] = getattr(self, "_" + setting)
+
+            except AttributeError:
+                pass
+
+        return arrays
+
+
+    @classmethod
+    def _from_arrays(cls, arrays: dict) -> "BinApprox":
+
+        # the relaxed controls have already been clamped, so that they are
+        # used without copy
+
+        binapprox = cls(arrays["t"], arrays["b_rel"], \
+            binary_threshold = float(arrays["binary_threshold"]), \
+            reduce_problem_size_before_solve = \
+                bool(arrays["reduce_problem_size_before_solve"]))
+
+        if "b_valid" in arrays:
+
+            binapprox._b_valid = arrays["b_valid"]
+            binapprox._b_valid_modified = True
+
+        # settings are restored as stored, including the dwell time tolerance
+
+        for setting in cls._stored_settings:
+
+            if setting in arrays:
+
+                setattr(binapprox, "_" + setting, arrays[setting])
+
+        if "cia_norm" in arrays:
+
+            binapprox._cia_norm = str(arrays["cia_norm"])
+
+        if "up_time_pre" in arrays:
+
+            binapprox._up_time_pre = float(arrays["up_time_pre"])
+
+        return binapprox
+
+
+    def save(self, path: str) -> None:
+
+        '''
+        Save the binary approximation problem, i. e., the time points, the
+        relaxed controls and all constraint settings, to an uncompressed
+        .npz file, which can be loaded using :meth:`BinApprox.load`.
+        Solutions of the problem are not saved.
+
+        Usage::
+
+            >>> from pycombina import BinApprox
+
+            >>> binapprox = BinApprox(t, b_rel)
+            >>> binapprox.set_n_max_switches([3, 2, 5])
+            >>> binapprox.save("problem.npz")
+
+            >>> binapprox = BinApprox.load("problem.npz")
+
+        :param path: Path of the file, to which the extension .npz is
+                     appended if not given.
+        '''
+
+        save_arrays(path, self._get_arrays())
+
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "BinApprox":
+
+        '''
+        Load a binary approximation problem saved using :meth:`BinApprox.save`.
+
+        :param path: Path of the file.
+
+        :param mmap: If set, the time points, the relaxed controls and the
+                     valid controls are memory-mapped read-only from the
+                     file instead of being read into memory, so that several
+                     processes can open the same problem without copies.
+                     Valid controls are copied when being modified.
+
+        :returns: Binary approximation problem.
+        '''
+
+        arrays = load_arrays(path, \
+            mmap_keys = cls._large_arrays if mmap else ())
+
+        return cls._from_arrays(arrays)
+
+
+    def evaluate(self, b_bin_batch: Union[list, np.ndarray]) -> dict:
+
+        '''
+        Evaluate the objective values and the constraint violations of a
+        batch of binary solutions, e. g., of candidate solutions obtained
+        from different solvers or heuristics.
+
+        Constraints are evaluated as follows:
+
+        - switches count for the deactivated and the activated control,
+          including a switch from the control active prior to the time
+          horizon,
+        - the minimum up-times do not apply to the activation of the control
+          active prior to the time horizon and to activations reaching the
+          end of the time horizon,
+        - the maximum up-times apply to each activation on the time horizon,
+          where the activation of the control active prior to the time
+          horizon includes its up-time prior to the time horizon, see
+          :meth:`set_up_time_pre`, the total maximum up-times apply to all
+          activations of a control on the time horizon,
+        - valid control transitions apply to all subsequent time intervals,
+          including the continuation of a control.
+
+        Usage::
+
+            >>> from pycombina import BinApprox
+
+            >>> t = [0, ..., 9.0, 9.5, 10.0]
+            >>> b_rel = [[0.0      , ..., 0.558401, 0.558401, 0.558401],
+            ...          [0.0      , ..., 0.0     , 0.0     , 0.0     ],
+            ...          [1.0      , ..., 0.441599, 0.441599, 0.441599]])
+
+            >>> binapprox = BinApprox(t, b_rel)
+            >>> binapprox.set_n_max_switches([2, 2, 2])
+
+            >>> evaluation = binapprox.evaluate([b_bin_sur, b_bin_bnb])
+            >>> print(evaluation["eta"], evaluation["feasible"])
+            [0.21 0.35] [False  True]
+            >>> print(evaluation["violations"]["n_max_switches"])
+            [3 0]
+
+        :param b_bin_batch: Binary solutions of shape (k, n_c, n_t), or a
+                            single binary solution of shape (n_c, n_t).
+
+        :returns: Dictionary containing the objective values according to
+                  the applied CIA norm (**eta**) and for all CIA norms
+                  (**eta_norms**), the number of violations per constraint
+                  (**violations**) and whether a solution fulfills all
+                  constraints (**feasible**), each as arrays of length k.
+        '''
+
+        return evaluate_b_bin(self, b_bin_batch)
+
+
 class BinApproxPreprocessed(BinApproxBase):
 
     def _set_orignal_binapprox_problem(self, binapprox: BinApprox) -> None:
@@ -843,52 +1262,82 @@ class BinApproxPreprocessed(BinApproxBase):
         self._total_max_up_times = self._binapprox.total_max_up_times
           
         self._b_bin_pre = self._binapprox.b_bin_pre
+        self._eta_pre = self._binapprox.eta_pre
+        self._up_time_pre = self._binapprox.up_time_pre
         self._b_adjacencies = self._binapprox.b_adjacencies
         self._cia_norm = self._binapprox.cia_norm
 
 
     def _determine_active_controls(self) -> None:
 
-        b_active = []
-        b_inactive = []
+        # a control active at t-1 is kept, as switching from it counts
+        # towards the switches of the subsequently active control, and so
+        # is a control with nonzero initial deviation, which contributes
+        # to the objective
 
-        for k, b_rel_k in enumerate(self._b_rel):
+        active = (self._b_rel.max(axis = 1) > 0) | (self._b_bin_pre == 1) | \
+            (self._eta_pre != 0)
 
-            if not np.all(b_rel_k == 0):
+        self._b_active = np.flatnonzero(active)
+        self._b_inactive = np.flatnonzero(~active)
 
-                b_active.append(k)
-            
-            else:
 
-                b_inactive.append(k)                
+    def _determine_active_time_points(self) -> None:
 
-        self._b_active = np.asarray(b_active)
-        self._b_inactive = np.asarray(b_inactive)
+        if self._binapprox.reduce_problem_size_before_solve and \
+            self._cia_norm == "max_norm":
 
+            # An interval is merged into its predecessor if both allow only the
+            # same single control, which may stay active for subsequent intervals.
+            # The binary solution cannot change on such a run and the accumulated
+            # deviation of every control is monotonic there, so the maximum
+            # over time is attained at the boundaries of the run. This does not
+            # hold for the sum over the controls in column_sum_norm, where the
+            # deviations can change in opposite directions, nor for
+            # row_sum_norm, which sums over all time points.
 
-    def _determine_active_time_points(self) -> None:
+            b_valid = self._b_valid[self._b_active]
+            b_repeatable = np.diagonal(self._b_adjacencies)[self._b_active]
 
-        if self._binapprox.reduce_problem_size_before_solve:
+            b_forced = np.argmax(b_valid, axis = 0)
+            forced = (np.count_nonzero(b_valid, axis = 0) == 1) & (b_repeatable[b_forced] == 1)
 
-            # --> TBD! reduce_problem_size etc.
+            merged = np.zeros(self._binapprox.n_t, dtype = bool)
+            merged[1:] = forced[1:] & forced[:-1] & (b_forced[1:] == b_forced[:-1])
 
-            t_active = range(self._binapprox.n_t)
-            t_inactive = []
+            t_active = np.flatnonzero(~merged)
+            t_inactive = np.flatnonzero(merged)
 
         else:
 
-            t_active = range(self._binapprox.n_t)
-            t_inactive = []
+            t_active = np.arange(self._binapprox.n_t)
+            t_inactive = np.arange(0)
 
-        self._t_active = np.asarray(t_active)
-        self._t_inactive = np.asarray(t_inactive)
+        self._t_active = t_active
+        self._t_inactive = t_inactive
 
 
     def _remove_inactive_controls(self) -> None:
 
+        if self._b_inactive.size == 0 and self._t_inactive.size == 0:
+
+            # the problem is used without modification
+
+            self._t = self._binapprox.t
+            return
+
         self._t = np.append(self._binapprox.t[self._t_active], self._binapprox.t[-1])
 
-        self._b_rel = self._b_rel[np.ix_(self._b_active, self._t_active)]
+        if self._t_inactive.size > 0:
+
+            # relaxed controls on merged intervals are averaged over time
+            self._b_rel = np.add.reduceat(self._b_rel[self._b_active] * self._binapprox.dt, \
+                self._t_active, axis = 1) / np.diff(self._t)
+
+        else:
+
+            self._b_rel = self._b_rel[np.ix_(self._b_active, self._t_active)]
+
         self._b_valid = self._b_valid[np.ix_(self._b_active, self._t_active)]
         self._b_adjacencies = self._b_adjacencies[np.ix_(self._b_active, self._b_active)]
 
@@ -899,6 +1348,7 @@ class BinApproxPreprocessed(BinApproxBase):
         self._total_max_up_times = self._total_max_up_times[self._b_active]
    
         self._b_bin_pre = self._b_bin_pre[self._b_active]
+        self._eta_pre = self._eta_pre[self._b_active]
 
 
     def __init__(self, binapprox: BinApprox) -> None:
@@ -916,23 +1366,76 @@ class BinApproxPreprocessed(BinApproxBase):
 
     def _add_inactive_controls(self) -> None:
 
+        if self._b_inactive.size == 0 and self._t_inactive.size == 0:
+
+            self._b_bin = np.asarray(self._b_bin, dtype = float)
+            return
+
         b_bin = np.zeros(( \
             self._b_active.size + self._b_inactive.size, \
             self._t_active.size + self._t_inactive.size))
 
         b_bin[np.ix_(self._b_active, self._t_active)] = self._b_bin
 
+        try:
+            b_active, t_start = self._switching_sequence
+            self._switching_sequence = (self._b_active[b_active], self._t_active[t_start])
+
+        except AttributeError:
+            pass
+
         self._b_bin = b_bin
 
 
     def _add_inactive_time_points(self) -> None:
 
-        # --> TBD! reduce_problem_size etc.
+        if self._t_inactive.size > 0:
 
-        pass
+            # merged intervals take the solution of the first interval of their run
+            t_first = self._t_active[np.searchsorted(self._t_active, self._t_inactive) - 1]
+            self._b_bin[:, self._t_inactive] = self._b_bin[:, t_first]
 
 
     def inflate_solution(self) -> None:
 
         self._add_inactive_controls()
         self._add_inactive_time_points()
+
+
+    def inflate_b_bin(self, b_bin: np.ndarray) -> np.ndarray:
+
+        '''
+        Inflate a binary solution of the preprocessed problem to the controls
+        and time points of the original problem, e. g., for solutions
+        reported by a solver while solving.
+        '''
+
+        b_bin_inflated = np.zeros((self._b_active.size + self._b_inactive.size, \
+            self._t_active.size + self._t_inactive.size))
+
+        b_bin_inflated[np.ix_(self._b_active, self._t_active)] = b_bin
+
+        if self._t_inactive.size > 0:
+
+            t_first = self._t_active[np.searchsorted(self._t_active, self._t_inactive) - 1]
+            b_bin_inflated[:, self._t_inactive] = b_bin_inflated[:, t_first]
+
+        return b_bin_inflated
+
+
+    def reduce_b_bin(self, b_bin: np.ndarray) -> np.ndarray:
+
+        '''
+        Reduce a binary solution of the original problem to the active
+        controls and time points of the preprocessed problem, e. g., for
+        warm-starting a solver.
+        '''
+
+        b_bin = np.asarray(b_bin)
+
+        if self._b_inactive.size > 0 and np.any(b_bin[self._b_inactive]):
+
+            raise ValueError("b_bin activates controls that are removed " + \
+                "from the preprocessed problem.")
+
+        return b_bin[np.ix_(self._b_active, self._t_active)]
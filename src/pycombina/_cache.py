@@ -0,0 +1,368 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import json
+import hashlib
+import tempfile
+import zipfile
+import threading
+import collections
+import numpy as np
+from typing import Optional
+
+from ._binary_approximation import BinApprox
+from ._shared import as_binapprox
+from ._storage import save_arrays, load_arrays
+
+# options of the solve() methods that do not change an optimal solution,
+# which are not part of the key
+
+_ignored_options = ["verbosity", "max_iter", "max_cpu_time", "vbc_file", \
+    "vbc_timing", "vbc_time_dilation"]
+
+# only solutions the solver reports as optimal are stored, as solutions
+# found within a time or iteration limit depend on the machine load and
+# rounding heuristics do not prove optimality
+
+_cached_status = "Optimal solution found"
+
+# solvers the solutions of which are stored, rounding heuristics such as
+# CombinaSUR do not report optimal solutions and are not cached
+
+_cached_solvers = ["CombinaBnB", "CombinaMILP"]
+
+
+def _normalize_problem(binapprox: BinApprox) -> dict:
+
+    # the problem is described by its public properties in fixed types, so
+    # that equal problems have the same key independent of how they have
+    # been set up, e. g., if options are set explicitly to their defaults;
+    # dwell times of at most zero and numbers of switches of at least the
+    # number of time intervals do not restrict the solution
+
+    return {
+        "t": np.asarray(binapprox.t, dtype = np.float64),
+        "b_rel": np.asarray(binapprox.b_rel, dtype = np.float64),
+        "b_valid": np.asarray(binapprox.b_valid, dtype = np.uint8),
+        "b_adjacencies": np.asarray(binapprox.b_adjacencies, dtype = np.uint8),
+        "n_max_switches": np.minimum(binapprox.n_max_switches, binapprox.n_t).astype(np.int64),
+        "min_up_times": np.maximum(binapprox.min_up_times, 0.0).astype(np.float64),
+        "min_down_times": np.maximum(binapprox.min_down_times, 0.0).astype(np.float64),
+        "max_up_times": np.asarray(binapprox.max_up_times, dtype = np.float64),
+        "total_max_up_times": np.asarray(binapprox.total_max_up_times, dtype = np.float64),
+        "b_bin_pre": np.asarray(binapprox.b_bin_pre, dtype = np.uint8),
+        "eta_pre": np.asarray(binapprox.eta_pre, dtype = np.float64),
+        "up_time_pre": np.array(binapprox.up_time_pre, dtype = np.float64),
+        "cia_norm": np.array(binapprox.cia_norm),
+        "reduce_problem_size_before_solve": np.array(binapprox.reduce_problem_size_before_solve),
+    }
+
+
+class SolutionCache():
+
+    '''
+    Cache for the solutions of binary approximation problems, so that
+    repeatedly solving bit-identical problems, e. g., within model
+    predictive control or what-if studies, does not require the solver.
+
+    Solutions are stored under a key computed from the time points, the
+    relaxed controls and all options of the problem, the solver and the
+    options passed to the solver, apart from options which only limit the
+    solution time or control the output. Only solutions the solver reports
+    as optimal are stored. The most recently used solutions are kept in
+    memory. If a directory is given, solutions are additionally stored on
+    disk, e. g., for sharing them between processes or runs, where the
+    least recently used solutions are removed once the size of the
+    directory exceeds max_disk_size.
+
+    Usage::
+
+        >>> from pycombina import CombinaBnB, SolutionCache
+
+        >>> cache = SolutionCache(max_entries = 256, path = "cache")
+
+        >>> combina = CombinaBnB(binapprox)
+        >>> status = cache.solve(combina, verbosity = 0)
+
+        >>> print(cache.stats)
+
+    :param max_entries: Maximum number of solutions kept in memory.
+                        *Default:* 128.
+
+    :param path: Directory for storing solutions on disk, which is created
+                 if necessary. *Default:* **None**, solutions are kept in
+                 memory only.
+
+    :param max_disk_size: Maximum size of the solutions stored on disk in
+                          bytes. *Default:* 1 GiB.
+
+    '''
+
+    @property
+    def stats(self) -> dict:
+
+        '''
+        Get the number of cache hits (in memory and on disk), misses and
+        stored solutions, and the number of solutions currently kept in
+        memory.
+        '''
+
+        with self._lock:
+
+            stats = dict(self._stats)
+            stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+            stats["n_entries"] = len(self._entries)
+
+        return stats
+
+
+    def __init__(self, max_entries: int = 128, path: str = None, \
+        max_disk_size: int = 2**30) -> None:
+
+        if not max_entries >= 0:
+
+            raise ValueError("max_entries must be a non-negative integer.")
+
+        self._max_entries = int(max_entries)
+        self._path = path
+        self._max_disk_size = int(max_disk_size)
+
+        if path is not None:
+
+            os.makedirs(path, exist_ok = True)
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+
+    @staticmethod
+    def key(binapprox: BinApprox, solver: str, solver_options: dict = {}) -> str:
+
+        '''
+        Compute the key of a problem, which is the SHA-256 hash of the
+        properties of the problem, the name of the solver and its options.
+        Problems with equal properties have the same key, independent of the
+        types of the given arrays and of options set to their defaults.
+        Options that cannot be serialized as JSON, e. g., callbacks, raise
+        a TypeError.
+        '''
+
+        sha = hashlib.sha256()
+
+        for name, array in sorted(_normalize_problem(as_binapprox(binapprox)).items()):
+
+            array = np.ascontiguousarray(array)
+
+            sha.update("{}:{}:{}:".format(name, array.dtype.str, array.shape).encode())
+            sha.update(array.tobytes())
+
+        options = {key: value for key, value in solver_options.items() \
+            if key not in _ignored_options}
+
+        sha.update(json.dumps([solver, options], sort_keys = True).encode())
+
+        return sha.hexdigest()
+
+
+    def _file(self, key: str) -> str:
+
+        return os.path.join(self._path, key + ".npz")
+
+
+    def _remember(self, key: str, entry: dict) -> None:
+
+        with self._lock:
+
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+
+                self._entries.popitem(last = False)
+
+
+    def get(self, key: str) -> Optional[dict]:
+
+        '''
+        Get the solution stored under a key as a dictionary with the keys
+        **b_bin**, **eta** and **status**, or None.
+        '''
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            if entry is not None:
+
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+
+                return entry
+
+        if self._path is not None:
+
+            try:
+                arrays = load_arrays(self._file(key))
+
+                entry = {"b_bin": arrays["b_bin"], "eta": float(arrays["eta"]), \
+                    "status": str(arrays["status"])}
+
+                # the access time is tracked by the modification time,
+                # as file systems are often mounted without atime
+                os.utime(self._file(key))
+
+            except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+
+                # missing, removed or incomplete files are treated as misses
+                entry = None
+
+            if entry is not None:
+
+                self._remember(key, entry)
+
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+
+                return entry
+
+        with self._lock:
+            self._stats["misses"] += 1
+
+        return None
+
+
+    def put(self, key: str, b_bin: np.ndarray, eta: float, status: str) -> None:
+
+        '''
+        Store a solution under a key.
+        '''
+
+        entry = {"b_bin": np.array(b_bin), "eta": float(eta), "status": status}
+
+        self._remember(key, entry)
+
+        with self._lock:
+            self._stats["stores"] += 1
+
+        if self._path is not None:
+
+            # the file is written under a temporary name first, so that
+            # concurrent readers never see incomplete files
+
+            fid, tmp_file = tempfile.mkstemp(suffix = ".tmp", dir = self._path)
+            os.close(fid)
+
+            try:
+                with open(tmp_file, "wb") as f:
+                    save_arrays(f, entry)
+
+                os.replace(tmp_file, self._file(key))
+
+            except OSError:
+                os.remove(tmp_file)
+                raise
+
+            self._evict_from_disk()
+
+
+    def _evict_from_disk(self) -> None:
+
+        files = []
+
+        with os.scandir(self._path) as entries:
+
+            for entry in entries:
+
+                if entry.name.endswith(".npz"):
+
+                    try:
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+
+                    except FileNotFoundError:
+                        pass
+
+        disk_size = sum(size for _, size, _ in files)
+
+        for _, size, path in sorted(files):
+
+            if disk_size <= self._max_disk_size:
+                break
+
+            try:
+                os.remove(path)
+
+            except FileNotFoundError:
+                pass
+
+            disk_size -= size
+
+
+    def solve(self, combina, **kwargs) -> str:
+
+        '''
+        Solve the problem of a :class:`pycombina.CombinaBnB` or
+        :class:`pycombina.CombinaMILP` solver, unless its solution is found
+        in the cache. In this case, the solution is stored in the binary
+        approximation problem without running the solver, and the status of
+        the solver is the one stored with the solution.
+
+        All further arguments are passed on to the solve() method of the
+        solver. For other solvers, e. g., :class:`pycombina.CombinaSUR`,
+        which does not report optimal solutions, or if the arguments cannot
+        be serialized as JSON, the cache is bypassed.
+
+        :returns: Exit status of the solver, or the one stored with the
+                  cached solution.
+        '''
+
+        binapprox = combina._binapprox
+
+        try:
+            if type(combina).__name__ not in _cached_solvers:
+                raise TypeError
+
+            key = self.key(binapprox, type(combina).__name__, kwargs)
+
+        except TypeError:
+
+            combina.solve(**kwargs)
+            return combina.status
+
+        entry = self.get(key)
+
+        if entry is not None:
+
+            binapprox.set_b_bin(entry["b_bin"].copy())
+            binapprox.set_eta(entry["eta"])
+            combina._status_from_cache = entry["status"]
+
+            return entry["status"]
+
+        combina.solve(**kwargs)
+
+        if combina.status == _cached_status:
+
+            self.put(key, binapprox.b_bin, binapprox.eta, combina.status)
+
+        return combina.status
@@ -22,6 +22,7 @@ import signal
 import numpy as np
 
 from ._binary_approximation import BinApprox, BinApproxPreprocessed
+from ._shared import as_binapprox
 from ._combina_bnb_solver import CombinaBnBSolver
 
 
@@ -49,7 +50,15 @@ class CombinaBnB():
 
     All other options are ignore without further notice.
 
-    :param BinApprox: Binary approximation problem
+    Continuing the control active prior to the time horizon, see
+    :meth:`pycombina.BinApprox.set_b_bin_pre`, is not counted as a switch.
+    Hence, a control with a maximum number of switches of zero keeps its
+    state on the whole time horizon, i. e., it stays active if it is active
+    prior to the time horizon and inactive otherwise, and its deviation
+    enters the objective in both cases.
+
+    :param BinApprox: Binary approximation problem, or a handle to a problem
+                      in shared memory, see :class:`pycombina.SharedBinApprox`
 
     '''
 
@@ -62,14 +71,23 @@ class CombinaBnB():
         5: "User interrupt"
     }
 
+    # status of a solution taken from a SolutionCache without running the solver
+
+    _status_from_cache = None
+
 
     @property
     def status(self):
 
         '''
-        Exit status of the Branch-and-Bound solver.
+        Exit status of the Branch-and-Bound solver, or the status stored
+        with a solution taken from a :class:`pycombina.SolutionCache`.
         '''
 
+        if self._status_from_cache is not None:
+
+            return self._status_from_cache
+
         try:
             return self._solver_status[self._bnb_solver.get_status()]
 
@@ -93,26 +111,29 @@ class CombinaBnB():
 
     def _apply_preprocessing(self, binapprox: BinApprox) -> None:
 
-        self._binapprox = binapprox
-        self._binapprox_p = BinApproxPreprocessed(binapprox)
+        self._binapprox = as_binapprox(binapprox)
+        self._binapprox_p = BinApproxPreprocessed(self._binapprox)
 
 
-    def _initialize_bnb(self) -> None:
+    def _determine_b_active_pre(self) -> int:
 
         if self._binapprox_p.b_bin_pre.sum() < 1:
 
-            b_bin_pre = self._binapprox_p.n_c + 1
+            return self._binapprox_p.n_c + 1
 
-        else:
+        return int(np.flatnonzero(self._binapprox_p.b_bin_pre == 1)[0])
 
-            b_bin_pre = int(np.where(self._binapprox_p.b_bin_pre == 1)[0])
 
-        self._bnb_solver = CombinaBnBSolver( \
-                self._binapprox_p.dt.tolist(), \
-                self._binapprox_p.b_rel.tolist(), \
+    def _initialize_bnb(self) -> None:
+
+        b_bin_pre = self._determine_b_active_pre()
 
-                self._binapprox_p.n_c, \
-                self._binapprox_p.n_t, \
+        # dt, b_rel and b_valid are viewed in place by the solver and are
+        # therefore passed as C-contiguous arrays of the expected type
+
+        self._bnb_solver = CombinaBnBSolver( \
+                np.ascontiguousarray(self._binapprox_p.dt, dtype = np.float64), \
+                np.ascontiguousarray(self._binapprox_p.b_rel, dtype = np.float64), \
 
                 self._binapprox_p.n_max_switches.tolist(), \
                 self._binapprox_p.min_up_times.tolist(), \
@@ -120,13 +141,19 @@ class CombinaBnB():
                 self._binapprox_p.max_up_times.tolist(), \
                 self._binapprox_p.total_max_up_times.tolist(), \
 
-                self._binapprox_p.b_valid.tolist(), \
+                np.ascontiguousarray(self._binapprox_p.b_valid, dtype = np.uint8), \
                 self._binapprox_p.b_adjacencies.tolist(), \
 
                 b_bin_pre, \
 
             )
 
+        if np.any(self._binapprox_p.eta_pre != 0):
+
+            self._bnb_solver.set_eta_pre(self._binapprox_p.eta_pre.tolist())
+
+        self._bnb_solver.set_up_time_pre(self._binapprox_p.up_time_pre)
+
 
     def _setup_bnb(self, binapprox: BinApprox) -> None:
 
@@ -139,14 +166,73 @@ class CombinaBnB():
         self._setup_bnb(binapprox)
 
 
+    def _shift_horizon(self, n_shift: int) -> None:
+
+        # the time horizon of the given problem has been shifted by n_shift
+        # time intervals and its remaining options updated, so that the
+        # buffers of the existing solver are shifted in place, unless the
+        # whole horizon is replaced or preprocessing removes controls or
+        # time points
+
+        b_active = self._binapprox_p._b_active
+        n_t = self._binapprox_p.n_t
+
+        self._binapprox_p = BinApproxPreprocessed(self._binapprox)
+
+        if not (np.array_equal(b_active, self._binapprox_p._b_active) and \
+            self._binapprox_p._t_inactive.size == 0 and self._binapprox_p.n_t == n_t and \
+            n_shift < n_t):
+
+            self._initialize_bnb()
+
+            return
+
+        self._bnb_solver.shift( \
+            np.ascontiguousarray(self._binapprox_p.dt[-n_shift:], dtype = np.float64), \
+            np.ascontiguousarray(self._binapprox_p.b_rel[:, -n_shift:], dtype = np.float64))
+
+        self._bnb_solver.set_b_valid( \
+            np.ascontiguousarray(self._binapprox_p.b_valid, dtype = np.uint8))
+
+        self._bnb_solver.set_constraints( \
+            self._binapprox_p.n_max_switches.tolist(), \
+            self._binapprox_p.min_up_times.tolist(), \
+            self._binapprox_p.min_down_times.tolist(), \
+            self._binapprox_p.max_up_times.tolist(), \
+            self._binapprox_p.total_max_up_times.tolist(), \
+            self._determine_b_active_pre())
+
+        self._bnb_solver.set_eta_pre(self._binapprox_p.eta_pre.tolist())
+        self._bnb_solver.set_up_time_pre(self._binapprox_p.up_time_pre)
+
+
     def _setup_warm_start(self, use_warm_start: bool) -> None:
 
         if use_warm_start:
 
-            raise NotImplementedError("Warm-starting not yet implemented.")
+            try:
+                b_bin = self._binapprox.b_bin
+
+            except AttributeError:
+                raise RuntimeError("No binary solution available for warm-starting.")
+
+            self._bnb_solver.set_warm_start(np.ascontiguousarray( \
+                self._binapprox_p.reduce_b_bin(b_bin), dtype = np.uint8))
 
 
     def _run_solver(self, use_warm_start: bool, **kwargs) -> None:
+
+        self._status_from_cache = None
+
+        incumbent_callback = kwargs.pop("incumbent_callback", None)
+
+        if incumbent_callback is not None:
+
+            # incumbents are reported for the original problem
+
+            kwargs["incumbent_callback"] = lambda eta, b_bin: \
+                incumbent_callback(eta, self._binapprox_p.inflate_b_bin(b_bin))
+
         try:
             
             self._bnb_solver.run(use_warm_start, **kwargs)
@@ -156,6 +242,7 @@ class CombinaBnB():
             self._bnb_solver.stop()
 
         self._binapprox_p.set_b_bin(self._bnb_solver.get_b_bin())
+        self._binapprox_p.set_switching_sequence(*self._bnb_solver.get_switching_sequence())
         self._binapprox_p.set_eta(self._bnb_solver.get_eta())
 
 
@@ -163,6 +250,7 @@ class CombinaBnB():
 
         self._binapprox_p.inflate_solution()
         self._binapprox.set_b_bin(self._binapprox_p.b_bin)
+        self._binapprox.set_switching_sequence(*self._binapprox_p.switching_sequence)
         self._binapprox.set_eta(self._binapprox_p.eta)
 
 
@@ -173,7 +261,10 @@ class CombinaBnB():
 
         :param use_warm_start: If a binary solution is already contained in the
                                given binary approximation problem, use it to
-                               warm-start the solver.
+                               warm-start the solver. The solution must be
+                               feasible, its objective value serves as initial
+                               upper bound and it is returned unless a better
+                               solution is found.
 
         :param strategy: Search strategy to be used in exploring the
                          branch-and-bound tree. *Default:* **dfs**. *Options:*
@@ -206,6 +297,14 @@ class CombinaBnB():
                           the console, possible values are 0 (no output),
                           1 (show results only), 2 (show iterations). 
                         *Default:* True.
+
+        :param incumbent_callback: Function called with the objective value
+                                   and the binary solution (n_c x n_t) of each
+                                   new incumbent found by the solver, e. g.,
+                                   for passing it on to a concurrently running
+                                   :class:`pycombina.CombinaMILP`. The callback
+                                   is run on the thread of the solver.
+                                   *Default:* **None**.
         '''
 
         self._setup_warm_start(use_warm_start = use_warm_start)
@@ -18,18 +18,24 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with pycombina. If not, see <http://www.gnu.org/licenses/>.
 
-import numpy as np
-import gurobipy as gp
 import time
+import queue
+import warnings
+import numpy as np
+from typing import Union
+
+from scipy import sparse
 
 from ._binary_approximation import BinApprox, BinApproxPreprocessed
+from ._milp_backends import import_gurobipy, solvers
+from ._shared import as_binapprox
 
 
 class CombinaMILP():
 
     '''
     Solve a binary approximation problem by combinatorial integral approximation
-    using mixed-integer linear programming and Gurobi.
+    using mixed-integer linear programming and Gurobi or HiGHS.
 
     The following options of :class:`pycombina.BinApprox` are supported:
     
@@ -39,369 +45,764 @@ class CombinaMILP():
     - Valid control transitions (b_adjacencies)
     - Valid controls per interval (b_valid)
     - Active control at time point t_0-1 (b_bin_pre)
+    - Accumulated deviations at time point t_0 (eta_pre)
 
     All other options are ignored without further notice.
 
-    :param BinApprox: Binary approximation problem
+    :param BinApprox: Binary approximation problem, or a handle to a problem
+                      in shared memory, see :class:`pycombina.SharedBinApprox`
+
+    :param solver: MILP solver used for solving the problem. *Default:*
+                   **gurobi** if gurobipy is available, **highs** otherwise.
+                   *Options:* **gurobi** (requires gurobipy >= 9.0.0),
+                   **highs** (open-source solver HiGHS via
+                   scipy.optimize.milp).
+
+    :param variable_names: If set, the variables of the model are named,
+                           e. g., for inspecting the model written to a
+                           file, which increases the setup time. Only
+                           supported by Gurobi. *Default:* False.
+
+    :param switching_formulation: Formulation used for counting the switches
+                                  of the controls. *Default:* **standard**.
+                                  *Options:* **standard** (one switching
+                                  indicator per control and time interval,
+                                  linked to the binary controls by four
+                                  inequalities), **compact** (one switch-on
+                                  indicator per control and time interval,
+                                  bounded by a single inequality, the
+                                  switch-offs are determined from the
+                                  switch-ons and the binary controls).
 
     '''
 
-    _solver_status = {
+    # status of a solution taken from a SolutionCache without running the solver
 
-        1: "Initialized",
-        2: "Optimal solution found",
-        7: "Maximum number of iterations exceeded",
-        9: "Maximum CPU time exceeded",
-        11: "User interrupt"
-    }
+    _status_from_cache = None
 
 
     @property
     def status(self):
 
-        try:
-            return self._solver_status[self._model.status]
+        '''
+        Exit status of the MILP solver, or the status stored with a solution
+        taken from a :class:`pycombina.SolutionCache`.
+        '''
+
+        if self._status_from_cache is not None:
+
+            return self._status_from_cache
+
+        return self._milp.status
+
+
+    @property
+    def solution_time(self):
+
+        '''
+        Solution time of the MILP solver.
+        '''
+
+        return self._milp.solution_time
+
+
+    @property
+    def setup_time(self):
+
+        '''
+        Time required for setting up the MILP model, which is not included
+        in the solution time of the MILP solver.
+        '''
+
+        return self._setup_time
+
+
+    @property
+    def model_size(self) -> tuple:
+
+        '''
+        Number of variables and number of constraints of the MILP model.
+        '''
 
-        except KeyError:
-            raise RuntimeError("Solver status undefined, this should not happen.\n"
-                + "Please contact the developers.")
+        return self._model_size
 
 
     def _apply_preprocessing(self, binapprox: BinApprox) -> None:
 
-        self._binapprox = binapprox
-        self._binapprox_p = BinApproxPreprocessed(binapprox)
+        self._binapprox = as_binapprox(binapprox)
+        self._binapprox_p = BinApproxPreprocessed(self._binapprox)
+
+
+    _switching_formulations = ["standard", "compact"]
+
+
+    def _initialize_milp(self, solver: str, variable_names: bool, \
+        switching_formulation: str) -> None:
+
+        if solver is None:
+
+            solver = "gurobi" if import_gurobipy() is not None else "highs"
+
+        if solver not in solvers:
+
+            raise ValueError("solver must be one of " + \
+                ", ".join("'{}'".format(s) for s in solvers) + ".")
+
+        if switching_formulation not in self._switching_formulations:
+
+            raise ValueError("switching_formulation must be one of " + \
+                ", ".join("'{}'".format(f) for f in self._switching_formulations) + ".")
+
+        self._solver = solver
+        self._variable_names = variable_names
+        self._switching_formulation = switching_formulation
+
+        # blocks of variables (name, shape, lb, ub, obj, integer) and of
+        # constraints (A, sense, rhs) on all variables
+
+        self._variables = []
+        self._constraints = []
+        self._n_vars = 0
+
+
+    def _name(self, name: str) -> str:
+
+        return name if self._variable_names else ""
+
+
+    def _add_variables(self, name: str, shape: tuple, lb = 0.0, ub = np.inf, \
+        obj = 0.0, integer: bool = False) -> np.ndarray:
+
+        # returns the indices of the variables in the order of creation
+
+        self._variables.append((self._name(name), shape, lb, ub, obj, integer))
+
+        idx = self._n_vars + np.arange(int(np.prod(shape))).reshape(shape)
+        self._n_vars += idx.size
 
+        return idx
 
-    def _initialize_milp(self):
 
-        self._model = gp.Model("Combinatorial Integral Approximation MILP")
+    def _add_constraints(self, rows: np.ndarray, cols: np.ndarray, \
+        vals: np.ndarray, sense: str, rhs: np.ndarray) -> int:
+
+        # rows are given by the coefficients vals of the variables with
+        # indices cols in the order of their creation, returns the index of
+        # the block of constraints
+
+        # duplicate entries are summed up, entries cancelling out removed
+
+        A = sparse.csr_matrix((vals, (rows, cols)), shape = (rhs.size, self._n_vars))
+        A.eliminate_zeros()
+        self._constraints.append((A, sense, rhs))
+
+        return len(self._constraints) - 1
+
+
+    def _add_constraint_pattern(self, cols: list, coeffs: list, sense: str, \
+        rhs: np.ndarray) -> int:
+
+        # rows r of the form sum_k coeffs[k] * x[cols[k][r]]
+
+        n_rows = cols[0].size
+
+        return self._add_constraints(np.tile(np.arange(n_rows), len(cols)), \
+            np.concatenate(cols), np.repeat(np.asarray(coeffs, dtype = float), n_rows), \
+            sense, np.broadcast_to(np.asarray(rhs, dtype = float), (n_rows,)))
+
+
+    def _determine_b_bin_bounds(self) -> tuple:
+
+        # binary controls include time point t_0-1 in the first column,
+        # valid controls per interval and the control active at t_0-1 are
+        # imposed as bounds
+
+        n_c = self._binapprox_p.n_c
+        n_t = self._binapprox_p.n_t
+
+        lb_b_bin = np.zeros((n_c, n_t+1))
+        ub_b_bin = np.ones((n_c, n_t+1))
+
+        ub_b_bin[:, 1:] = self._binapprox_p.b_valid
+
+        if self._binapprox_p.b_bin_pre.sum() == 1:
+
+            lb_b_bin[:, 0] = self._binapprox_p.b_bin_pre
+            ub_b_bin[:, 0] = self._binapprox_p.b_bin_pre
+
+        return lb_b_bin, ub_b_bin
 
 
     def _setup_model_variables(self):
 
         print("\n  - Optimization variables ... ", end = "", flush = True)
 
-        self._eta_sym = self._model.addVar(vtype = "C", name = "eta")
-
-        if (self._binapprox_p.cia_norm == "column_sum_norm") or (self._binapprox_p.cia_norm == "row_sum_norm"):
-            
-            self._eta_sym_indiv = {}
+        n_c = self._binapprox_p.n_c
+        n_t = self._binapprox_p.n_t
 
-            for i in range(self._binapprox_p.n_c):
+        lb_b_bin, ub_b_bin = self._determine_b_bin_bounds()
 
-                for j in range(self._binapprox_p.n_t):
+        self._idx_eta = self._add_variables("eta", (1,), obj = 1.0)[0]
 
-                    self._eta_sym_indiv[(i,j)] = self._model.addVar( \
-                        vtype = "C", name = "eta_sym_indiv".format((i,j)))
-                 
-        self._b_bin_sym = {}
-        self._s = {}
+        self._idx_b_bin = self._add_variables("b_bin", (n_c, n_t+1), \
+            lb = lb_b_bin, ub = ub_b_bin, integer = True)
 
-        for i in range(self._binapprox_p.n_c):
-        
-            for j in range(-1,self._binapprox_p.n_t-1):
+        # accumulated deviations at the end of each time interval
 
-                self._s[(i,j)] = self._model.addVar(vtype = "C", \
-                    name = "s_{0}".format((i,j)))
+        self._idx_eta_acc = self._add_variables("eta_acc", (n_c, n_t), lb = -np.inf)
 
-                self._b_bin_sym[(i,j)] = self._model.addVar( \
-                    vtype = "B", name = "b_bin_{0}".format((i,j)))
+        # switching indicators between time points j-1 and j, or switch-on
+        # indicators only for the compact formulation
 
-            self._b_bin_sym[(i, self._binapprox_p.n_t-1)] = self._model.addVar( \
-                vtype = "B", name = "b_bin_{0}".format((i,self._binapprox_p.n_t-1)))
+        if self._switching_formulation == "standard":
 
-        print("done")
+            self._idx_s = self._add_variables("s", (n_c, n_t))
 
+        else:
 
-    def _setup_b_bin_pre_variables(self):
+            self._idx_s_on = self._add_variables("s_on", (n_c, n_t))
 
-        for i in range(self._binapprox_p.n_c):
+        if (self._binapprox_p.cia_norm == "column_sum_norm") or (self._binapprox_p.cia_norm == "row_sum_norm"):
 
-            if self._binapprox_p.b_bin_pre.sum() == 1: 
+            self._idx_eta_indiv = self._add_variables("eta_sym_indiv", (n_c, n_t))
 
-                self._model.addConstr(self._b_bin_sym[(i,-1)] == int(self._binapprox_p.b_bin_pre[i]))
+        print("done")
 
         
-    def _setup_objective(self):
+    def _determine_approximation_rhs(self) -> np.ndarray:
 
-        print("  - Objective ... ", end = "", flush = True)
+        # relaxed controls per time interval, the accumulated deviations
+        # at t_0 enter on the first time interval
 
-        self._model.setObjective(self._eta_sym)
+        rhs = self._binapprox_p.dt * self._binapprox_p.b_rel
+        rhs[:, 0] += self._binapprox_p.eta_pre
 
-        print("done")
+        return rhs.ravel()
 
 
     def _setup_approximation_inequalities(self):
 
         print("  - Approximation inequalities ... ", end = "", flush = True)
 
-        if self._binapprox_p.cia_norm == "max_norm":
+        n_c = self._binapprox_p.n_c
+        n_t = self._binapprox_p.n_t
+        dt = self._binapprox_p.dt
 
-            for i in range(self._binapprox_p.n_c):
+        # the accumulated deviations are determined recursively by
+        # eta_acc[i, j] = eta_acc[i, j-1] + dt[j] * (b_rel[i, j] - b_bin[i, j]),
+        # so that the number of nonzeros grows linearly with n_t
 
-                lhs = gp.LinExpr()
-                rhs = 0.0
+        rows = np.arange(n_c * n_t).reshape(n_c, n_t)
 
-                for j in range(self._binapprox_p.n_t):
+        rows = [rows.ravel(), rows[:, 1:].ravel(), rows.ravel()]
+        cols = [self._idx_eta_acc.ravel(), self._idx_eta_acc[:, :-1].ravel(), \
+            self._idx_b_bin[:, 1:].ravel()]
+        vals = [np.ones(n_c * n_t), -np.ones(n_c * (n_t-1)), np.tile(dt, n_c)]
 
-                    lhs.addTerms(self._binapprox_p.dt[j], self._b_bin_sym[(i,j)])
-                    rhs += self._binapprox_p.dt[j] * self._binapprox_p.b_rel[i][j]
+        # the relaxed controls and accumulated deviations at t_0 only enter
+        # the right hand sides, which can be updated on the existing model
 
-                    self._model.addLConstr(lhs + self._eta_sym, gp.GRB.GREATER_EQUAL, rhs)
-                    self._model.addLConstr(lhs - self._eta_sym, gp.GRB.LESS_EQUAL, rhs)
+        self._approximation_constraints = [self._add_constraints( \
+            np.concatenate(rows), np.concatenate(cols), np.concatenate(vals), \
+            "=", self._determine_approximation_rhs())]
 
-                    # self._model.addConstr(self._eta_sym >= sum( \
-                    #     [self._binapprox_p.dt[k] * (self._binapprox_p.b_rel[i][k] - self._b_bin_sym[(i,k)]) for k in range(j+1)]))
-                    # self._model.addConstr(self._eta_sym >= -sum( \
-                    #     [self._binapprox_p.dt[k] * (self._binapprox_p.b_rel[i][k] - self._b_bin_sym[(i,k)]) for k in range(j+1)]))
+        # absolute values of the accumulated deviations
 
-        elif self._binapprox_p.cia_norm == "column_sum_norm":
+        if self._binapprox_p.cia_norm == "max_norm":
 
-            for i in range(self._binapprox_p.n_c):
+            cols_eta = np.full(n_c * n_t, self._idx_eta)
 
-                lhs = gp.LinExpr()
-                rhs = 0.0
+        else:
 
-                for j in range(self._binapprox_p.n_t):
+            cols_eta = self._idx_eta_indiv.ravel()
 
-                    lhs.addTerms(self._binapprox_p.dt[j], self._b_bin_sym[(i,j)])
-                    rhs += self._binapprox_p.dt[j] * self._binapprox_p.b_rel[i][j]
+        for sign in [1.0, -1.0]:
 
-                    self._model.addLConstr(lhs + self._eta_sym_indiv[(i,j)], gp.GRB.GREATER_EQUAL, rhs)
-                    self._model.addLConstr(lhs - self._eta_sym_indiv[(i,j)], gp.GRB.LESS_EQUAL, rhs)
+            self._add_constraint_pattern([cols_eta, self._idx_eta_acc.ravel()], \
+                [1.0, sign], ">", 0.0)
 
-            for j in range(self._binapprox_p.n_t):
+        if self._binapprox_p.cia_norm == "column_sum_norm":
 
-                self._model.addConstr(self._eta_sym >= gp.quicksum( \
-                        [self._eta_sym_indiv[(i,j)]  for i in range(self._binapprox_p.n_c)]))
+            self._add_constraints( \
+                np.concatenate([np.arange(n_t), np.tile(np.arange(n_t), n_c)]), \
+                np.concatenate([np.full(n_t, self._idx_eta), self._idx_eta_indiv.ravel()]), \
+                np.append(np.ones(n_t), -np.ones(n_c * n_t)), ">", np.zeros(n_t))
 
         elif self._binapprox_p.cia_norm == "row_sum_norm":
 
-            for i in range(self._binapprox_p.n_c):
+            self._add_constraints( \
+                np.concatenate([np.arange(n_c), np.repeat(np.arange(n_c), n_t)]), \
+                np.concatenate([np.full(n_c, self._idx_eta), self._idx_eta_indiv.ravel()]), \
+                np.append(np.ones(n_c), -np.ones(n_c * n_t)), ">", np.zeros(n_c))
 
-                lhs = gp.LinExpr()
-                rhs = 0.0
+        print("done")
 
-                for j in range(self._binapprox_p.n_t):
 
-                    lhs.addTerms(self._binapprox_p.dt[j], self._b_bin_sym[(i,j)])
-                    rhs += self._binapprox_p.dt[j] * self._binapprox_p.b_rel[i][j]
+    def _setup_sos1_constraints(self):
 
-                    self._model.addLConstr(lhs + self._eta_sym_indiv[(i,j)], gp.GRB.GREATER_EQUAL, rhs)
-                    self._model.addLConstr(lhs - self._eta_sym_indiv[(i,j)], gp.GRB.LESS_EQUAL, rhs)
+        print("  - SOS1 constraints ... ", end = "", flush = True)
 
-            for i in range(self._binapprox_p.n_c):
+        n_t = self._binapprox_p.n_t
 
-                self._model.addConstr(self._eta_sym >= gp.quicksum( \
-                        [self._eta_sym_indiv[(i,j)]  for j in range(self._binapprox_p.n_t)]))
+        self._add_constraints(np.tile(np.arange(n_t), self._binapprox_p.n_c), \
+            self._idx_b_bin[:, 1:].ravel(), np.ones(self._idx_b_bin[:, 1:].size), "=", np.ones(n_t))
 
         print("done")
 
+         
+    def _determine_switching_terms(self, i: np.ndarray, j: np.ndarray) -> tuple:
 
-    def _setup_sos1_constraints(self):
+        # variables and coefficients representing the switching indicators
+        # of controls i between time points j-1 and j; for the compact
+        # formulation, a control not switched on is either switched off or
+        # not switched, so that s = 2 * s_on - b(j) + b(j-1)
 
-        print("  - SOS1 constraints ... ", end = "", flush = True)
+        if self._switching_formulation == "standard":
 
-        for j in range(self._binapprox_p.n_t):
+            return [self._idx_s[i, j]], [1.0]
 
-            self._model.addConstr(gp.quicksum([self._b_bin_sym[(i,j)] for i in range(self._binapprox_p.n_c)]) == 1)
+        return [self._idx_s_on[i, j], self._idx_b_bin[i, j+1], \
+            self._idx_b_bin[i, j]], [2.0, -1.0, 1.0]
 
-        print("done")
 
-         
     def _setup_maximum_switching_constraints(self):
 
         print("  - Maximum switching constraints ... ", end = "", flush = True)
 
-        for i in range(self._binapprox_p.n_c):
+        n_c = self._binapprox_p.n_c
+        n_t = self._binapprox_p.n_t
 
-            for j in range(-1,self._binapprox_p.n_t-1):
+        b_pre = self._idx_b_bin[:, :-1].ravel()
+        b_post = self._idx_b_bin[:, 1:].ravel()
 
-                self._model.addConstr(self._s[(i,j)] >= self._b_bin_sym[(i,j)] - self._b_bin_sym[(i,j+1)])
-                self._model.addConstr(self._s[(i,j)] >= -self._b_bin_sym[(i,j)] + self._b_bin_sym[(i,j+1)])
-                self._model.addConstr(self._s[(i,j)] <= self._b_bin_sym[(i,j)] + self._b_bin_sym[(i,j+1)])
-                self._model.addConstr(self._s[(i,j)] <= 2 - self._b_bin_sym[(i,j)] - self._b_bin_sym[(i,j+1)])
+        if self._switching_formulation == "standard":
 
-        for i, sigma_max_i in enumerate(self._binapprox_p.n_max_switches):
+            s = self._idx_s.ravel()
 
-            if sigma_max_i % 2 == 0:
+            self._add_constraint_pattern([s, b_pre, b_post], [1, -1, 1], ">", 0)
+            self._add_constraint_pattern([s, b_pre, b_post], [1, 1, -1], ">", 0)
+            self._add_constraint_pattern([s, b_pre, b_post], [1, -1, -1], "<", 0)
+            self._add_constraint_pattern([s, b_pre, b_post], [1, 1, 1], "<", 2)
 
-                self._model.addConstr((self._b_bin_sym[(i,-1)] - self._b_bin_sym[(i,self._binapprox_p.n_t-1)] + \
-                    gp.quicksum([self._s[(i,j)] for j in range(-1,self._binapprox_p.n_t-1)])) <= sigma_max_i)
-                self._model.addConstr((self._b_bin_sym[(i,self._binapprox_p.n_t-1)] - self._b_bin_sym[(i,-1)] + \
-                    gp.quicksum([self._s[(i,j)] for j in range(-1,self._binapprox_p.n_t-1)])) <= sigma_max_i) 
+        else:
 
-            else:
+            self._add_constraint_pattern([self._idx_s_on.ravel(), b_pre, b_post], \
+                [1, 1, -1], ">", 0)
 
-                self._model.addConstr((1 - self._b_bin_sym[(i,-1)] - self._b_bin_sym[(i,self._binapprox_p.n_t-1)] + \
-                    gp.quicksum([self._s[(i,j)] for j in range(-1, self._binapprox_p.n_t-1)])) <= sigma_max_i)
-                self._model.addConstr((self._b_bin_sym[(i,-1)] + self._b_bin_sym[(i,self._binapprox_p.n_t-1)] - 1 + \
-                    gp.quicksum([self._s[(i,j)] for j in range(-1, self._binapprox_p.n_t-1)])) <= sigma_max_i)  
+        i_s, j_s = np.indices((n_c, n_t))
+        cols_s, coeffs_s = self._determine_switching_terms(i_s.ravel(), j_s.ravel())
 
-        print("done")
+        # the number of switches is bounded depending on the parity of the
+        # maximum number of switches and the controls at t_0-1 and t_f
 
+        n_max_switches = np.asarray(self._binapprox_p.n_max_switches, dtype = float)
+        even = (n_max_switches % 2 == 0)
 
-    def _setup_dwell_time_constraints(self):
+        rows = np.concatenate([np.arange(n_c), np.arange(n_c)] + \
+            [np.repeat(np.arange(n_c), n_t)] * len(cols_s))
+        cols = np.concatenate([self._idx_b_bin[:, 0], self._idx_b_bin[:, -1]] + cols_s)
 
-        print("  - Dwell time constraints ... ", end = "", flush = True)
+        for coeff_first, coeff_last, rhs in [ \
+            (np.where(even, 1.0, -1.0), -1.0, np.where(even, n_max_switches, n_max_switches - 1)), \
+            (np.where(even, -1.0, 1.0), 1.0, np.where(even, n_max_switches, n_max_switches + 1))]:
 
-        dt_sums = np.zeros((self._binapprox_p.n_t, self._binapprox_p.n_t)) 
+            vals = np.concatenate([coeff_first * np.ones(n_c), coeff_last * np.ones(n_c)] + \
+                [np.full(n_c * n_t, coeff) for coeff in coeffs_s])
 
-        for j in range(self._binapprox_p.n_t):
+            self._add_constraints(rows, cols, vals, "<", rhs)
 
-                dt_sums[j][j] = self._binapprox_p.dt[j]
+        print("done")
 
-                for k in range(j+1,self._binapprox_p.n_t):
 
-                    dt_sums[j][k] =  dt_sums[j][k-1] + self._binapprox_p.dt[k] 
+    def _determine_dwell_time_windows(self, dwell_time: float, j_first: int) -> tuple:
 
-        for i in range(self._binapprox_p.n_c):
+        # windows [a, k] of the time points j_first <= j <= k with
+        # t_k - t_j < dwell_time for all time points k the window of which
+        # contains more than k itself, and the time points j >= 1 of the
+        # switches within the windows
 
-            for k in range(1,self._binapprox_p.n_t):
+        t = self._binapprox_p.t
+        n_t = self._binapprox_p.n_t
 
-                if dt_sums[0][k-1] < self._binapprox_p.min_up_times[i]:  
-                    self._model.addLConstr(gp.LinExpr([1.0, -1.0], [self._b_bin_sym[(i,k)], \
-                        self._b_bin_sym[(i,0)]]), gp.GRB.GREATER_EQUAL, 0.0)
+        k = np.arange(n_t)
+        a = np.maximum(np.searchsorted(t, t[k] - dwell_time, side = "right"), j_first)
 
-            for j in range(1,self._binapprox_p.n_t):
+        k, a = k[a < k], a[a < k]
 
-                for k in range(j+1,self._binapprox_p.n_t):
+        j_first = np.maximum(a, 1)
+        n_j = k - j_first + 1
 
-                    if dt_sums[j][k-1] < self._binapprox_p.min_up_times[i]:  
-                        self._model.addLConstr(gp.LinExpr([1.0, -1.0, 1.0], [self._b_bin_sym[(i,k)], \
-                            self._b_bin_sym[(i,j)], self._b_bin_sym[(i,j-1)]]), gp.GRB.GREATER_EQUAL, 0.0)
+        rows = np.repeat(np.arange(k.size), n_j)
+        j = np.repeat(j_first, n_j) + np.arange(rows.size) - np.repeat(np.cumsum(n_j) - n_j, n_j)
 
-                    if dt_sums[j][k-1] < self._binapprox_p.min_down_times[i]:
-                        self._model.addLConstr(gp.LinExpr([1.0, 1.0, -1.0], [self._b_bin_sym[(i,k)], \
-                            self._b_bin_sym[(i,j-1)], self._b_bin_sym[(i,j)]]), gp.GRB.LESS_EQUAL, 1.0)
+        return k, a, rows, j
 
-        print("done")
 
+    def _setup_dwell_time_constraints(self):
 
-    def _setup_valid_control_transitions_constraints(self):
+        print("  - Dwell time constraints ... ", end = "", flush = True)
 
-        print("  - Valid control transitions constraints ... ", end = "", flush = True)
+        # switches within a window of time points shorter than the minimum
+        # up-time (down-time) are only possible if the control is active
+        # (inactive) at the start and at the end of the window, which
+        # yields one constraint per time point instead of one per pair of
+        # time points; b_bin[i, a] refers to time point a-1
 
         for i in range(self._binapprox_p.n_c):
 
-            for j in range(1,self._binapprox_p.n_t):
+            # a control active at t_0 is considered as activated at t_0
+
+            k, a, rows, j = self._determine_dwell_time_windows( \
+                self._binapprox_p.min_up_times[i], 0)
 
-                self._model.addConstr(1 >= self._b_bin_sym[(i,j)] + \
-                    gp.quicksum(self._b_bin_sym[(l,j-1)] for l in range(self._binapprox_p.n_c) if self._binapprox_p.b_adjacencies[l][i] == 0)) 
+            if k.size > 0:
+
+                cols_s, coeffs_s = self._determine_switching_terms(i, j)
+
+                self._add_constraints( \
+                    np.concatenate([rows] * len(cols_s) + [np.arange(k.size), np.arange(k.size)]), \
+                    np.concatenate(cols_s + [self._idx_b_bin[i, k+1], \
+                        self._idx_b_bin[i, np.maximum(a, 1)]]), \
+                    np.concatenate([np.full(rows.size, coeff) for coeff in coeffs_s] + \
+                        [-np.ones(k.size), np.where(a == 0, 1.0, -1.0)]), "<", np.zeros(k.size))
+
+            k, a, rows, j = self._determine_dwell_time_windows( \
+                self._binapprox_p.min_down_times[i], 1)
+
+            if k.size > 0:
+
+                cols_s, coeffs_s = self._determine_switching_terms(i, j)
+
+                self._add_constraints( \
+                    np.concatenate([rows] * len(cols_s) + [np.arange(k.size), np.arange(k.size)]), \
+                    np.concatenate(cols_s + [self._idx_b_bin[i, k+1], self._idx_b_bin[i, a]]), \
+                    np.concatenate([np.full(rows.size, coeff) for coeff in coeffs_s] + \
+                        [np.ones(2 * k.size)]), "<", np.full(k.size, 2.0))
 
         print("done")
 
 
-    def _setup_valid_controls_for_intervals_constraints(self):
+    def _setup_valid_control_transitions_constraints(self):
 
-        print("  - Valid controls for intervals constraints ... ", end = "", flush = True)
+        print("  - Valid control transitions constraints ... ", end = "", flush = True)
+
+        n_t = self._binapprox_p.n_t
 
         for i in range(self._binapprox_p.n_c):
 
-            for j in range(self._binapprox_p.n_t):
+            # b_adjacencies[i][l] indicates whether control i can follow
+            # control l, including the control active at t_0-1
 
-                if self._binapprox_p.b_valid[i][j] == 0:
+            l_invalid = np.flatnonzero(self._binapprox_p.b_adjacencies[i] == 0)
 
-                    self._model.addConstr(self._b_bin_sym[(i,j)]  == 0)
+            if l_invalid.size > 0:
 
-        print("done")
+                self._add_constraint_pattern([self._idx_b_bin[i, 1:]] + \
+                    [self._idx_b_bin[l, :-1] for l in l_invalid], \
+                    np.ones(l_invalid.size + 1), "<", 1)
 
+        print("done")
 
 
-    def _setup_milp(self, binapprox: BinApprox) -> None:
+    def _setup_milp(self) -> None:
 
-        print("Setting up MILP model for Gurobi:")
+        print("Setting up MILP model for " + self._solver + ":")
 
         start_time = time.time()
         
         self._setup_model_variables()
-        self._setup_b_bin_pre_variables()
-        self._setup_objective()
         self._setup_approximation_inequalities()
         self._setup_sos1_constraints()
         self._setup_maximum_switching_constraints()
         self._setup_dwell_time_constraints()
         self._setup_valid_control_transitions_constraints()
-        self._setup_valid_controls_for_intervals_constraints()
 
+        self._milp = solvers[self._solver](self._variables, self._constraints)
+        self._model_size = (self._n_vars, sum(A.shape[0] for A, _, _ in self._constraints))
+
+        del self._variables, self._constraints
+
+        self._setup_time = time.time() - start_time
 
         print("\nModel set up finished after", \
-            round(time.time() - start_time, 2), "seconds\n")
+            round(self._setup_time, 2), "seconds, model size:", \
+            self._model_size[0], "variables,", self._model_size[1], "constraints\n")
 
 
-    def __init__(self, binapprox: BinApprox) -> None:
+    def __init__(self, binapprox: BinApprox, solver: str = None, \
+        variable_names: bool = False, switching_formulation: str = "standard") -> None:
 
         self._apply_preprocessing(binapprox)
-        self._initialize_milp()
-        self._setup_milp(binapprox)
+        self._initialize_milp(solver = solver, variable_names = variable_names, \
+            switching_formulation = switching_formulation)
+        self._setup_milp()
+
+
+    def _update_milp(self) -> None:
+
+        b_active = self._binapprox_p._b_active
+        t_active = self._binapprox_p._t_active
+
+        self._binapprox_p = BinApproxPreprocessed(self._binapprox)
+
+        if not (np.array_equal(b_active, self._binapprox_p._b_active) and \
+            np.array_equal(t_active, self._binapprox_p._t_active)):
+
+            # the controls or time points removed by preprocessing changed,
+            # so that the model structure changes as well
+
+            self._initialize_milp(solver = self._solver, variable_names = self._variable_names, \
+                switching_formulation = self._switching_formulation)
+            self._setup_milp()
+
+            return
+
+        start_time = time.time()
+
+        rhs = self._determine_approximation_rhs()
+
+        for block in self._approximation_constraints:
+
+            self._milp.set_rhs(block, rhs)
+
+        lb_b_bin, ub_b_bin = self._determine_b_bin_bounds()
+
+        self._milp.set_bounds(self._idx_b_bin[:, 0], lb_b_bin[:, 0], ub_b_bin[:, 0])
+
+        self._setup_time = time.time() - start_time
+
+
+    def update_b_rel(self, b_rel: Union[list, np.ndarray]) -> None:
+
+        '''
+        Replace the relaxed controls of the binary approximation problem on
+        the same time grid, e. g., for the next step of a model predictive
+        controller. As the relaxed controls only enter the right hand sides
+        of the approximation inequalities, the existing model is modified
+        instead of set up anew, so that the solver can reuse information
+        from previous solves. If the modification changes the controls
+        removed by preprocessing, the model is set up anew.
+
+        :param b_rel: Relaxed binary controls of shape (n_c, n_t), which are
+                      checked and clamped as in :class:`pycombina.BinApprox`.
+        '''
+
+        b_rel = np.atleast_2d(np.asarray(b_rel, dtype = float))
+
+        if not (b_rel.shape == self._binapprox.b_rel.shape or \
+            b_rel.T.shape == self._binapprox.b_rel.shape):
+
+            raise ValueError("b_rel must be of shape (n_c, n_t) of the given problem.")
+
+        self._binapprox._set_relaxed_binaries_b_rel(b_rel, \
+            binary_threshold = self._binapprox._binary_threshold, copy = False)
+        self._binapprox._check_sos1_constraint_fulfilled()
+
+        self._update_milp()
+
+
+    def update_b_bin_pre(self, b_bin_pre: Union[list, np.ndarray]) -> None:
+
+        '''
+        Replace the control active at time point t_0-1, see
+        :meth:`pycombina.BinApprox.set_b_bin_pre`, by modifying the bounds
+        of the existing model, see :meth:`update_b_rel`.
+        '''
+
+        self._binapprox.set_b_bin_pre(b_bin_pre)
+        self._update_milp()
+
+
+    def update_eta_pre(self, eta_pre: Union[list, np.ndarray]) -> None:
+
+        '''
+        Replace the accumulated deviations at time point t_0, see
+        :meth:`pycombina.BinApprox.set_eta_pre`, by modifying the right hand
+        sides of the existing model, see :meth:`update_b_rel`.
+        '''
+
+        self._binapprox.set_eta_pre(eta_pre)
+        self._update_milp()
+
+
+    def _determine_start_values(self, b_bin: np.ndarray) -> tuple:
+
+        # indices and values of the binary variables for a binary solution
+        # of the original problem, the control active at t_0-1 is assumed
+        # to be continued at t_0 if not given
+
+        b_bin = self._binapprox_p.reduce_b_bin(b_bin)
+
+        if self._binapprox_p.b_bin_pre.sum() == 1:
+
+            b_bin_pre = self._binapprox_p.b_bin_pre
+
+        else:
+
+            b_bin_pre = b_bin[:, 0]
+
+        return self._idx_b_bin.ravel(), \
+            np.hstack([np.asarray(b_bin_pre)[:, None], b_bin]).ravel().astype(float)
+
+
+    def _run_rounding_heuristic(self) -> np.ndarray:
+
+        # best feasible solution of the constraint-aware rounding strategies
+
+        try:
+            from ._combina_sur import CombinaSUR
+
+        except ImportError:
+            raise RuntimeError("No binary solution available for warm-starting.")
+
+        combina = CombinaSUR(self._binapprox)
+        b_rel_stack = self._binapprox.b_rel[None, :, :]
+
+        b_bin_start, eta_start = None, np.inf
+
+        for strategy in CombinaSUR.get_rounding_strategies():
+
+            b_bin, eta = combina.solve_batch(b_rel_stack, strategy = strategy)
+
+            # plain sum-up rounding does not consider the constraints
+
+            if eta[0] < eta_start and self._binapprox.evaluate(b_bin[0])["feasible"][0]:
+
+                b_bin_start, eta_start = b_bin[0], eta[0]
+
+        if b_bin_start is None:
 
+            raise RuntimeError("No feasible solution found for warm-starting.")
+
+        return b_bin_start
 
 
     def _setup_warm_start(self, use_warm_start: bool) -> None:
 
-        if use_warm_start:
+        if not use_warm_start:
 
-            raise NotImplementedError("Warm-starting not yet implemented.")
+            return
 
-            # for i in range(self._binapprox_p.n_c):
+        # HiGHS via scipy.optimize.milp cannot use a warm start, so that the
+        # rounding heuristic is not run for it
 
-            #     for j in range(self._binapprox_p.n_t):
+        if self._solver != "gurobi":
 
-            #         self._b_bin_sym[(i,j)].start = self._binapprox_p._b_bin[i][j]
+            warnings.warn("Warm-starting is not supported by HiGHS via " + \
+                "scipy.optimize.milp, the warm start is ignored.")
 
+            return
 
-    def _run_solver(self, gurobi_opts: dict) -> None:
+        try:
+            b_bin = self._binapprox.b_bin
 
-        for gurobi_opt in gurobi_opts.keys():
+        except AttributeError:
+            b_bin = self._run_rounding_heuristic()
 
-            try:
+        self._milp.set_start(*self._determine_start_values(b_bin))
 
-                self._model.setParam(gurobi_opt, gurobi_opts[gurobi_opt])
 
-            except ValueError:
+    def _setup_incumbents(self, incumbents: queue.Queue):
 
-                raise ValueError("Values of solver options must be of numerical type.")
+        if incumbents is None:
 
-        self._model.optimize()
+            return None
 
+        def get_incumbent():
 
-    def _retrieve_solutions(self):
+            # only the latest of the queued incumbents is injected
 
-        self._binapprox_p._eta = self._model.getVarByName(self._eta_sym.VarName).x
-        self._binapprox_p._b_bin = []
+            b_bin = None
 
-        for i in range(self._binapprox_p.n_c):
+            while True:
+
+                try:
+                    b_bin = incumbents.get_nowait()
+
+                except queue.Empty:
+                    break
+
+            return None if b_bin is None else self._determine_start_values(b_bin)
+
+        return get_incumbent
+
+
+    def _run_solver(self, solver_opts: dict, incumbents: queue.Queue) -> None:
+
+        self._status_from_cache = None
+
+        self._x = self._milp.solve(solver_opts, \
+            incumbents = self._setup_incumbents(incumbents))
 
-            self._binapprox_p._b_bin.append([abs(round(self._model.getVarByName( \
-                self._b_bin_sym[(i,j)].VarName).x)) for j in range(self._binapprox_p.n_t)])
+
+    def _retrieve_solutions(self):
+
+        self._binapprox_p._eta = float(self._x[self._idx_eta])
+        self._binapprox_p._b_bin = np.abs(np.rint(self._x[self._idx_b_bin[:, 1:]]))
 
 
     def _set_solution(self):
 
         self._binapprox_p.inflate_solution()
         self._binapprox.set_b_bin(self._binapprox_p.b_bin)
-        self._binapprox.set_eta(self._binapprox_p.eta)
 
+        # the objective value is recomputed from the rounded binary controls,
+        # since the recursion over the accumulated deviations can add up the
+        # feasibility tolerances of the solver
 
-    def solve(self, use_warm_start: bool = False , gurobi_opts: dict = {}):
+        self._binapprox.set_eta( \
+            self._binapprox.evaluate(self._binapprox.b_bin)["eta"][0])
+
+
+    def solve(self, use_warm_start: bool = False , gurobi_opts: dict = {}, \
+        highs_opts: dict = {}, incumbents: queue.Queue = None):
 
         '''
         Solve the combinatorial integral approximation problem.
 
-        :param use_warm_start: If a binary solution is already contained in the
-                               given binary approximation problem, use it to
-                               warm-start the solver.
+        Usage with incumbents found by a concurrently running
+        :class:`pycombina.CombinaBnB`::
+
+            >>> import queue, threading
+            >>> from pycombina import CombinaBnB, CombinaMILP
+
+            >>> incumbents = queue.Queue()
+            >>> bnb = threading.Thread(target = CombinaBnB(binapprox_copy).solve, \\
+            ...     kwargs = {"incumbent_callback": lambda eta, b_bin: incumbents.put(b_bin)})
+            >>> bnb.start()
+
+            >>> CombinaMILP(binapprox).solve(use_warm_start = True, incumbents = incumbents)
+
+        :param use_warm_start: Use the binary solution contained in the given
+                               binary approximation problem to warm-start the
+                               solver, or, if none is available, the best
+                               feasible solution of the rounding strategies
+                               of :class:`pycombina.CombinaSUR`. Only supported
+                               by Gurobi.
         :param gurobi_opts: Gurobi solver options (cf. Gurobi manual), examples are:
 
             - **MIPGap**: relative MIP optimality gap; when solution found fulfilling
               the gap, Gurobi stops. Default: 0.0001
             - **TimeLimit**: Limits the total time expended (in seconds). Default: Infinity
 
+        :param highs_opts: HiGHS solver options (cf. scipy.optimize.milp), examples are:
+
+            - **mip_rel_gap**: relative MIP optimality gap; when solution found fulfilling
+              the gap, HiGHS stops. Default: 0.0001
+            - **time_limit**: Limits the total time expended (in seconds). Default: Infinity
+            - **disp**: Print the solver log. Default: False
+
+        :param incumbents: Queue of binary solutions of shape (n_c, n_t), e. g.,
+                           filled by the incumbent_callback of a concurrently
+                           running :class:`pycombina.CombinaBnB` on a copy of
+                           the problem, which are passed to the solver as new
+                           incumbents while solving. Only supported by Gurobi.
+
         '''
 
         self._setup_warm_start(use_warm_start = use_warm_start)
-        self._run_solver(gurobi_opts = gurobi_opts)
+        self._run_solver(solver_opts = gurobi_opts if self._solver == "gurobi" else highs_opts, \
+            incumbents = incumbents)
         self._retrieve_solutions()
         self._set_solution()
 
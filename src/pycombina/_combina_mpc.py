@@ -0,0 +1,317 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import warnings
+import numpy as np
+from typing import Union
+
+from ._binary_approximation import BinApprox
+from ._combina_bnb import CombinaBnB
+from ._window_state import WindowState
+
+
+class CombinaMPC():
+
+    '''
+    Solve a sequence of binary approximation problems on a receding time
+    horizon, as it arises within model predictive control (MPC).
+
+    After solving the problem on the current horizon using
+    :class:`pycombina.CombinaBnB`, :meth:`shift` applies the solution on
+    the first time intervals of the horizon and appends new time intervals
+    at its end. The accumulated deviations, the active control, the used
+    switches and up-times as well as unfulfilled minimum up- and down-times
+    are carried over from one step to the next, so that the applied
+    solution fulfills the constraints of the given problem on the overall
+    time horizon. In particular, the maximum number of switches and the
+    total maximum up-times apply to the overall time horizon.
+
+    The solution on the previous horizon, shifted and continued by the
+    last active control on the appended time intervals, is used to
+    warm-start the solver if it is feasible on the new horizon, so that its
+    objective value serves as initial upper bound.
+
+    The problem on the horizon and the solver are set up once. On each
+    shift, their time points, relaxed and valid controls are shifted in
+    place and the carried over state is updated, unless preprocessing of
+    the problem removes controls or time points, in which case the solver
+    is set up anew.
+
+    The options of :class:`pycombina.BinApprox` supported by
+    :class:`pycombina.CombinaBnB` are supported.
+
+    Usage::
+
+        >>> from pycombina import BinApprox, CombinaMPC
+
+        >>> mpc = CombinaMPC(BinApprox(t, b_rel))
+
+        >>> for t_next, b_rel_next in samples:
+        ...     mpc.solve(verbosity = 0)
+        ...     apply_control(mpc.b_bin[:, 0])
+        ...     mpc.shift([t_next], b_rel_next)
+
+    :param BinApprox: Binary approximation problem on the initial horizon
+
+    :param use_warm_start: If set, the shifted previous solution is used to
+                           warm-start the solver. *Default:* True.
+
+    '''
+
+    @property
+    def binapprox(self) -> BinApprox:
+
+        '''
+        Binary approximation problem on the current horizon, which contains
+        the solution after calling :meth:`solve`.
+        '''
+
+        return self._binapprox_h
+
+
+    @property
+    def b_bin(self) -> np.ndarray:
+
+        '''
+        Binary solution on the current horizon.
+        '''
+
+        try:
+            return self._binapprox_h.b_bin
+
+        except AttributeError:
+            raise RuntimeError("No solution available, solve() has not been called yet.")
+
+
+    @property
+    def status(self):
+
+        '''
+        Exit status of the Branch-and-Bound solver on the current horizon.
+        '''
+
+        try:
+            return self._combina.status
+
+        except AttributeError:
+            raise RuntimeError("Solver status undefined, solve() has not been called yet.")
+
+
+    @property
+    def solution_time(self):
+
+        '''
+        Solution time of the Branch-and-Bound solver on the current horizon.
+        '''
+
+        try:
+            return self._combina.solution_time
+
+        except AttributeError:
+            raise RuntimeError("Solution time undefined, solve() has not been called yet.")
+
+
+    @property
+    def eta_max(self) -> float:
+
+        '''
+        Maximum absolute accumulated deviation on the applied part of the
+        time horizon.
+        '''
+
+        return self._state.eta_max
+
+
+    def _setup_horizon(self) -> None:
+
+        with warnings.catch_warnings():
+
+            # deviations from the SOS1 constraint have already been reported
+            # for the appended relaxed controls
+
+            warnings.simplefilter("ignore")
+
+            self._binapprox_h = BinApprox(self._t, self._b_rel, \
+                binary_threshold = self._binapprox._binary_threshold, \
+                reduce_problem_size_before_solve = self._binapprox.reduce_problem_size_before_solve)
+
+        # the appended relaxed controls are clamped as those of the original
+        # problem, which also applies to the deviations carried over
+
+        self._b_rel = self._binapprox_h.b_rel
+
+        self._apply_state()
+
+
+    def _apply_state(self) -> None:
+
+        self._binapprox_h.set_valid_controls(self._b_valid)
+        self._state.apply(self._binapprox_h, self._state.n_switches_remaining)
+
+
+    def _shift_horizon(self, n_shift: int) -> None:
+
+        # the time points and relaxed controls are views on the arrays of
+        # the problem on the horizon, which are shifted in place, so that
+        # only the appended relaxed controls need to be clamped
+
+        binapprox_h = self._binapprox_h
+
+        binapprox_h._set_time_points_t(self._t)
+        binapprox_h._set_relaxed_binaries_b_rel(self._b_rel, \
+            binary_threshold = self._binapprox._binary_threshold, copy = False)
+        binapprox_h._compute_time_grid_from_time_points()
+        binapprox_h._compute_dwell_time_tolerance()
+
+        # the solution on the previous horizon is discarded
+
+        for name in ["_b_bin", "_eta", "_switching_sequence"]:
+
+            vars(binapprox_h).pop(name, None)
+
+        self._apply_state()
+
+        self._combina._shift_horizon(n_shift)
+
+
+    def __init__(self, binapprox: BinApprox, use_warm_start: bool = True) -> None:
+
+        self._binapprox = binapprox
+        self._use_warm_start = use_warm_start
+
+        self._t = np.array(binapprox.t, dtype = float)
+        self._b_rel = np.array(binapprox.b_rel, dtype = float)
+        self._b_valid = np.array(binapprox.b_valid, dtype = int)
+
+        self._state = WindowState(binapprox)
+        self._b_bin_warm_start = None
+
+        self._setup_horizon()
+
+
+    def _setup_warm_start(self) -> bool:
+
+        if not self._use_warm_start or self._b_bin_warm_start is None:
+
+            return False
+
+        # the shifted solution is only used if it is feasible, as the solver
+        # returns the warm start unless a better solution is found
+
+        if not self._binapprox_h.evaluate(self._b_bin_warm_start)["feasible"][0]:
+
+            return False
+
+        self._binapprox_h.set_b_bin(self._b_bin_warm_start)
+
+        return True
+
+
+    def solve(self, **kwargs):
+
+        '''
+        Solve the combinatorial integral approximation problem on the
+        current horizon.
+
+        All arguments are passed on to :meth:`pycombina.CombinaBnB.solve`.
+        '''
+
+        use_warm_start = self._setup_warm_start()
+
+        # the solver is set up once and shifted along with the horizon
+
+        if not hasattr(self, "_combina"):
+
+            self._combina = CombinaBnB(self._binapprox_h)
+
+        self._combina.solve(use_warm_start = use_warm_start, **kwargs)
+
+        if not np.all(self._binapprox_h.b_bin.sum(axis = 0) == 1):
+
+            raise RuntimeError("No feasible solution found for the horizon " + \
+                "starting at t = {}.".format(self._t[0]))
+
+
+    def shift(self, new_t_tail: Union[float, list, np.ndarray], \
+        new_b_rel_tail: Union[list, np.ndarray], \
+        new_b_valid_tail: Union[list, np.ndarray] = None) -> None:
+
+        '''
+        Apply the solution on the first time intervals of the current
+        horizon and shift the horizon by appending new time intervals.
+
+        :param new_t_tail: Time points to be appended to the horizon, the
+                           number of which determines the number of time
+                           intervals the horizon is shifted by.
+
+        :param new_b_rel_tail: Relaxed controls on the appended time
+                               intervals of shape (n_c, len(new_t_tail)).
+
+        :param new_b_valid_tail: Valid controls on the appended time
+                                 intervals of the same shape as
+                                 new_b_rel_tail. *Default:* all controls
+                                 are valid.
+        '''
+
+        b_bin = self.b_bin
+
+        new_t_tail = np.atleast_1d(np.asarray(new_t_tail, dtype = float))
+        n_shift = new_t_tail.size
+
+        new_b_rel_tail = np.asarray(new_b_rel_tail, dtype = float) \
+            .reshape(self._b_rel.shape[0], n_shift)
+
+        if new_b_valid_tail is None:
+
+            new_b_valid_tail = np.ones(new_b_rel_tail.shape, dtype = int)
+
+        new_b_valid_tail = np.asarray(new_b_valid_tail, dtype = int) \
+            .reshape(new_b_rel_tail.shape)
+
+        if not n_shift < self._t.size:
+
+            raise ValueError("The horizon can be shifted by at most " + \
+                "{} time intervals.".format(self._t.size - 1))
+
+        if not np.all(np.diff(np.append(self._t[-1], new_t_tail)) > 0):
+
+            raise ValueError("Values in new_t_tail must be strictly increasing " + \
+                "and larger than the end of the current horizon.")
+
+        if not (np.all(new_b_rel_tail >= 0) and np.all(new_b_rel_tail <= 1)):
+
+            raise ValueError("All elements of the relaxed binary input " + \
+                "must be 0 <= b <= 1.")
+
+        self._state.commit(self._t[:n_shift+1], self._b_rel[:, :n_shift], \
+            b_bin[:, :n_shift])
+
+        # the shifted solution is continued by the last active control
+
+        self._b_bin_warm_start = np.hstack([b_bin[:, n_shift:], \
+            np.repeat(b_bin[:, -1:], n_shift, axis = 1)])
+
+        for a, tail in [(self._t, new_t_tail), (self._b_rel.T, new_b_rel_tail.T), \
+            (self._b_valid.T, new_b_valid_tail.T)]:
+
+            a[:-n_shift] = a[n_shift:]
+            a[-n_shift:] = tail
+
+        self._shift_horizon(n_shift)
@@ -0,0 +1,275 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import warnings
+import numpy as np
+
+from ._binary_approximation import BinApprox
+from ._combina_bnb import CombinaBnB
+
+
+class CombinaMultilevel():
+
+    '''
+    Solve a binary approximation problem on a long time grid by a sequence
+    of branch-and-bound solutions on successively refined time grids.
+
+    The relaxed controls are aggregated onto a coarse time grid on which the
+    problem is solved first. On each finer level, the previous solution is
+    prolongated and the problem is solved again, whereby the valid controls
+    are restricted to the prolongated solution except for a neighbourhood
+    of its switching times. The prolongated solution is used to warm-start
+    the solver on each level, so that its objective value serves as upper
+    bound and the objective cannot deteriorate from level to level.
+
+    Time points at which the valid controls of the given problem change are
+    always kept in the coarse grids. The result is in general not a global
+    optimum of the original problem, as switches can only be placed close
+    to the switching times found on the coarser levels.
+
+    The options of :class:`pycombina.BinApprox` supported by
+    :class:`pycombina.CombinaBnB` are supported.
+
+    :param BinApprox: Binary approximation problem
+
+    :param n_t_coarse: Maximum number of time intervals on the coarsest level.
+
+    :param refinement_factor: Factor by which the number of time intervals
+                              increases from one level to the next.
+
+    :param neighbourhood: Number of time intervals of the coarser level on
+                          both sides of a switching time within which the
+                          controls can change on the next level.
+
+    '''
+
+    @property
+    def status(self):
+
+        '''
+        Exit status of the Branch-and-Bound solver on the finest level.
+        '''
+
+        try:
+            return self._combina_levels[-1].status
+
+        except IndexError:
+            raise RuntimeError("Solver status undefined, solve() has not been called yet.")
+
+
+    @property
+    def solution_time(self):
+
+        '''
+        Accumulated solution time of the Branch-and-Bound solver on all levels.
+        '''
+
+        return sum(combina.solution_time for combina in self._combina_levels)
+
+
+    @property
+    def n_levels(self):
+
+        '''
+        Number of levels including the original time grid.
+        '''
+
+        return len(self._group_sizes)
+
+
+    @property
+    def eta_levels(self):
+
+        '''
+        Objective values obtained on the individual levels.
+        '''
+
+        return [binapprox_l.eta for binapprox_l in self._binapprox_levels]
+
+
+    def _set_parameters(self, n_t_coarse: int, refinement_factor: int, \
+        neighbourhood: int) -> None:
+
+        if not n_t_coarse >= 1:
+
+            raise ValueError("n_t_coarse must be a positive integer.")
+
+        if not refinement_factor >= 2:
+
+            raise ValueError("refinement_factor must be an integer bigger than 1.")
+
+        if not neighbourhood >= 1:
+
+            raise ValueError("neighbourhood must be a positive integer.")
+
+        self._n_t_coarse = int(n_t_coarse)
+        self._refinement_factor = int(refinement_factor)
+        self._neighbourhood = int(neighbourhood)
+
+
+    def _determine_levels(self) -> None:
+
+        n_t = self._binapprox.n_t
+        group_size = 1
+
+        self._group_sizes = [1]
+
+        while -(-n_t // group_size) > self._n_t_coarse:
+
+            group_size *= self._refinement_factor
+            self._group_sizes.insert(0, group_size)
+
+        # interval boundaries at which the valid controls change are kept
+        # on all levels, so that the valid controls are constant per group
+
+        b_valid = self._binapprox.b_valid
+        self._t_fixed = np.flatnonzero(np.any(b_valid[:, 1:] != b_valid[:, :-1], axis = 0)) + 1
+
+
+    def __init__(self, binapprox: BinApprox, n_t_coarse: int = 250, \
+        refinement_factor: int = 4, neighbourhood: int = 2) -> None:
+
+        self._binapprox = binapprox
+
+        self._set_parameters(n_t_coarse = n_t_coarse, \
+            refinement_factor = refinement_factor, neighbourhood = neighbourhood)
+        self._determine_levels()
+
+        self._binapprox_levels = []
+        self._combina_levels = []
+
+
+    def _setup_level(self, group_size: int) -> tuple:
+
+        binapprox = self._binapprox
+
+        t_start = np.union1d(np.arange(0, binapprox.n_t, group_size), self._t_fixed)
+        t = np.append(binapprox.t[t_start], binapprox.t[-1])
+
+        if group_size == 1:
+
+            b_rel = binapprox.b_rel.copy()
+
+        else:
+
+            b_rel = np.add.reduceat(binapprox.b_rel * binapprox.dt, t_start, axis = 1) / np.diff(t)
+            b_rel = np.clip(b_rel, 0.0, 1.0)
+
+        with warnings.catch_warnings():
+
+            # deviations from the SOS1 constraint have already been reported
+            # for the original problem
+
+            warnings.simplefilter("ignore")
+
+            binapprox_l = BinApprox(t, b_rel, binary_threshold = 0.0, \
+                reduce_problem_size_before_solve = True)
+
+        # dwell times are passed on without the tolerance of the original
+        # problem, which is then applied with respect to the level grid
+
+        tol = binapprox.dwell_time_tolerance
+
+        binapprox_l.set_n_max_switches(binapprox.n_max_switches)
+        binapprox_l.set_min_up_times(binapprox.min_up_times + tol)
+        binapprox_l.set_min_down_times(binapprox.min_down_times + tol)
+        binapprox_l.set_max_up_times(binapprox.max_up_times - tol)
+        binapprox_l.set_total_max_up_times(binapprox.total_max_up_times - tol)
+        binapprox_l.set_b_bin_pre(binapprox.b_bin_pre)
+        binapprox_l.set_eta_pre(binapprox.eta_pre)
+        binapprox_l.set_up_time_pre(binapprox.up_time_pre)
+        binapprox_l.set_cia_norm(binapprox.cia_norm)
+        binapprox_l.set_valid_controls(binapprox.b_valid[:, t_start])
+
+        if binapprox.n_c > 1:
+
+            for b_i in range(binapprox.n_c):
+
+                binapprox_l.set_valid_control_transitions(b_i, binapprox.b_adjacencies[:, b_i])
+
+        return binapprox_l, t_start
+
+
+    def _restrict_to_neighbourhood(self, binapprox_l: BinApprox, t_start: np.ndarray, \
+        b_active: np.ndarray) -> np.ndarray:
+
+        # b_active holds the prolongated solution per interval of the original
+        # grid, which is constant on each interval of the current level
+
+        b_active_l = b_active[t_start]
+        t_switch = np.flatnonzero(b_active_l[1:] != b_active_l[:-1]) + 1
+
+        n_t = binapprox_l.n_t
+        radius = self._neighbourhood * self._refinement_factor
+
+        count = np.zeros(n_t + 1, dtype = int)
+        np.add.at(count, np.clip(t_switch - radius, 0, n_t), 1)
+        np.add.at(count, np.clip(t_switch + radius, 0, n_t), -1)
+        free = np.cumsum(count[:-1]) > 0
+
+        b_bin_l = np.zeros((binapprox_l.n_c, n_t), dtype = int)
+        b_bin_l[b_active_l, np.arange(n_t)] = 1
+
+        binapprox_l.set_valid_controls(np.where(free, binapprox_l.b_valid, b_bin_l))
+
+        return b_bin_l
+
+
+    def solve(self, **kwargs):
+
+        '''
+        Solve the combinatorial integral approximation problem.
+
+        All arguments are passed on to :meth:`pycombina.CombinaBnB.solve`
+        on each level.
+        '''
+
+        self._binapprox_levels = []
+        self._combina_levels = []
+
+        b_active = None
+
+        for group_size in self._group_sizes:
+
+            binapprox_l, t_start = self._setup_level(group_size)
+
+            if b_active is None:
+
+                combina_l = CombinaBnB(binapprox_l)
+                combina_l.solve(**kwargs)
+
+            else:
+
+                b_bin_l = self._restrict_to_neighbourhood(binapprox_l, t_start, b_active)
+
+                binapprox_l.set_b_bin(b_bin_l)
+
+                combina_l = CombinaBnB(binapprox_l)
+                combina_l.solve(use_warm_start = True, **kwargs)
+
+            b_active = np.repeat(np.argmax(binapprox_l.b_bin, axis = 0), \
+                np.diff(np.append(t_start, self._binapprox.n_t)))
+
+            self._binapprox_levels.append(binapprox_l)
+            self._combina_levels.append(combina_l)
+
+        self._binapprox.set_b_bin(binapprox_l.b_bin)
+        self._binapprox.set_switching_sequence(*binapprox_l.switching_sequence)
+        self._binapprox.set_eta(binapprox_l.eta)
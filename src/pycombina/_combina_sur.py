@@ -19,56 +19,147 @@
 # along with pycombina. If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
-import time
 
 from ._binary_approximation import BinApprox, BinApproxPreprocessed
+from ._shared import as_binapprox
+from ._combina_sur_solver import CombinaSURSolver
 
 class CombinaSUR():
 
     '''
     Solve a binary approximation problem by combinatorial integral approximation
-    using Sum-Up-Rounding, i.e., an approximation of the global solution.
+    using Sum-Up-Rounding or a related rounding heuristic, i.e., an
+    approximation of the global solution.
 
-    CombinaSUR does not support further options of :class:`pycombina.BinApprox`.
-    These are ignored without further notice.
+    Plain Sum-Up-Rounding does not support further options of
+    :class:`pycombina.BinApprox`, these are ignored without further notice.
+    The constraint-aware rounding strategies support the following options:
 
-    :param BinApprox: Binary approximation problem
+    - Maximum number of switches
+    - Minimum up-times
+    - Minimum down-times
+    - Maximum up-times
+    - Total maximum up-times
+    - Valid controls
+    - Valid control transitions
+
+    These strategies only activate controls for which the constraints can
+    be fulfilled for the respective minimum up-time. If no such control
+    exists at some time interval, the rounding continues with
+    Sum-Up-Rounding and the solution is marked as infeasible.
+
+    :param BinApprox: Binary approximation problem, or a handle to a problem
+                      in shared memory, see :class:`pycombina.SharedBinApprox`
 
     '''
 
     _solver_status = {
 
         1: "Initialized",
-        2: "Optimal solution found",
+        2: "Feasible solution found",
+        3: "No feasible solution found",
+        4: "Solution found (constraints not enforced)",
     }
 
 
     @property
     def status(self):
 
+        '''
+        Exit status of the Sum-Up-Rounding solver. As rounding does not
+        prove optimality, a solution is at best reported as feasible. As
+        plain Sum-Up-Rounding ignores the constraints, its solution is not
+        reported as feasible, see :meth:`pycombina.BinApprox.evaluate`.
+        '''
+
         try:
-            return self._solver_status[self._sur_status]
+            return self._solver_status[self._sur_solver.get_status()]
 
         except KeyError:
             raise RuntimeError("Solver status undefined, this should not happen.\n"
                 + "Please contact the developers.")
 
 
+    @property
+    def solution_time(self):
+
+        '''
+        Solution time of the Sum-Up-Rounding solver.
+        '''
+
+        return self._sur_solver.get_solution_time()
+
+
+    @property
+    def eta_norms(self):
+
+        '''
+        Objective values of the solution for all CIA norms.
+        '''
+
+        return self._sur_solver.get_eta_norms()
+
+
+    @staticmethod
+    def get_rounding_strategies():
+        return CombinaSURSolver.strategies
+
+
     def _apply_preprocessing(self, binapprox: BinApprox) -> None:
 
-        self._binapprox = binapprox
-        self._binapprox_p = BinApproxPreprocessed(binapprox)
+        self._binapprox = as_binapprox(binapprox)
+        self._binapprox_p = BinApproxPreprocessed(self._binapprox)
+
+
+    @staticmethod
+    def _create_sur_solver(binapprox: BinApprox, b_rel: np.ndarray) -> CombinaSURSolver:
+
+        if binapprox.b_bin_pre.sum() < 1:
+
+            b_bin_pre = binapprox.n_c + 1
+
+        else:
+
+            b_bin_pre = int(np.flatnonzero(binapprox.b_bin_pre == 1)[0])
+
+        # dt, b_rel and b_valid are read once by the solver and are therefore
+        # passed as C-contiguous arrays of the expected type
+
+        sur_solver = CombinaSURSolver( \
+                np.ascontiguousarray(binapprox.dt, dtype = np.float64), \
+                np.ascontiguousarray(b_rel, dtype = np.float64), \
+
+                binapprox.n_max_switches.tolist(), \
+                binapprox.min_up_times.tolist(), \
+                binapprox.min_down_times.tolist(), \
+                binapprox.max_up_times.tolist(), \
+                binapprox.total_max_up_times.tolist(), \
+
+                np.ascontiguousarray(binapprox.b_valid, dtype = np.uint8), \
+                binapprox.b_adjacencies.tolist(), \
 
+                b_bin_pre, \
 
-    def _set_sur_status(self, sur_status):
+            )
 
-        self._sur_status = sur_status
+        if np.any(binapprox.eta_pre != 0):
+
+            sur_solver.set_eta_pre(binapprox.eta_pre.tolist())
+
+        sur_solver.set_up_time_pre(binapprox.up_time_pre)
+
+        return sur_solver
+
+
+    def _initialize_sur(self) -> None:
+
+        self._sur_solver = self._create_sur_solver(self._binapprox_p, self._binapprox_p.b_rel)
 
 
     def _setup_sur(self, binapprox: BinApprox) -> None:
 
         self._apply_preprocessing(binapprox)
-        self._set_sur_status(sur_status = 1)
+        self._initialize_sur()
 
 
     def __init__(self, binapprox: BinApprox) -> None:
@@ -76,58 +167,121 @@ class CombinaSUR():
         self._setup_sur(binapprox)
 
  
-    def solve(self, *args, **kwargs):
+    def solve(self, strategy: str = "sur", verbosity: int = 1, **kwargs):
 
         '''
         Solve the combinatorial integral approximation problem.
 
+        :param strategy: Rounding strategy. *Default:* **sur**. *Options:*
+            - **sur**: Sum-Up-Rounding, i. e., the control with the largest
+              accumulated deviation is activated,
+            - **sur_dt**: dwell-time-aware Sum-Up-Rounding, i. e., the
+              admissible control with the largest accumulated deviation
+              is activated,
+            - **sur_sr**: switch-budget-aware Sum-Up-Rounding, i. e., the
+              active control is only switched off if the accumulated
+              deviation of another admissible control exceeds its own by
+              a threshold, which grows with the remaining time per
+              remaining switch,
+            - **nfr**: next-forced rounding, i. e., the active control is
+              only switched off if it is not admissible anymore or if the
+              accumulated deviation of another admissible control exceeds
+              the length of the longest time interval.
+
+        :param verbosity: Determine how much solver information is written to
+                          the console, possible values are 0 (no output) and
+                          1 (show results after solving). *Default:* 1.
+
+        Further arguments, e. g., options of other solvers, are ignored.
         '''
 
-        self._run_sur()
+        self._run_sur(strategy = strategy)
         self._set_solution()
-        self._set_sur_status(sur_status = 2)
+        self._display_solution(verbosity = verbosity)
 
 
-    def _run_sur(self):
+    def _check_strategy(self, strategy: str) -> None:
 
-        print("Running Sum-up-rounding ... ", end = "", flush = True)
+        if strategy not in self.get_rounding_strategies():
 
-        start_time = time.time()
+            raise ValueError("strategy must be one of " + \
+                ", ".join("'{}'".format(s) for s in self.get_rounding_strategies()) + ".")
 
-        b_bin = np.zeros((self._binapprox_p.n_c, self._binapprox_p.n_t))
-        eta_i = np.zeros(self._binapprox_p.n_c)
-        eta = 0.0
 
-        for i in range(self._binapprox_p.n_t):
+    def _run_sur(self, strategy: str):
 
-            b_active = 0
+        self._check_strategy(strategy)
+        self._sur_solver.run(strategy)
 
-            for j in range(self._binapprox_p.n_c):
+        self._binapprox_p.set_b_bin(self._sur_solver.get_b_bin())
+        self._binapprox_p.set_switching_sequence(*self._sur_solver.get_switching_sequence())
+        self._binapprox_p.set_eta(self.eta_norms[self._binapprox_p.cia_norm])
 
-                eta_i[j] = eta_i[j] + self._binapprox_p.b_rel[j][i] * self._binapprox_p.dt[i] 
 
-                if (eta_i[j] > eta_i[b_active]):
+    def _set_solution(self):
+
+        self._binapprox_p.inflate_solution()
+        self._binapprox.set_b_bin(self._binapprox_p.b_bin)
+        self._binapprox.set_switching_sequence(*self._binapprox_p.switching_sequence)
+        self._binapprox.set_eta(self._binapprox_p.eta)
 
-                    b_active = j
 
-            b_bin[b_active][i] = 1
+    def _display_solution(self, verbosity: int) -> None:
 
-            eta_i[b_active] =  eta_i[b_active] - 1 * self._binapprox_p.dt[i] 
-            eta = max(eta, np.abs(eta_i).max())
-        
-        self._binapprox_p._b_bin = b_bin
-        self._binapprox_p._eta = eta
+        if verbosity > 0:
 
-        print("done")
+            print("Rounding finished: {}\n".format(self.status))
+            print("    Best solution: {:.6e}".format(self._binapprox.eta))
+            print("    Total runtime: {:.6e} s".format(self.solution_time))
+            print("\n")
 
-        print("\n    Best solution: {:.6e}".format(eta))
-        print("    Total runtime: {:.6e} s".format(time.time() - start_time))
-        print("\n")
 
+    def solve_batch(self, b_rel_stack: np.ndarray, strategy: str = "sur") -> tuple:
 
-    def _set_solution(self):
+        '''
+        Round a batch of relaxed binary controls on the time grid and with
+        the options of the binary approximation problem in one pass, e. g.,
+        for the scenarios of a scenario-based MPC. The binary approximation
+        problem itself and the state of the solver are not modified.
 
-        self._binapprox_p.inflate_solution()
-        self._binapprox.set_b_bin(self._binapprox_p.b_bin)
-        self._binapprox.set_eta(self._binapprox_p.eta)
+        Usage::
+
+            >>> combina = CombinaSUR(binapprox)
+            >>> b_bin_stack, eta = combina.solve_batch(b_rel_stack, strategy = "sur_dt")
+
+        The relaxed controls are used as given, i. e., without the checks,
+        thresholding and preprocessing applied by :class:`pycombina.BinApprox`.
+
+        :param b_rel_stack: Relaxed binary controls of shape (n_s, n_c, n_t)
+                            for n_s instances.
+
+        :param strategy: Rounding strategy, see :meth:`solve`.
+
+        :returns: Binary controls of shape (n_s, n_c, n_t) and objective
+                  values of shape (n_s,) according to the CIA norm of the
+                  binary approximation problem. The objective value is
+                  infinite for instances for which no feasible solution
+                  has been found by a constraint-aware strategy.
+        '''
+
+        self._check_strategy(strategy)
+
+        b_rel_stack = np.ascontiguousarray(b_rel_stack, dtype = np.float64)
+
+        if not (b_rel_stack.ndim == 3 and \
+            b_rel_stack.shape[1:] == (self._binapprox.n_c, self._binapprox.n_t)):
+
+            raise ValueError("b_rel_stack must be of shape (n_s, n_c, n_t).")
+
+        if b_rel_stack.shape[0] == 0:
+
+            return np.zeros(b_rel_stack.shape, dtype = np.uint8), np.zeros(0)
+
+        sur_solver = self._create_sur_solver(self._binapprox, b_rel_stack[0])
+
+        b_bin_stack, eta_stack, feasible = sur_solver.run_batch(strategy, b_rel_stack)
+
+        eta = eta_stack[:, CombinaSURSolver.cia_norms.index(self._binapprox.cia_norm)]
+        eta[~feasible] = np.inf
 
+        return b_bin_stack, eta
@@ -0,0 +1,289 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import warnings
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ._binary_approximation import BinApprox
+from ._combina_bnb import CombinaBnB
+from ._window_state import WindowState
+
+
+class CombinaWindowed():
+
+    '''
+    Solve a binary approximation problem with a long time horizon by a
+    moving-window decomposition heuristic.
+
+    A window of window_size time intervals is moved over the time horizon.
+    The problem on each window is solved using :class:`pycombina.CombinaBnB`
+    and the solution on the first commit_size time intervals of the window
+    is committed, before the next window starts at the end of the committed
+    part. The accumulated deviations, the active control, the used switches
+    and up-times as well as unfulfilled minimum up- and down-times are
+    carried over from one window to the next, so that the solution is
+    feasible for the original problem, while the effort grows only linearly
+    with the number of time intervals. The solution is in general not
+    optimal for the original problem.
+
+    While the problem on one window is being solved, the problem on the
+    next window is set up concurrently.
+
+    The options of :class:`pycombina.BinApprox` supported by
+    :class:`pycombina.CombinaBnB` are supported.
+
+    :param BinApprox: Binary approximation problem
+
+    :param window_size: Number of time intervals per window.
+
+    :param commit_size: Number of time intervals committed per window,
+                        *Default:* half of the window size.
+
+    :param switch_policy: Distribution of the maximum number of switches
+                          over the windows. *Default:* **proportional**.
+                          *Options:*
+
+        - **proportional**: the number of switches used until the end of
+          each window may be at most proportional to the elapsed share of
+          the time horizon, rounded up,
+        - **greedy**: each window may use all remaining switches.
+
+    '''
+
+    _switch_policies = ["proportional", "greedy"]
+
+
+    @property
+    def status(self):
+
+        '''
+        Exit status of the Branch-and-Bound solver. If the solver did not
+        find an optimal solution on all windows, the status of the first
+        window for which this is not the case is returned.
+        '''
+
+        try:
+            statuses = [combina.status for combina in self._combina_windows]
+            return next((status for status in statuses \
+                if status != "Optimal solution found"), statuses[-1])
+
+        except IndexError:
+            raise RuntimeError("Solver status undefined, solve() has not been called yet.")
+
+
+    @property
+    def solution_time(self):
+
+        '''
+        Accumulated solution time of the Branch-and-Bound solver on all windows.
+        '''
+
+        return sum(combina.solution_time for combina in self._combina_windows)
+
+
+    @property
+    def n_windows(self):
+
+        '''
+        Number of windows the time horizon is decomposed into.
+        '''
+
+        return len(self._windows)
+
+
+    @staticmethod
+    def get_switch_policies():
+        return CombinaWindowed._switch_policies
+
+
+    def _set_parameters(self, window_size: int, commit_size: int, \
+        switch_policy: str) -> None:
+
+        if commit_size is None:
+
+            commit_size = max(window_size // 2, 1)
+
+        if not window_size >= 1:
+
+            raise ValueError("window_size must be a positive integer.")
+
+        if not 1 <= commit_size <= window_size:
+
+            raise ValueError("commit_size must be a positive integer " + \
+                "not bigger than window_size.")
+
+        if switch_policy not in self._switch_policies:
+
+            raise ValueError("switch_policy must be one of " + \
+                ", ".join("'{}'".format(policy) for policy in self._switch_policies) + ".")
+
+        self._window_size = int(window_size)
+        self._commit_size = int(commit_size)
+        self._switch_policy = switch_policy
+
+
+    def _determine_windows(self) -> None:
+
+        n_t = self._binapprox.n_t
+
+        self._windows = []
+        t_start = 0
+
+        while t_start < n_t:
+
+            t_end = min(t_start + self._window_size, n_t)
+            t_commit = t_end if t_end == n_t else t_start + self._commit_size
+
+            self._windows.append((t_start, t_end, t_commit))
+            t_start = t_commit
+
+
+    def __init__(self, binapprox: BinApprox, window_size: int = 200, \
+        commit_size: int = None, switch_policy: str = "proportional") -> None:
+
+        self._binapprox = binapprox
+
+        self._set_parameters(window_size = window_size, \
+            commit_size = commit_size, switch_policy = switch_policy)
+        self._determine_windows()
+
+        self._combina_windows = []
+
+
+    def _setup_window(self, t_start: int, t_end: int) -> BinApprox:
+
+        binapprox = self._binapprox
+
+        with warnings.catch_warnings():
+
+            # deviations from the SOS1 constraint have already been reported
+            # for the original problem
+
+            warnings.simplefilter("ignore")
+
+            binapprox_w = BinApprox(binapprox.t[t_start:t_end+1], \
+                binapprox.b_rel[:, t_start:t_end].copy(), binary_threshold = 0.0, \
+                reduce_problem_size_before_solve = binapprox.reduce_problem_size_before_solve)
+
+        binapprox_w.set_valid_controls(binapprox.b_valid[:, t_start:t_end])
+
+        return binapprox_w
+
+
+    def _determine_n_max_switches(self, state: WindowState, t_start: int, \
+        t_end: int) -> np.ndarray:
+
+        n_switches_remaining = state.n_switches_remaining
+
+        if self._switch_policy == "greedy" or t_end == self._binapprox.n_t:
+
+            return n_switches_remaining
+
+        # the number of switches used until the end of the window may be
+        # proportional to the elapsed share of the time horizon
+
+        t = self._binapprox.t
+        share = (t[t_end] - t[0]) / (t[-1] - t[0])
+
+        n_max_switches = np.asarray(self._binapprox.n_max_switches)
+        n_switches_used = n_max_switches - n_switches_remaining
+
+        return np.clip(np.ceil(share * n_max_switches).astype(int) - n_switches_used, \
+            0, n_switches_remaining)
+
+
+    def solve(self, **kwargs):
+
+        '''
+        Solve the combinatorial integral approximation problem.
+
+        All arguments are passed on to :meth:`pycombina.CombinaBnB.solve`
+        on each window.
+        '''
+
+        binapprox = self._binapprox
+
+        state = WindowState(binapprox)
+        b_bin = np.zeros((binapprox.n_c, binapprox.n_t))
+
+        self._combina_windows = []
+
+        with ThreadPoolExecutor(max_workers = 1) as executor:
+
+            binapprox_next = self._setup_window(*self._windows[0][:2])
+
+            for k, (t_start, t_end, t_commit) in enumerate(self._windows):
+
+                b_active = np.flatnonzero(state.b_bin_pre)
+
+                if b_active.size == 1 and state.n_switches_remaining[b_active[0]] < 1:
+
+                    # the active control cannot be switched off anymore and
+                    # remains active until the end of the time horizon, if
+                    # this is feasible, otherwise the remaining windows are
+                    # solved, which reports that no solution exists
+
+                    b_bin_continued = b_bin.copy()
+                    b_bin_continued[b_active[0], t_start:] = 1
+
+                    if binapprox.evaluate(b_bin_continued)["feasible"][0]:
+
+                        b_bin = b_bin_continued
+
+                        state.commit(binapprox.t[t_start:], \
+                            binapprox.b_rel[:, t_start:], b_bin[:, t_start:])
+
+                        break
+
+                binapprox_w = binapprox_next
+
+                state.apply(binapprox_w, \
+                    self._determine_n_max_switches(state, t_start, t_end))
+
+                combina_w = CombinaBnB(binapprox_w)
+                self._combina_windows.append(combina_w)
+
+                # the solver releases the GIL, so that the next window
+                # can be set up while the current one is solved
+
+                solution = executor.submit(combina_w.solve, **kwargs)
+
+                if k + 1 < len(self._windows):
+
+                    binapprox_next = self._setup_window(*self._windows[k+1][:2])
+
+                solution.result()
+
+                b_bin_w = binapprox_w.b_bin[:, :t_commit-t_start]
+
+                if not np.all(b_bin_w.sum(axis = 0) == 1):
+
+                    raise RuntimeError("No feasible solution found for the window " + \
+                        "starting at t = {}.".format(binapprox.t[t_start]))
+
+                b_bin[:, t_start:t_commit] = b_bin_w
+
+                state.commit(binapprox.t[t_start:t_commit+1], \
+                    binapprox.b_rel[:, t_start:t_commit], b_bin_w)
+
+        binapprox.set_b_bin(b_bin)
+        binapprox.set_eta(state.eta_max)
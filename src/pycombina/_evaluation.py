@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+
+
+def evaluate_b_bin(binapprox, b_bin_batch: np.ndarray) -> dict:
+
+    '''
+    Evaluate the objective values and the constraint violations of a batch
+    of binary solutions of shape (k, n_c, n_t) for a binary approximation
+    problem, see :meth:`pycombina.BinApprox.evaluate`.
+    '''
+
+    b_bin = np.asarray(b_bin_batch)
+
+    if b_bin.ndim == 2:
+
+        b_bin = b_bin[None, :, :]
+
+    if not (b_bin.ndim == 3 and b_bin.shape[1:] == (binapprox.n_c, binapprox.n_t)):
+
+        raise ValueError("b_bin_batch must be of shape (k, n_c, n_t).")
+
+    b_bin = b_bin != 0
+    k = b_bin.shape[0]
+
+    t = binapprox.t
+    t_start = t[:-1]
+
+    # accumulated deviations at the end of each time interval
+
+    eta_abs = np.abs(binapprox.eta_pre[None, :, None] + \
+        np.cumsum((binapprox.b_rel - b_bin) * binapprox.dt, axis = 2))
+
+    eta_norms = {
+
+        "max_norm": eta_abs.max(axis = (1, 2)),
+        "column_sum_norm": eta_abs.sum(axis = 1).max(axis = 1),
+        "row_sum_norm": eta_abs.sum(axis = 2).max(axis = 1),
+    }
+
+    # the control active prior to the time horizon is prepended, so that
+    # activations and deactivations at the first time point are detected
+
+    b_bin_pre = np.asarray(binapprox.b_bin_pre) != 0
+    pre_active = b_bin_pre.sum() == 1
+
+    b_bin_ext = np.concatenate([np.broadcast_to((b_bin_pre & pre_active)[None, :, None], \
+        (k, binapprox.n_c, 1)), b_bin], axis = 2)
+
+    b_on = b_bin_ext[:, :, 1:] & ~b_bin_ext[:, :, :-1]
+    b_off = ~b_bin_ext[:, :, 1:] & b_bin_ext[:, :, :-1]
+
+    # each switch counts for the deactivated and the activated control,
+    # the first activation without a preceding control is no switch
+
+    b_switch = b_on | b_off
+
+    if not pre_active:
+
+        b_switch[:, :, 0] = False
+
+    n_switches = b_switch.sum(axis = 2)
+
+    # transitions are checked between all subsequent time intervals,
+    # including the continuation of a control
+
+    b_active = np.argmax(b_bin, axis = 1)
+
+    if pre_active:
+
+        b_active = np.concatenate([np.full((k, 1), np.argmax(b_bin_pre)), b_active], axis = 1)
+
+    b_adjacencies = np.asarray(binapprox.b_adjacencies)
+    invalid_transitions = b_adjacencies[b_active[:, 1:], b_active[:, :-1]] == 0
+
+    # times of the last activation and deactivation per control up to each
+    # time interval, the activation of the control active prior to the
+    # time horizon is unknown
+
+    t_on = np.maximum.accumulate(np.where(b_on, t_start, -np.inf), axis = 2)
+    t_off = np.maximum.accumulate(np.where(b_off, t_start, -np.inf), axis = 2)
+
+    # up-times of finished activations, the activations reaching the end
+    # of the time horizon are not bound by the minimum up-times
+
+    up_times = t_start - t_on
+
+    min_up_times = binapprox.min_up_times[None, :, None]
+    min_down_times = binapprox.min_down_times[None, :, None]
+
+    # the maximum up-times bound each activation including those reaching
+    # the end of the time horizon, where the activation of the control
+    # active prior to the time horizon includes its up-time prior to it
+
+    max_up_times = binapprox.max_up_times[None, :, None]
+    t_on_pre = t[0] - binapprox.up_time_pre
+
+    up_times_horizon = t_start - np.maximum(t_on, t_on_pre)
+    up_times_final = t[-1] - np.maximum(t_on[:, :, -1], t_on_pre)
+
+    up_times_total = (b_bin * binapprox.dt).sum(axis = 2)
+
+    violations = {
+
+        "sos1": (b_bin.sum(axis = 1) != 1).sum(axis = 1),
+        "b_valid": (b_bin & (np.asarray(binapprox.b_valid) == 0)).sum(axis = (1, 2)),
+        "b_adjacencies": invalid_transitions.sum(axis = 1),
+        "n_max_switches": (n_switches > binapprox.n_max_switches).sum(axis = 1),
+        "min_up_times": (b_off & (up_times < min_up_times)).sum(axis = (1, 2)),
+        "min_down_times": (b_on & (t_start - t_off < min_down_times)).sum(axis = (1, 2)),
+        "max_up_times": (b_off & (up_times_horizon > max_up_times)).sum(axis = (1, 2)) \
+            + (b_bin[:, :, -1] & (up_times_final > binapprox.max_up_times)).sum(axis = 1),
+        "total_max_up_times": (up_times_total > binapprox.total_max_up_times).sum(axis = 1),
+    }
+
+    return {
+
+        "eta": eta_norms[binapprox.cia_norm],
+        "eta_norms": eta_norms,
+        "violations": violations,
+        "feasible": np.all([v == 0 for v in violations.values()], axis = 0),
+    }
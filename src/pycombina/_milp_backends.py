@@ -0,0 +1,270 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import warnings
+import functools
+import numpy as np
+
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+
+@functools.lru_cache(maxsize = None)
+def import_gurobipy():
+
+    # gurobipy is imported on first use only, returns None if not available
+
+    try:
+        import gurobipy as gp
+
+        if gp.gurobi.version() < (9, 0, 0):
+            raise ImportError
+
+    except ImportError:
+        gp = None
+
+    return gp
+
+
+class MILPGurobi():
+
+    # MILP solved by Gurobi, variables are given as a list of blocks
+    # (name, shape, lb, ub, obj, integer) and constraints as a list of
+    # blocks (A, sense, rhs) on all variables in the order of the blocks;
+    # incumbents is a function returning the indices and values of
+    # variables of a new incumbent or None, which is polled at MIP nodes
+
+    _solver_status = {
+
+        1: "Initialized",
+        2: "Optimal solution found",
+        7: "Maximum number of iterations exceeded",
+        9: "Maximum CPU time exceeded",
+        11: "User interrupt"
+    }
+
+
+    @property
+    def status(self) -> str:
+
+        try:
+            return self._solver_status[self._model.status]
+
+        except KeyError:
+            raise RuntimeError("Solver status undefined, this should not happen.\n"
+                + "Please contact the developers.")
+
+
+    @property
+    def solution_time(self) -> float:
+
+        return self._model.Runtime
+
+
+    def __init__(self, variables: list, constraints: list) -> None:
+
+        gp = import_gurobipy()
+
+        if gp is None:
+
+            raise ImportError("gurobipy version >= 9.0.0 not found, " + \
+                "use solver = 'highs' instead.")
+
+        self._gp = gp
+        self._model = gp.Model("Combinatorial Integral Approximation MILP")
+
+        for name, shape, lb, ub, obj, integer in variables:
+
+            self._model.addMVar(shape, lb = lb, ub = ub, obj = obj, \
+                vtype = "B" if integer else "C", name = name)
+
+        self._model.update()
+
+        self._constrs = [self._model.addMConstr(A, None, sense, rhs) \
+            for A, sense, rhs in constraints]
+
+        self._model.update()
+        self._vars = self._model.getVars()
+
+
+    def set_rhs(self, block: int, rhs: np.ndarray) -> None:
+
+        self._constrs[block].setAttr("RHS", rhs)
+
+
+    def set_bounds(self, idx: np.ndarray, lb: np.ndarray, ub: np.ndarray) -> None:
+
+        self._model.setAttr("LB", [self._vars[i] for i in idx], lb.tolist())
+        self._model.setAttr("UB", [self._vars[i] for i in idx], ub.tolist())
+
+
+    def set_start(self, idx: np.ndarray, values: np.ndarray) -> None:
+
+        self._model.setAttr("Start", [self._vars[i] for i in idx], values.tolist())
+
+
+    def _inject_incumbent(self, model, where) -> None:
+
+        # new incumbents can only be set at MIP nodes
+
+        if where == self._gp.GRB.Callback.MIPNODE:
+
+            incumbent = self._incumbents()
+
+            if incumbent is not None:
+
+                idx, values = incumbent
+
+                model.cbSetSolution([self._vars[i] for i in idx], values.tolist())
+                model.cbUseSolution()
+
+
+    def solve(self, solver_opts: dict, incumbents = None) -> np.ndarray:
+
+        for solver_opt in solver_opts.keys():
+
+            try:
+
+                self._model.setParam(solver_opt, solver_opts[solver_opt])
+
+            except ValueError:
+
+                raise ValueError("Values of solver options must be of numerical type.")
+
+        if incumbents is None:
+
+            self._model.optimize()
+
+        else:
+
+            self._incumbents = incumbents
+            self._model.optimize(self._inject_incumbent)
+
+        if self._model.SolCount == 0:
+
+            raise RuntimeError("No solution found, solver status: " + self.status)
+
+        return np.asarray(self._model.getAttr("X", self._model.getVars()))
+
+
+class MILPHiGHS():
+
+    # MILP solved by HiGHS via scipy.optimize.milp, same input as for
+    # MILPGurobi, variable names are not supported
+
+    _solver_status = {
+
+        -1: "Initialized",
+        0: "Optimal solution found",
+        1: "Maximum number of iterations or CPU time exceeded",
+        2: "Problem is infeasible",
+        3: "Problem is unbounded",
+        4: "Solver error"
+    }
+
+
+    @property
+    def status(self) -> str:
+
+        return self._solver_status[self._status]
+
+
+    @property
+    def solution_time(self) -> float:
+
+        return self._solution_time
+
+
+    def __init__(self, variables: list, constraints: list) -> None:
+
+        self._lb = np.concatenate([np.broadcast_to(lb, shape).ravel() \
+            for _, shape, lb, _, _, _ in variables]).astype(float)
+        self._ub = np.concatenate([np.broadcast_to(ub, shape).ravel() \
+            for _, shape, _, ub, _, _ in variables]).astype(float)
+        self._c = np.concatenate([np.broadcast_to(obj, shape).ravel() \
+            for _, shape, _, _, obj, _ in variables]).astype(float)
+        self._integrality = np.concatenate([np.full(int(np.prod(shape)), int(integer)) \
+            for _, shape, _, _, _, integer in variables])
+
+        self._A = sparse.vstack([A for A, _, _ in constraints], format = "csr")
+
+        # rows of the blocks of constraints within the stacked constraints
+        self._rows = np.cumsum([0] + [A.shape[0] for A, _, _ in constraints])
+
+        self._sense = np.concatenate([np.full(A.shape[0], sense) \
+            for A, sense, _ in constraints])
+
+        self._lb_A = np.zeros(self._sense.size)
+        self._ub_A = np.zeros(self._sense.size)
+
+        for block, (_, _, rhs) in enumerate(constraints):
+
+            self.set_rhs(block, rhs)
+
+        self._status = -1
+        self._solution_time = 0.0
+
+
+    def set_rhs(self, block: int, rhs: np.ndarray) -> None:
+
+        rows = slice(self._rows[block], self._rows[block+1])
+
+        self._lb_A[rows] = np.where(self._sense[rows] == "<", -np.inf, rhs)
+        self._ub_A[rows] = np.where(self._sense[rows] == ">", np.inf, rhs)
+
+
+    def set_bounds(self, idx: np.ndarray, lb: np.ndarray, ub: np.ndarray) -> None:
+
+        self._lb[idx] = lb
+        self._ub[idx] = ub
+
+
+    def set_start(self, idx: np.ndarray, values: np.ndarray) -> None:
+
+        warnings.warn("Warm-starting is not supported by HiGHS via " + \
+            "scipy.optimize.milp, the warm start is ignored.")
+
+
+    def solve(self, solver_opts: dict, incumbents = None) -> np.ndarray:
+
+        if incumbents is not None:
+
+            warnings.warn("Injecting incumbents is not supported by HiGHS via " + \
+                "scipy.optimize.milp, the incumbents are ignored.")
+
+        start_time = time.time()
+
+        result = milp(self._c, integrality = self._integrality, \
+            bounds = Bounds(self._lb, self._ub), \
+            constraints = LinearConstraint(self._A, self._lb_A, self._ub_A), \
+            options = solver_opts)
+
+        self._solution_time = time.time() - start_time
+        self._status = result.status
+
+        if result.x is None:
+
+            raise RuntimeError("No solution found, solver status: " + self.status)
+
+        return result.x
+
+
+solvers = {"gurobi": MILPGurobi, "highs": MILPHiGHS}
@@ -0,0 +1,703 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import zipfile
+import importlib
+import numpy as np
+from http import HTTPStatus
+from typing import Tuple
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from ._binary_approximation import BinApprox
+from ._cache import SolutionCache, _cached_status, _cached_solvers
+
+_solvers = ["CombinaBnB", "CombinaMILP", "CombinaSUR"]
+
+# options of the problem definition passed on to the setters of BinApprox
+
+_binapprox_options = ["n_max_switches", "min_up_times", "min_down_times", \
+    "max_up_times", "total_max_up_times", "b_bin_pre", "eta_pre", "up_time_pre", \
+    "valid_controls", "cia_norm"]
+
+_solution_formats = ["b_bin", "switching_sequence"]
+
+# content types of problems and responses, arrays are transferred without
+# conversion to and from lists for .npz archives
+
+_JSON = "application/json"
+_NPZ = "application/x-npz"
+
+# fraction of the time until the deadline of a request the worker may use,
+# the remainder is reserved for the transfer of the solution from the worker
+
+_SOLVER_TIME_FRACTION = 0.9
+
+
+def _available_processors() -> int:
+
+    try:
+        return len(os.sched_getaffinity(0))
+
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _initialize_worker() -> None:
+
+    # the solvers, e. g., CombinaMILP while setting up its model, write
+    # their progress to stdout, which is discarded in the worker processes
+
+    sys.stdout = open(os.devnull, "w")
+
+
+def _setup_binapprox(problem_definition: dict) -> BinApprox:
+
+    kwargs = {key: problem_definition[key] for key in \
+        ["binary_threshold", "reduce_problem_size_before_solve"] \
+        if key in problem_definition}
+
+    binapprox = BinApprox(t = problem_definition["t"], \
+        b_rel = problem_definition["b_rel"], **kwargs)
+
+    for option in _binapprox_options:
+
+        if option in problem_definition:
+
+            getattr(binapprox, "set_" + option)(problem_definition[option])
+
+    return binapprox
+
+
+def _run_solver(binapprox: BinApprox, solver: str, deadline: float):
+
+    combina = getattr(importlib.import_module(__package__), solver)(binapprox)
+
+    # the time for setting up the problem and the solver, e. g., the model
+    # of CombinaMILP, is subtracted from the time limit of the solver
+
+    time_limit = max(deadline - time.monotonic(), 0.0)
+
+    if solver == "CombinaBnB":
+
+        combina.solve(max_cpu_time = time_limit, verbosity = 0)
+
+    elif solver == "CombinaMILP":
+
+        combina.solve(gurobi_opts = {"TimeLimit": time_limit, "OutputFlag": 0}, \
+            highs_opts = {"time_limit": time_limit})
+
+    else:
+
+        combina.solve(verbosity = 0)
+
+    return combina
+
+
+def solve_problem(problem_definition: dict, time_limit: float) -> Tuple[int, dict]:
+
+    '''
+    Set up and solve the binary approximation problem described by the
+    problem definition as accepted by :class:`pycombina.SolveService`
+    within the given time limit in seconds.
+
+    :returns: Tuple of the HTTP status code and the response.
+    '''
+
+    deadline = time.monotonic() + time_limit
+
+    solver = problem_definition.get("solver", "CombinaBnB")
+
+    response = {"solver": solver, "solver_status": None, "b_bin": None, \
+        "eta": None, "errors": None}
+
+    try:
+
+        if solver not in _solvers:
+
+            raise ValueError("solver must be one of " + \
+                ", ".join("'{}'".format(s) for s in _solvers) + ".")
+
+        binapprox = _setup_binapprox(problem_definition)
+
+    except (KeyError, TypeError, ValueError) as err:
+
+        response["errors"] = "Invalid problem definition: {}".format( \
+            "missing key {}".format(err) if isinstance(err, KeyError) else err)
+
+        return HTTPStatus.BAD_REQUEST, response
+
+    try:
+        combina = _run_solver(binapprox, solver, deadline)
+
+    except Exception as err:
+
+        response["errors"] = "{}: {}".format(type(err).__name__, err)
+
+        return HTTPStatus.INTERNAL_SERVER_ERROR, response
+
+    response.update({"solver_status": combina.status, \
+        "b_bin": np.asarray(binapprox.b_bin, dtype = np.uint8), "eta": float(binapprox.eta)})
+
+    return HTTPStatus.OK, response
+
+
+def _decode_problem_definition(body: bytes, content_type: str) -> dict:
+
+    if content_type == _NPZ:
+
+        # scalars and strings are stored as arrays of zero dimensions
+
+        with np.load(io.BytesIO(body), allow_pickle = False) as npz:
+
+            return {key: npz[key].item() if npz[key].ndim == 0 else npz[key] \
+                for key in npz.files}
+
+    return json.loads(body)
+
+
+def _encode_response(response: dict, content_type: str) -> bytes:
+
+    if content_type == _NPZ:
+
+        # keys without value are omitted
+
+        content = io.BytesIO()
+        np.savez(content, **{key: value for key, value in response.items() \
+            if value is not None})
+
+        return content.getvalue()
+
+    return json.dumps({key: value.tolist() if isinstance(value, np.ndarray) else value \
+        for key, value in response.items()}).encode()
+
+
+class SolveService():
+
+    '''
+    Asynchronous HTTP service for solving binary approximation problems,
+    e. g., for using pycombina from other languages or applications.
+
+    Problems are posted to **/api/solve/** and solved by a pool of
+    worker processes, so that long-running solutions do not block the
+    service. The number of problems solved concurrently is limited by the
+    number of workers, further problems wait in a queue of bounded size.
+    If the queue is full, problems are rejected immediately with status
+    503, so that clients can back off and retry. Each problem has to be
+    solved before its deadline, otherwise status 504 is returned. The
+    time limits of CombinaBnB and CombinaMILP are set accordingly, less the
+    time for setting up the problem in the worker. The current load of the service is available from **/api/status/**.
+
+    The problem definition contains the keys **t** and **b_rel** and,
+    optionally, **binary_threshold**, **reduce_problem_size_before_solve**
+    and the options **n_max_switches**, **min_up_times**,
+    **min_down_times**, **max_up_times**, **total_max_up_times**,
+    **b_bin_pre**, **eta_pre**, **up_time_pre**, **valid_controls** and
+    **cia_norm**, which are set using the respective methods of
+    :class:`pycombina.BinApprox`. The solver is chosen by **solver**
+    (**CombinaBnB**, **CombinaMILP** or **CombinaSUR**, *Default:*
+    **CombinaBnB**) and the deadline in seconds after receiving the problem
+    by **timeout**, which is limited by the timeout of the service. Other
+    keys are ignored. If a :class:`pycombina.SolutionCache` is given,
+    problems the optimal solution of which is found in the cache are
+    answered without a worker. The response contains the keys **solver**,
+    **solver_status**, **b_bin**, **eta** and **errors**. If
+    **solution_format** is set to **switching_sequence**, the solution is
+    returned in run-length form by **b_active** and **t_start** instead of
+    **b_bin**, see :attr:`pycombina.BinApprox.switching_sequence`.
+
+    Problems and responses are encoded as JSON by default. For large
+    problems, problems can be posted as .npz archive (see
+    :func:`numpy.savez`) containing an array per key, where scalars and
+    strings are stored as arrays of zero dimensions, by setting the header
+    **Content-Type: application/x-npz**. The response is returned in the
+    same form, which avoids converting arrays to and from lists, if the
+    header **Accept: application/x-npz** is set, where keys without value
+    are omitted and **b_bin** is of type uint8.
+
+    Usage::
+
+        >>> from pycombina import SolveService
+
+        >>> SolveService(max_workers = 4, max_queue_size = 16).run(port = 6789)
+
+    For testing, the service can be run within the current process by
+    passing a :class:`concurrent.futures.ThreadPoolExecutor`, and problems
+    can be solved without HTTP using :meth:`solve`.
+
+    :param max_workers: Number of problems solved concurrently, which is
+                        limited to the number of available processors, as
+                        the time limit of CombinaBnB is given in CPU time.
+                        *Default:* number of available processors.
+
+    :param max_queue_size: Number of problems waiting for a worker, beyond
+                           which problems are rejected. *Default:* 16.
+
+    :param timeout: Maximum time in seconds from receiving a problem until
+                    its solution, also applied to receiving requests.
+                    *Default:* 60.
+
+    :param max_request_size: Maximum size of a request body in bytes.
+                             *Default:* 64 MiB.
+
+    :param executor: Executor running the workers, which is not shut down
+                     by the service. *Default:* a process pool of
+                     max_workers processes owned by the service, the
+                     output of which to stdout is discarded.
+
+    :param cache: Cache for the solutions of the problems, the statistics
+                  of which are included in **/api/status/**. *Default:*
+                  **None**.
+
+    '''
+
+    @property
+    def address(self) -> tuple:
+
+        '''
+        Get the host and port the service is listening on, e. g., if it
+        has been started on port 0.
+        '''
+
+        try:
+            return self._server.sockets[0].getsockname()[:2]
+
+        except AttributeError:
+            raise RuntimeError("The service has not been started yet.")
+
+
+    @property
+    def n_running(self) -> int:
+
+        '''Get the number of problems currently solved by the workers.'''
+
+        return self._n_running
+
+
+    @property
+    def n_queued(self) -> int:
+
+        '''Get the number of problems currently waiting for a worker.'''
+
+        return self._n_queued
+
+
+    def __init__(self, max_workers: int = None, max_queue_size: int = 16, \
+        timeout: float = 60.0, max_request_size: int = 64 * 2**20, \
+        executor: Executor = None, cache: SolutionCache = None) -> None:
+
+        n_processors = _available_processors()
+
+        if max_workers is None:
+
+            max_workers = getattr(executor, "_max_workers", None) or n_processors
+
+        if not max_workers >= 1:
+
+            raise ValueError("max_workers must be a positive integer.")
+
+        # the CPU time of a worker only corresponds to the time until the
+        # deadline of its problem if no other worker shares its processor
+
+        max_workers = min(max_workers, n_processors)
+
+        if not max_queue_size >= 0:
+
+            raise ValueError("max_queue_size must be a non-negative integer.")
+
+        if not timeout > 0:
+
+            raise ValueError("timeout must be positive.")
+
+        self._max_workers = int(max_workers)
+        self._max_queue_size = int(max_queue_size)
+        self._timeout = float(timeout)
+        self._max_request_size = int(max_request_size)
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._cache = cache
+
+        self._n_running = 0
+        self._n_queued = 0
+        self._workers = None
+        self._server = None
+
+
+    def _get_executor(self) -> Executor:
+
+        if self._executor is None:
+
+            self._executor = ProcessPoolExecutor(max_workers = self._max_workers, \
+                initializer = _initialize_worker)
+
+        return self._executor
+
+
+    def _get_timeout(self, problem_definition: dict) -> float:
+
+        timeout = problem_definition.get("timeout", self._timeout)
+
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) \
+            or not timeout > 0:
+
+            raise ValueError("timeout must be a positive number.")
+
+        return min(float(timeout), self._timeout)
+
+
+    @staticmethod
+    def _get_cache_key(problem_definition: dict) -> str:
+
+        # invalid problems are reported by the workers
+
+        solver = problem_definition.get("solver", "CombinaBnB")
+
+        try:
+
+            if solver not in _cached_solvers:
+                return None
+
+            return SolutionCache.key(_setup_binapprox(problem_definition), solver)
+
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+    @staticmethod
+    def _error(status: int, message: str) -> Tuple[int, dict]:
+
+        return status, {"solver": None, "solver_status": None, "b_bin": None, \
+            "eta": None, "errors": message}
+
+
+    async def solve(self, problem_definition: dict) -> Tuple[int, dict]:
+
+        '''
+        Solve a problem, as if it had been posted to the service, without
+        using HTTP.
+
+        :param problem_definition: Problem definition as described above.
+
+        :returns: Tuple of the HTTP status code and the response, which
+                  contains the solution as NumPy arrays.
+        '''
+
+        if not isinstance(problem_definition, dict):
+
+            return self._error(HTTPStatus.BAD_REQUEST, \
+                "The problem definition must be a JSON object.")
+
+        solution_format = problem_definition.get("solution_format", "b_bin")
+
+        try:
+            timeout = self._get_timeout(problem_definition)
+
+            if solution_format not in _solution_formats:
+
+                raise ValueError("solution_format must be one of " + \
+                    ", ".join("'{}'".format(f) for f in _solution_formats) + ".")
+
+        except (TypeError, ValueError) as err:
+            return self._error(HTTPStatus.BAD_REQUEST, str(err))
+
+        status, response = await self._solve(problem_definition, timeout)
+
+        if solution_format == "switching_sequence" and response["b_bin"] is not None:
+
+            response["b_active"], response["t_start"] = \
+                BinApprox._determine_switching_sequence(response["b_bin"])
+            response["b_bin"] = None
+
+        return status, response
+
+
+    async def _solve(self, problem_definition: dict, timeout: float) -> Tuple[int, dict]:
+
+        loop = asyncio.get_running_loop()
+        key = None
+
+        if self._cache is not None:
+
+            # the key is computed on a thread, as hashing large problems
+            # would block the service otherwise
+
+            key = await loop.run_in_executor(None, self._get_cache_key, problem_definition)
+            entry = None if key is None else self._cache.get(key)
+
+            if entry is not None:
+
+                return HTTPStatus.OK, {"solver": problem_definition.get("solver", "CombinaBnB"), \
+                    "solver_status": entry["status"], "b_bin": entry["b_bin"].copy(), \
+                    "eta": entry["eta"], "errors": None}
+
+        if self._n_running + self._n_queued >= self._max_workers + self._max_queue_size:
+
+            return self._error(HTTPStatus.SERVICE_UNAVAILABLE, \
+                "Maximum number of queued problems reached, retry later.")
+
+        deadline = loop.time() + timeout
+
+        if self._workers is None:
+
+            # problems wait for a worker in the order of their arrival
+            self._workers = asyncio.Semaphore(self._max_workers)
+
+        self._n_queued += 1
+
+        try:
+            await asyncio.wait_for(self._workers.acquire(), timeout)
+
+        except asyncio.TimeoutError:
+            return self._error(HTTPStatus.GATEWAY_TIMEOUT, \
+                "Deadline exceeded while waiting for a worker.")
+
+        finally:
+            self._n_queued -= 1
+
+        self._n_running += 1
+
+        remaining = deadline - loop.time()
+
+        future = loop.run_in_executor(self._get_executor(), solve_problem, \
+            problem_definition, _SOLVER_TIME_FRACTION * remaining)
+
+        # the worker is considered busy until the solver has returned, even
+        # if the deadline has been exceeded before
+
+        future.add_done_callback(self._release_worker)
+
+        try:
+            status, response = await asyncio.wait_for(asyncio.shield(future), remaining)
+
+        except asyncio.TimeoutError:
+            return self._error(HTTPStatus.GATEWAY_TIMEOUT, \
+                "Deadline exceeded while solving the problem.")
+
+        except Exception as err:
+            return self._error(HTTPStatus.INTERNAL_SERVER_ERROR, \
+                "{}: {}".format(type(err).__name__, err))
+
+        if key is not None and status == HTTPStatus.OK and \
+            response["solver_status"] == _cached_status:
+
+            self._cache.put(key, response["b_bin"], response["eta"], response["solver_status"])
+
+        return status, response
+
+
+    def _release_worker(self, future: asyncio.Future) -> None:
+
+        self._n_running -= 1
+        self._workers.release()
+
+        if not future.cancelled():
+
+            # retrieve exceptions of abandoned futures, which are
+            # reported otherwise
+            future.exception()
+
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple:
+
+        method, path, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+
+        headers = {}
+
+        while True:
+
+            line = (await reader.readline()).decode("latin-1").strip()
+
+            if not line:
+                break
+
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        content_length = int(headers.get("content-length", 0))
+
+        if content_length > self._max_request_size:
+
+            return method, path, headers, None
+
+        return method, path, headers, await reader.readexactly(content_length)
+
+
+    @staticmethod
+    def _route(path: str) -> str:
+
+        return path.split("?", 1)[0].rstrip("/")
+
+
+    async def _handle_request(self, method: str, path: str, headers: dict, \
+        body: bytes) -> Tuple[int, dict]:
+
+        path = self._route(path)
+
+        if path == "/api/status":
+
+            return HTTPStatus.OK, {"n_running": self._n_running, \
+                "n_queued": self._n_queued, "max_workers": self._max_workers, \
+                "max_queue_size": self._max_queue_size, \
+                "cache": None if self._cache is None else self._cache.stats}
+
+        if path != "/api/solve":
+
+            return self._error(HTTPStatus.NOT_FOUND, "Unknown path, " + \
+                "problems are solved at /api/solve/.")
+
+        if method != "POST":
+
+            return self._error(HTTPStatus.METHOD_NOT_ALLOWED, \
+                "Problems must be posted to /api/solve/.")
+
+        if body is None:
+
+            return self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, \
+                "Maximum request size of {} bytes exceeded.".format(self._max_request_size))
+
+        content_type = headers.get("content-type", _JSON).split(";")[0].strip().lower()
+
+        try:
+            problem_definition = _decode_problem_definition(body, content_type)
+
+        except (ValueError, OSError, EOFError, zipfile.BadZipFile) as err:
+            return self._error(HTTPStatus.BAD_REQUEST, "Invalid {} content: {}".format( \
+                "npz" if content_type == _NPZ else "JSON", err))
+
+        return await self.solve(problem_definition)
+
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, \
+        writer: asyncio.StreamWriter) -> None:
+
+        # one request per connection, the connection is closed afterwards
+
+        try:
+
+            content_type = _JSON
+
+            try:
+                method, path, headers, body = await asyncio.wait_for( \
+                    self._read_request(reader), self._timeout)
+
+            except (ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                status, response = self._error(HTTPStatus.BAD_REQUEST, "Invalid request.")
+
+            else:
+                status, response = await self._handle_request(method, path, headers, body)
+
+                # the load of the service is always returned as JSON
+
+                if _NPZ in headers.get("accept", "").lower() and \
+                    self._route(path) == "/api/solve":
+
+                    content_type = _NPZ
+
+            content = _encode_response(response, content_type)
+            status = HTTPStatus(status)
+
+            writer.write(("HTTP/1.1 {} {}\r\nContent-Type: {}\r\n" + \
+                "Content-Length: {}\r\nConnection: close\r\n{}\r\n").format( \
+                status.value, status.phrase, content_type, len(content), \
+                "Retry-After: 1\r\n" if status == HTTPStatus.SERVICE_UNAVAILABLE else "" \
+                ).encode("latin-1") + content)
+
+            await writer.drain()
+
+        except ConnectionError:
+
+            # the client has disconnected
+            pass
+
+        finally:
+
+            writer.close()
+
+
+    async def start(self, host: str = "127.0.0.1", port: int = 6789) -> None:
+
+        '''
+        Start listening for requests on the given host and port, see also
+        :meth:`run`.
+        '''
+
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+
+
+    async def close(self) -> None:
+
+        '''
+        Stop listening for requests and shut down the workers, if the
+        executor is owned by the service.
+        '''
+
+        if self._server is not None:
+
+            self._server.close()
+            await self._server.wait_closed()
+
+        if self._owns_executor and self._executor is not None:
+
+            self._executor.shutdown(wait = False)
+            self._executor = None
+
+
+    async def __aenter__(self) -> "SolveService":
+
+        if self._server is None:
+
+            await self.start()
+
+        return self
+
+
+    async def __aexit__(self, *args) -> None:
+
+        await self.close()
+
+
+    def run(self, host: str = "127.0.0.1", port: int = 6789) -> None:
+
+        '''
+        Start the service and serve requests until interrupted.
+        '''
+
+        async def serve():
+
+            await self.start(host, port)
+
+            try:
+                await self._server.serve_forever()
+
+            finally:
+                await self.close()
+
+        try:
+            asyncio.run(serve())
+
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,232 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+import numpy as np
+from typing import Union
+
+from multiprocessing import shared_memory
+
+from ._binary_approximation import BinApprox
+
+# alignment of the arrays within the shared memory block in bytes
+_ALIGNMENT = 64
+
+
+class _SharedArray(np.ndarray):
+
+    # array on a shared memory block, which holds a reference to the block,
+    # so that the block is closed only after all views on it are released
+
+    pass
+
+
+class SharedBinApprox():
+
+    '''
+    Handle to a binary approximation problem, the time points, relaxed
+    controls and valid controls of which are placed in shared memory.
+
+    Pickling the handle, e. g., for submitting it to a process pool,
+    transfers only the name of the shared memory block and the settings of
+    the problem that do not scale with the number of time points. The
+    handle can be passed to :class:`pycombina.CombinaBnB`,
+    :class:`pycombina.CombinaSUR` and :class:`pycombina.CombinaMILP`
+    directly, which then operate on the problem attached to in the
+    respective process without copying the arrays. Solutions are stored
+    in the attached problem of each process, see :attr:`binapprox`.
+
+    The process creating the handle owns the shared memory block, which is
+    released when calling :meth:`unlink` or leaving the context of the
+    handle, after which the handle cannot be attached to anymore.
+
+    Usage::
+
+        >>> from concurrent.futures import ProcessPoolExecutor
+        >>> from pycombina import BinApprox, CombinaBnB, SharedBinApprox
+
+        >>> def solve(shared_binapprox):
+        ...     combina = CombinaBnB(shared_binapprox)
+        ...     combina.solve(verbosity = 0)
+        ...     return shared_binapprox.binapprox.b_bin
+
+        >>> with SharedBinApprox(binapprox) as shared_binapprox, \\
+        ...     ProcessPoolExecutor() as executor:
+        ...     b_bin = executor.submit(solve, shared_binapprox).result()
+
+    :param binapprox: Binary approximation problem, which is copied to
+                      shared memory once. Later modifications of the problem
+                      are not reflected by the handle.
+
+    '''
+
+    @property
+    def name(self) -> str:
+
+        '''Get the name of the shared memory block.'''
+
+        return self._name
+
+
+    @property
+    def binapprox(self) -> BinApprox:
+
+        '''
+        Get the binary approximation problem attached to in the current
+        process, which is set up on first access.
+        '''
+
+        if self._binapprox is None:
+
+            self._binapprox = self._attach()
+
+        return self._binapprox
+
+
+    def _determine_layout(self, arrays: dict) -> int:
+
+        self._layout = {}
+        offset = 0
+
+        for key in BinApprox._large_arrays:
+
+            if key in arrays:
+
+                array = np.asarray(arrays[key])
+                self._layout[key] = (offset, array.dtype.str, array.shape)
+                offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+        return max(offset, 1)
+
+
+    def _map_arrays(self, shm: shared_memory.SharedMemory) -> dict:
+
+        arrays = {}
+
+        for key, (offset, dtype, shape) in self._layout.items():
+
+            array = np.ndarray.__new__(_SharedArray, shape, dtype = dtype, \
+                buffer = shm.buf, offset = offset)
+            array._shm = shm
+
+            arrays[key] = array.view(np.ndarray)
+
+        return arrays
+
+
+    def __init__(self, binapprox: BinApprox) -> None:
+
+        arrays = binapprox._get_arrays()
+
+        self._shm = shared_memory.SharedMemory(create = True, \
+            size = self._determine_layout(arrays))
+        self._name = self._shm.name
+
+        for key, array in self._map_arrays(self._shm).items():
+
+            array[...] = arrays.pop(key)
+
+        self._settings = {key: np.array(value) for key, value in arrays.items()}
+        self._binapprox = None
+
+
+    def _attach(self) -> BinApprox:
+
+        if self._shm is not None:
+
+            shm = self._shm
+
+        elif sys.version_info >= (3, 13):
+
+            # the block is released by the owning process only
+            shm = shared_memory.SharedMemory(name = self._name, track = False)
+
+        else:
+
+            shm = shared_memory.SharedMemory(name = self._name)
+
+        arrays = self._map_arrays(shm)
+
+        for array in arrays.values():
+
+            array.flags.writeable = False
+
+        arrays.update({key: np.array(value) for key, value in self._settings.items()})
+
+        return BinApprox._from_arrays(arrays)
+
+
+    def __getstate__(self) -> dict:
+
+        return {"name": self._name, "layout": self._layout, "settings": self._settings}
+
+
+    def __setstate__(self, state: dict) -> None:
+
+        self._name = state["name"]
+        self._layout = state["layout"]
+        self._settings = state["settings"]
+
+        self._shm = None
+        self._binapprox = None
+
+
+    def unlink(self) -> None:
+
+        '''
+        Release the shared memory block, which is only possible in the
+        process that created the handle. Problems already attached to
+        remain valid, but the handle cannot be attached to anymore.
+        '''
+
+        if self._shm is None:
+
+            raise RuntimeError("The shared memory block can only be released " + \
+                "once by the process that created the handle.")
+
+        # the block is closed as soon as no attached problem refers to it
+        # anymore, as closing it explicitly invalidates existing views
+
+        self._shm.unlink()
+        self._shm = None
+
+
+    def __enter__(self) -> "SharedBinApprox":
+
+        return self
+
+
+    def __exit__(self, *args) -> None:
+
+        self.unlink()
+
+
+def as_binapprox(binapprox: Union[BinApprox, SharedBinApprox]) -> BinApprox:
+
+    '''
+    Get the binary approximation problem for a problem or a handle to a
+    problem in shared memory.
+    '''
+
+    if isinstance(binapprox, SharedBinApprox):
+
+        return binapprox.binapprox
+
+    return binapprox
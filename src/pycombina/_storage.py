@@ -0,0 +1,94 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import struct
+import zipfile
+import numpy as np
+from typing import Optional
+
+# size and layout of the local file header of a ZIP archive member,
+# which precedes the data of the member
+_ZIP_LOCAL_HEADER_SIZE = 30
+_ZIP_LOCAL_HEADER_LENGTHS = "<HH"
+_ZIP_LOCAL_HEADER_LENGTHS_OFFSET = 26
+
+
+def save_arrays(path, arrays: dict) -> None:
+
+    '''
+    Save arrays to an uncompressed .npz file, the members of which can be
+    memory-mapped by :func:`load_arrays`.
+    '''
+
+    np.savez(path, **arrays)
+
+
+def _memmap_member(path, fid, info: zipfile.ZipInfo) -> Optional[np.ndarray]:
+
+    fid.seek(info.header_offset + _ZIP_LOCAL_HEADER_LENGTHS_OFFSET)
+    n_name, n_extra = struct.unpack(_ZIP_LOCAL_HEADER_LENGTHS, fid.read(4))
+
+    fid.seek(info.header_offset + _ZIP_LOCAL_HEADER_SIZE + n_name + n_extra)
+
+    version = np.lib.format.read_magic(fid)
+
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fid)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fid)
+
+    if int(np.prod(shape)) == 0:
+
+        # empty arrays cannot be memory-mapped
+        return None
+
+    # the returned view keeps the memory map open
+    return np.asarray(np.memmap(path, dtype = dtype, mode = "r", offset = fid.tell(), \
+        shape = shape, order = "F" if fortran_order else "C"))
+
+
+def load_arrays(path, mmap_keys: tuple = ()) -> dict:
+
+    '''
+    Load the arrays of an .npz file written by :func:`save_arrays`.
+
+    The arrays named in mmap_keys are memory-mapped read-only instead of
+    being read into memory, if they are stored uncompressed and are not
+    empty. All other arrays are read into memory.
+    '''
+
+    arrays = {}
+
+    with np.load(path, allow_pickle = False) as npz, \
+        zipfile.ZipFile(path) as archive, open(path, "rb") as fid:
+
+        for info in archive.infolist():
+
+            key = info.filename[:-len(".npy")]
+
+            array = None
+
+            if key in mmap_keys and info.compress_type == zipfile.ZIP_STORED:
+
+                array = _memmap_member(path, fid, info)
+
+            arrays[key] = npz[key] if array is None else array
+
+    return arrays
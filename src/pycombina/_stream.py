@@ -0,0 +1,210 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import warnings
+import numpy as np
+from typing import Callable, Iterable, Iterator, Tuple
+
+from ._binary_approximation import BinApprox
+from ._combina_bnb import CombinaBnB
+from ._combina_sur import CombinaSUR
+from ._window_state import WindowState
+
+_solvers = {"sur": CombinaSUR, "bnb": CombinaBnB}
+
+
+def _setup_window(t: np.ndarray, b_rel: np.ndarray, setup: Callable) -> BinApprox:
+
+    with warnings.catch_warnings():
+
+        # the relaxed controls are checked per chunk, deviations from the
+        # SOS1 constraint are reported once for each window otherwise
+
+        warnings.simplefilter("ignore")
+
+        binapprox_w = BinApprox(t, b_rel, binary_threshold = 0.0)
+
+    if setup is not None:
+
+        setup(binapprox_w)
+
+    return binapprox_w
+
+
+def stream_round(chunks: Iterable, t_start: float, setup: Callable = None, \
+    solver: str = "sur", look_ahead: int = 200, commit_size: int = None, \
+    **kwargs) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+
+    '''
+    Round relaxed controls arriving as a stream of chunks, e. g., from live
+    measurements, on a moving window of bounded length.
+
+    Time intervals are collected in a buffer until look_ahead time
+    intervals are available. The problem on the buffer is solved and the
+    solution on the first commit_size time intervals is committed and
+    yielded, before the committed intervals are removed from the buffer.
+    At the end of the stream, the remaining time intervals are solved and
+    committed. The accumulated deviations, the active control, the used
+    switches and up-times as well as unfulfilled minimum up- and down-times
+    are carried over from one window to the next, so that the committed
+    solution fulfills the constraints over the whole stream, see also
+    :class:`pycombina.CombinaWindowed`. The memory required is proportional
+    to look_ahead and the size of the chunks, not to the length of the
+    stream.
+
+    Usage::
+
+        >>> from pycombina import stream_round
+
+        >>> def setup(binapprox):
+        ...     binapprox.set_n_max_switches([100, 100])
+        ...     binapprox.set_min_up_times([2.0, 2.0])
+
+        >>> for t, b_bin in stream_round(chunks, t_start = 0.0, setup = setup, \\
+        ...     solver = "sur", verbosity = 0):
+        ...     apply_controls(t, b_bin)
+
+    :param chunks: Iterable of tuples (t, b_rel), where b_rel of shape
+                   (n_c, k) contains the relaxed controls on k time
+                   intervals and t the k time points at the end of these
+                   intervals. The first interval of the stream starts at
+                   t_start, all further intervals at the end of their
+                   predecessor.
+
+    :param t_start: Start time of the stream.
+
+    :param setup: Function applied to the binary approximation problem on
+                  each window prior to solving, which specifies the
+                  constraints, e. g., the maximum number of switches and
+                  dwell times, the valid controls for time intervals or the
+                  control active prior to the stream. The maximum number of
+                  switches and the total maximum up-times apply to the
+                  whole stream and are taken from the first window.
+
+    :param solver: Solver applied on each window. *Default:* **sur**.
+                   *Options:* **sur** (:class:`pycombina.CombinaSUR`),
+                   **bnb** (:class:`pycombina.CombinaBnB`).
+
+    :param look_ahead: Number of time intervals per window.
+
+    :param commit_size: Number of time intervals committed per window,
+                        *Default:* half of look_ahead.
+
+    All further arguments are passed on to the solve() method of the
+    solver on each window. For **sur**, the strategy defaults to the
+    dwell-time-aware **sur_dt**, as plain Sum-Up-Rounding does not take the
+    constraints specified by setup into account.
+
+    :returns: Generator of tuples (t, b_bin), where b_bin contains the
+              committed binary controls and t the time points at the end
+              of the committed time intervals.
+    '''
+
+    if solver not in _solvers:
+
+        raise ValueError("solver must be one of " + \
+            ", ".join("'{}'".format(s) for s in _solvers) + ".")
+
+    if commit_size is None:
+
+        commit_size = max(look_ahead // 2, 1)
+
+    if not look_ahead >= 1:
+
+        raise ValueError("look_ahead must be a positive integer.")
+
+    if not 1 <= commit_size <= look_ahead:
+
+        raise ValueError("commit_size must be a positive integer " + \
+            "not bigger than look_ahead.")
+
+    if solver == "sur":
+
+        kwargs.setdefault("strategy", "sur_dt")
+
+    t_buffer = np.array([t_start], dtype = float)
+    b_rel_buffer = None
+
+    state = None
+
+    def commit(n_commit: int) -> Tuple[np.ndarray, np.ndarray]:
+
+        nonlocal state, t_buffer, b_rel_buffer
+
+        n_window = min(look_ahead, t_buffer.size - 1)
+
+        binapprox_w = _setup_window(t_buffer[:n_window+1], \
+            b_rel_buffer[:, :n_window], setup)
+
+        if state is None:
+
+            state = WindowState(binapprox_w)
+
+        state.apply(binapprox_w, state.n_switches_remaining)
+
+        _solvers[solver](binapprox_w).solve(**kwargs)
+
+        b_bin_w = np.asarray(binapprox_w.b_bin[:, :n_commit], dtype = int)
+
+        if not np.all(b_bin_w.sum(axis = 0) == 1):
+
+            raise RuntimeError("No feasible solution found for the window " + \
+                "starting at t = {}.".format(t_buffer[0]))
+
+        state.commit(t_buffer[:n_commit+1], b_rel_buffer[:, :n_commit], b_bin_w)
+
+        t_commit = t_buffer[1:n_commit+1]
+
+        t_buffer = t_buffer[n_commit:]
+        b_rel_buffer = b_rel_buffer[:, n_commit:]
+
+        return t_commit, b_bin_w
+
+
+    for t_chunk, b_rel_chunk in chunks:
+
+        t_chunk = np.atleast_1d(np.asarray(t_chunk, dtype = float))
+        b_rel_chunk = np.asarray(b_rel_chunk, dtype = float).reshape(-1, t_chunk.size)
+
+        if not np.all(np.diff(np.append(t_buffer[-1], t_chunk)) > 0):
+
+            raise ValueError("Time points of the stream must be strictly increasing.")
+
+        if not (np.all(b_rel_chunk >= 0) and np.all(b_rel_chunk <= 1)):
+
+            raise ValueError("All elements of the relaxed binary input " + \
+                "must be 0 <= b <= 1.")
+
+        # the buffer is copied on extension, so that committed time
+        # intervals are released
+
+        t_buffer = np.append(t_buffer, t_chunk)
+        b_rel_buffer = b_rel_chunk if b_rel_buffer is None else \
+            np.hstack([b_rel_buffer, b_rel_chunk])
+
+        while t_buffer.size - 1 >= look_ahead:
+
+            yield commit(commit_size)
+
+    while t_buffer.size > 1:
+
+        n_remaining = t_buffer.size - 1
+
+        yield commit(commit_size if n_remaining > look_ahead else n_remaining)
@@ -0,0 +1,234 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+
+from ._binary_approximation import BinApprox
+
+
+class WindowState():
+
+    '''
+    State of a binary approximation problem that is solved successively on
+    consecutive parts of its time horizon.
+
+    The state comprises the accumulated deviations, the active control, the
+    remaining switches, the accumulated up-times and the times of the last
+    activation and deactivation of the controls at the end of the committed
+    part of the time horizon. It is used to set up the problem on the next
+    part of the time horizon such that the committed solution and the
+    solution on the next part fulfill the constraints of the original
+    problem as handled by :class:`pycombina.CombinaBnB`.
+
+    :param binapprox: Original binary approximation problem
+
+    '''
+
+    def __init__(self, binapprox: BinApprox) -> None:
+
+        self._n_c = binapprox.n_c
+        self._tol = binapprox.dwell_time_tolerance
+
+        # dwell times are stored without the tolerance of the original problem
+
+        self._min_up_times = binapprox.min_up_times + self._tol
+        self._min_down_times = binapprox.min_down_times + self._tol
+        self._max_up_times = binapprox.max_up_times - self._tol
+        self._total_max_up_times = binapprox.total_max_up_times - self._tol
+
+        self._b_adjacencies = binapprox.b_adjacencies
+        self._cia_norm = binapprox.cia_norm
+
+        self._t = binapprox.t[0]
+        self._eta = np.array(binapprox.eta_pre, dtype = float)
+        self._eta_max = 0.0
+
+        b_bin_pre = np.asarray(binapprox.b_bin_pre)
+        self._b_active = int(np.argmax(b_bin_pre)) if b_bin_pre.sum() == 1 else None
+
+        self._n_switches_remaining = np.array(binapprox.n_max_switches, dtype = int)
+        self._up_times = np.zeros(self._n_c)
+
+        # the minimum up-time of the control active prior to the time horizon
+        # is considered fulfilled, while its up-time prior to the time horizon
+        # counts towards its maximum up-time
+
+        self._t_on = -np.inf
+        self._t_on_pre = binapprox.t[0] - binapprox.up_time_pre
+        self._t_off = np.full(self._n_c, -np.inf)
+
+
+    @property
+    def t(self) -> float:
+
+        '''Get the end of the committed part of the time horizon.'''
+
+        return self._t
+
+
+    @property
+    def eta(self) -> np.ndarray:
+
+        '''Get the accumulated deviations per control at the end of the committed part.'''
+
+        return self._eta
+
+
+    @property
+    def eta_max(self) -> float:
+
+        '''Get the maximum absolute accumulated deviation on the committed part.'''
+
+        return self._eta_max
+
+
+    @property
+    def b_bin_pre(self) -> np.ndarray:
+
+        '''Get the control active at the end of the committed part.'''
+
+        b_bin_pre = np.zeros(self._n_c, dtype = int)
+
+        if self._b_active is not None:
+
+            b_bin_pre[self._b_active] = 1
+
+        return b_bin_pre
+
+
+    @property
+    def n_switches_remaining(self) -> np.ndarray:
+
+        '''Get the number of switches per control that have not been used yet.'''
+
+        return self._n_switches_remaining
+
+
+    def apply(self, binapprox: BinApprox, n_max_switches: np.ndarray) -> None:
+
+        '''
+        Set up a binary approximation problem that starts at the end of the
+        committed part of the time horizon with the current state.
+
+        :param binapprox: Binary approximation problem on the next part of
+                          the time horizon.
+
+        :param n_max_switches: Maximum number of switches per control on
+                               the next part, which must not exceed the
+                               remaining switches.
+        '''
+
+        if not np.isclose(binapprox.t[0], self._t):
+
+            raise ValueError("The time horizon of binapprox must start at " + \
+                "the end of the committed part of the time horizon.")
+
+        binapprox.set_eta_pre(self._eta)
+        binapprox.set_b_bin_pre(self.b_bin_pre)
+        binapprox.set_cia_norm(self._cia_norm)
+
+        if self._n_c > 1:
+
+            for b_i in range(self._n_c):
+
+                binapprox.set_valid_control_transitions(b_i, self._b_adjacencies[:, b_i])
+
+        # the committed solution may exceed the maximum number of switches
+        # if it has been obtained by a solver that does not enforce it
+
+        binapprox.set_n_max_switches(np.maximum( \
+            np.minimum(n_max_switches, self._n_switches_remaining), 0))
+        binapprox.set_min_up_times(self._min_up_times)
+        binapprox.set_min_down_times(self._min_down_times)
+
+        # the current activation of the active control counts towards its
+        # maximum up-time on the next part, the up-times of all activations
+        # towards the total maximum up-times
+
+        binapprox.set_max_up_times(self._max_up_times)
+        binapprox.set_total_max_up_times(np.maximum(self._total_max_up_times - self._up_times, 0.0))
+        binapprox.set_up_time_pre(self._t - max(self._t_on, self._t_on_pre) \
+            if self._b_active is not None else 0.0)
+
+        # minimum up- and down-times that are not yet fulfilled are enforced
+        # by restricting the valid controls at the start of the time horizon
+
+        b_valid = np.array(binapprox.b_valid)
+        t = binapprox.t[:-1]
+
+        for i in range(self._n_c):
+
+            if i != self._b_active:
+
+                b_valid[i, t < self._t_off[i] + self._min_down_times[i] - self._tol] = 0
+
+        if self._b_active is not None:
+
+            idx_min_up = t < self._t_on + self._min_up_times[self._b_active] - self._tol
+            b_valid[:, idx_min_up] *= self.b_bin_pre[:, None]
+
+        binapprox.set_valid_controls(b_valid)
+
+
+    def commit(self, t: np.ndarray, b_rel: np.ndarray, b_bin: np.ndarray) -> None:
+
+        '''
+        Append a part of the binary solution to the committed part of the
+        time horizon and update the state accordingly.
+
+        :param t: Time points of the appended part, starting at the end of
+                  the committed part.
+
+        :param b_rel: Relaxed controls on the appended part.
+
+        :param b_bin: Binary controls on the appended part.
+        '''
+
+        t = np.asarray(t)
+        b_rel = np.asarray(b_rel)
+        b_bin = np.asarray(b_bin)
+
+        dt = np.diff(t)
+
+        eta = self._eta[:, None] + np.cumsum((b_rel - b_bin) * dt, axis = 1)
+
+        self._eta_max = max(self._eta_max, np.abs(eta).max())
+        self._eta = eta[:, -1]
+
+        self._up_times += (b_bin * dt).sum(axis = 1)
+
+        b_active = np.argmax(b_bin, axis = 0)
+
+        for k in np.flatnonzero(np.r_[True, b_active[1:] != b_active[:-1]]):
+
+            if self._b_active == b_active[k]:
+
+                continue
+
+            if self._b_active is not None:
+
+                self._n_switches_remaining[self._b_active] -= 1
+                self._n_switches_remaining[b_active[k]] -= 1
+                self._t_off[self._b_active] = t[k]
+
+            self._b_active = int(b_active[k])
+            self._t_on = t[k]
+
+        self._t = t[-1]
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import asyncio
+import tempfile
+import unittest
+import numpy as np
+from numpy.testing import assert_array_equal
+from unittest import mock
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pycombina import BinApprox, CombinaBnB, CombinaSUR, SolutionCache, SolveService
+
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.t = np.linspace(0, 10, 41)
+        b_rel = 0.5 + 0.45 * np.sin(self.t[:-1])
+        self.b_rel = np.vstack([b_rel, 1 - b_rel])
+
+
+    def binapprox(self, n_max_switches = [4, 4]):
+
+        binapprox = BinApprox(self.t, self.b_rel)
+        binapprox.set_n_max_switches(n_max_switches)
+
+        return binapprox
+
+
+    def test_key(self):
+
+        key = SolutionCache.key(self.binapprox(), "CombinaBnB")
+
+        self.assertEqual(key, SolutionCache.key(self.binapprox(), "CombinaBnB", \
+            {"verbosity": 0, "max_cpu_time": 10.0}))
+
+        for binapprox, solver, options in [(self.binapprox([4, 3]), "CombinaBnB", {}), \
+            (self.binapprox(), "CombinaSUR", {}), \
+            (self.binapprox(), "CombinaBnB", {"strategy": "bfs"})]:
+
+            self.assertNotEqual(key, SolutionCache.key(binapprox, solver, options))
+
+        with self.assertRaises(TypeError):
+            SolutionCache.key(self.binapprox(), "CombinaBnB", {"incumbent_callback": print})
+
+
+    def test_key_equal_problems(self):
+
+        # problems set up in different ways, but with equal properties
+
+        t = np.arange(11)
+        b_rel = np.vstack([np.linspace(0, 1, 10), np.linspace(1, 0, 10)])
+
+        key = SolutionCache.key(BinApprox(t, b_rel), "CombinaBnB")
+
+        binapprox = BinApprox(t.astype(float), b_rel)
+        binapprox.set_n_max_switches([10, 10])
+        binapprox.set_min_up_times([0.0, 0.0])
+        binapprox.set_cia_norm("max_norm")
+
+        self.assertEqual(key, SolutionCache.key(binapprox, "CombinaBnB"))
+
+        binapprox.set_cia_norm("column_sum_norm")
+
+        self.assertNotEqual(key, SolutionCache.key(binapprox, "CombinaBnB"))
+
+
+    def test_key_valid_controls(self):
+
+        from pycombina import SharedBinApprox
+
+        key = SolutionCache.key(self.binapprox(), "CombinaBnB")
+
+        binapprox = self.binapprox()
+        binapprox.set_valid_controls_for_interval((0, 2), [1, 0])
+        key_restricted = SolutionCache.key(binapprox, "CombinaBnB")
+
+        self.assertNotEqual(key, key_restricted)
+
+        # the valid controls of shared or memory-mapped problems are read-only
+
+        with SharedBinApprox(binapprox) as shared_binapprox:
+
+            self.assertEqual(key_restricted, \
+                SolutionCache.key(shared_binapprox, "CombinaBnB"))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+
+            path = os.path.join(tmpdir, "binapprox.npz")
+            binapprox.save(path)
+
+            binapprox_loaded = BinApprox.load(path, mmap = True)
+
+            self.assertEqual(key_restricted, \
+                SolutionCache.key(binapprox_loaded, "CombinaBnB"))
+
+            del binapprox_loaded
+
+
+    def test_solve(self):
+
+        cache = SolutionCache()
+
+        binapprox = self.binapprox()
+        status = cache.solve(CombinaBnB(binapprox), verbosity = 0)
+
+        binapprox_cached = self.binapprox()
+
+        combina_cached = CombinaBnB(binapprox_cached)
+
+        with mock.patch.object(CombinaBnB, "solve") as solve:
+
+            self.assertEqual(cache.solve(combina_cached, verbosity = 0), status)
+            solve.assert_not_called()
+
+        self.assertEqual(combina_cached.status, status)
+
+        assert_array_equal(binapprox_cached.b_bin, binapprox.b_bin)
+        self.assertEqual(binapprox_cached.eta, binapprox.eta)
+
+        self.assertEqual(cache.stats, {"memory_hits": 1, "disk_hits": 0, \
+            "misses": 1, "stores": 1, "hits": 1, "n_entries": 1})
+
+
+    def test_heuristic_not_stored(self):
+
+        # rounding heuristics do not prove optimality
+
+        cache = SolutionCache()
+
+        status = cache.solve(CombinaSUR(self.binapprox()), verbosity = 0)
+
+        self.assertEqual(status, "Solution found (constraints not enforced)")
+        self.assertEqual(cache.stats["stores"], 0)
+        self.assertEqual(cache.stats["misses"], 0)
+
+
+    def test_lru(self):
+
+        cache = SolutionCache(max_entries = 2)
+
+        for n_max_switches in [[2, 2], [3, 3], [2, 2], [4, 4]]:
+
+            cache.solve(CombinaBnB(self.binapprox(n_max_switches)), verbosity = 0)
+
+        # [3, 3] is the least recently used solution and has been evicted
+
+        cache.solve(CombinaBnB(self.binapprox([2, 2])), verbosity = 0)
+        cache.solve(CombinaBnB(self.binapprox([3, 3])), verbosity = 0)
+
+        self.assertEqual(cache.stats["memory_hits"], 2)
+        self.assertEqual(cache.stats["misses"], 4)
+        self.assertEqual(cache.stats["n_entries"], 2)
+
+
+    def test_disk(self):
+
+        with tempfile.TemporaryDirectory() as path:
+
+            binapprox = self.binapprox()
+            SolutionCache(path = path).solve(CombinaBnB(binapprox), verbosity = 0)
+
+            cache = SolutionCache(path = path)
+            binapprox_cached = self.binapprox()
+            cache.solve(CombinaBnB(binapprox_cached), verbosity = 0)
+
+            assert_array_equal(binapprox_cached.b_bin, binapprox.b_bin)
+            self.assertEqual(cache.stats["disk_hits"], 1)
+
+            # a single solution exceeds the maximum size, so that all
+            # solutions are removed from disk, but kept in memory
+
+            cache = SolutionCache(path = path, max_disk_size = 1)
+            cache.solve(CombinaBnB(self.binapprox([3, 3])), verbosity = 0)
+
+            self.assertEqual(len(os.listdir(path)), 0)
+            self.assertEqual(cache.stats["n_entries"], 1)
+
+
+    def test_service(self):
+
+        problem_definition = {"t": self.t.tolist(), "b_rel": self.b_rel.tolist(), \
+            "n_max_switches": [4, 4]}
+
+        async def solve_twice(service):
+
+            return [await service.solve(problem_definition) for _ in range(2)]
+
+        async def run():
+
+            with ThreadPoolExecutor(max_workers = 1) as executor:
+
+                service = SolveService(executor = executor, cache = cache)
+                await service.start(port = 0)
+
+                async with service:
+
+                    return await solve_twice(service)
+
+        cache = SolutionCache()
+        (status, response), (status_cached, response_cached) = asyncio.run(run())
+
+        self.assertEqual((status, status_cached), (200, 200))
+        assert_array_equal(response_cached["b_bin"], response["b_bin"])
+        self.assertEqual(response_cached["eta"], response["eta"])
+        self.assertEqual(cache.stats["hits"], 1)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -212,10 +212,11 @@ class CombinaTestSingleInputMILP(unittest.TestCase, CombinaTestSingleInput):
         try:
             from pycombina import CombinaMILP
 
+            combina = CombinaMILP(self.binapprox, solver = "gurobi")
+
         except ImportError:
             self.skipTest(self, "CombinaMILP not available, skipping tests.")
 
-        combina = CombinaMILP(self.binapprox)
         combina.solve()
 
         self.b_bin_check = np.array(
@@ -242,3 +243,489 @@ class CombinaTestSingleInputMILP(unittest.TestCase, CombinaTestSingleInput):
             1., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0.,
             0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0.,
             0., 0., 0., 0., 0., 0., 0.])
+
+
+class CombinaTestMILPHiGHS(unittest.TestCase):
+
+    def setUp(self):
+
+        try:
+            from pycombina import CombinaMILP
+
+        except ImportError:
+            self.skipTest("CombinaMILP not available, skipping tests.")
+
+        t = np.arange(0, 31)
+        b_rel = np.vstack([0.5 + 0.5 * np.sin(t[:-1] / 3.0), 0.5 - 0.5 * np.sin(t[:-1] / 3.0)])
+
+        self.binapprox = BinApprox(t, b_rel)
+        self.binapprox.set_n_max_switches([4, 4])
+        self.binapprox.set_min_up_times([2.5, 1.5])
+
+
+    def test_objective_equals_bnb(self):
+
+        from pycombina import CombinaBnB, CombinaMILP
+
+        CombinaBnB(self.binapprox).solve(verbosity = 0)
+        eta_bnb = self.binapprox.eta
+
+        combina = CombinaMILP(self.binapprox, solver = "highs")
+        combina.solve(highs_opts = {"mip_rel_gap": 0.0})
+
+        self.assertEqual(combina.status, "Optimal solution found")
+        self.assertAlmostEqual(self.binapprox.eta, eta_bnb, 6)
+
+
+    def test_cia_norms(self):
+
+        from pycombina import CombinaMILP
+
+        for cia_norm in ["max_norm", "column_sum_norm", "row_sum_norm"]:
+
+            self.binapprox.set_cia_norm(cia_norm)
+
+            CombinaMILP(self.binapprox, solver = "highs").solve()
+
+            evaluation = self.binapprox.evaluate(self.binapprox.b_bin)
+
+            self.assertTrue(evaluation["feasible"][0])
+            self.assertAlmostEqual(self.binapprox.eta, \
+                evaluation["eta_norms"][cia_norm][0], 6)
+
+
+    def test_warm_start_ignored(self):
+
+        from pycombina import CombinaMILP
+
+        # HiGHS cannot use a warm start, so that no rounding heuristic is run
+
+        combina = CombinaMILP(self.binapprox, solver = "highs")
+        combina._run_rounding_heuristic = None
+
+        with self.assertWarns(UserWarning):
+            combina.solve(use_warm_start = True)
+
+        self.assertEqual(combina.status, "Optimal solution found")
+
+
+    def test_compact_switching_formulation(self):
+
+        from pycombina import CombinaMILP
+
+        self.binapprox.set_min_down_times([0.0, 2.5])
+
+        combina = CombinaMILP(self.binapprox, solver = "highs")
+        combina.solve(highs_opts = {"mip_rel_gap": 0.0})
+        eta_standard = self.binapprox.eta
+
+        combina_compact = CombinaMILP(self.binapprox, solver = "highs", \
+            switching_formulation = "compact")
+        combina_compact.solve(highs_opts = {"mip_rel_gap": 0.0})
+
+        self.assertTrue(self.binapprox.evaluate(self.binapprox.b_bin)["feasible"][0])
+        self.assertAlmostEqual(self.binapprox.eta, eta_standard, 6)
+        self.assertLess(combina_compact.model_size[1], combina.model_size[1])
+
+        with self.assertRaises(ValueError):
+            CombinaMILP(self.binapprox, solver = "highs", switching_formulation = "tight")
+
+
+    def test_approximation_constraints_linear_size(self):
+
+        from pycombina import CombinaMILP
+
+        for n_t in [30, 300]:
+
+            t = np.arange(0, n_t + 1)
+            b_rel = np.vstack([0.5 + 0.5 * np.sin(t[:-1] / 3.0), 0.5 - 0.5 * np.sin(t[:-1] / 3.0)])
+
+            combina = CombinaMILP(BinApprox(t, b_rel), solver = "highs")
+
+            rows = combina._milp._rows[combina._approximation_constraints[0]:][:2]
+            A = combina._milp._A[rows[0]:rows[1]]
+
+            self.assertEqual(A.shape[0], 2 * n_t)
+            self.assertLessEqual(A.nnz, 3 * 2 * n_t)
+
+
+    def test_update_b_rel(self):
+
+        from pycombina import CombinaMILP
+
+        combina = CombinaMILP(self.binapprox, solver = "highs")
+        combina.solve()
+
+        b_rel = self.binapprox.b_rel[::-1].copy()
+
+        combina.update_b_rel(b_rel)
+        combina.update_b_bin_pre([0, 1])
+        combina.solve()
+
+        binapprox = BinApprox(self.binapprox.t, b_rel)
+        binapprox.set_n_max_switches([4, 4])
+        binapprox.set_min_up_times([2.5, 1.5])
+        binapprox.set_b_bin_pre([0, 1])
+
+        CombinaMILP(binapprox, solver = "highs").solve()
+
+        self.assertAlmostEqual(self.binapprox.eta, binapprox.eta, 6)
+
+        with self.assertRaises(ValueError):
+            combina.update_b_rel(b_rel[:, :-1])
+
+
+class CombinaTestSwitchLimitsBnB(unittest.TestCase):
+
+    T = np.arange(5.0)
+
+
+    def check_eta(self, binapprox):
+
+        self.assertAlmostEqual(binapprox.eta, \
+            binapprox.evaluate(binapprox.b_bin)["eta"][0], 10)
+
+
+    def test_continue_b_bin_pre_without_switches(self):
+
+        from pycombina import CombinaBnB
+
+        # continuing b_bin_pre is not a switch, previously no solution
+        # was found for a control without switches active prior to t_0
+
+        binapprox = BinApprox(self.T, [[0.5] * 4, [0.5] * 4])
+        binapprox.set_n_max_switches([0, 2])
+        binapprox.set_b_bin_pre([1, 0])
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+
+        assert_array_equal(binapprox.b_bin, [[1, 1, 1, 1], [0, 0, 0, 0]])
+        self.assertAlmostEqual(binapprox.eta, 2.0, 10)
+        self.check_eta(binapprox)
+
+
+    def test_switch_off_b_bin_pre(self):
+
+        from pycombina import CombinaBnB
+
+        # switching off b_bin_pre uses one switch of both controls,
+        # which is unchanged
+
+        binapprox = BinApprox(self.T, [[0.2] * 4, [0.8] * 4])
+        binapprox.set_n_max_switches([1, 1])
+        binapprox.set_b_bin_pre([1, 0])
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+
+        assert_array_equal(binapprox.b_bin, [[0, 0, 0, 0], [1, 1, 1, 1]])
+        self.check_eta(binapprox)
+
+
+    def test_control_without_switches(self):
+
+        from pycombina import CombinaBnB
+
+        # the deviation of a control without switches enters the objective,
+        # previously it was ignored and an objective of 1.1 was reported
+
+        binapprox = BinApprox(self.T, [[0.4] * 4, [0.3] * 4, [0.3] * 4])
+        binapprox.set_n_max_switches([0, 4, 4])
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+
+        assert_array_equal(binapprox.b_bin[0, :], 0)
+        self.assertAlmostEqual(binapprox.eta, 1.6, 10)
+        self.check_eta(binapprox)
+
+
+
+    def test_last_switch_respects_valid_controls(self):
+
+        from pycombina import CombinaBnB
+
+        # a control activated by its last switch stays active until the end
+        # of the time horizon, which is now checked against the valid
+        # controls, previously control 1 was activated on all intervals
+
+        binapprox = BinApprox(self.T, [[0.2] * 4, [0.8] * 4])
+        binapprox.set_n_max_switches([1, 1])
+        binapprox.set_b_bin_pre([1, 0])
+        binapprox.set_valid_controls_for_interval((3, 4), [1, 0])
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+
+        assert_array_equal(binapprox.b_bin, [[1, 1, 1, 1], [0, 0, 0, 0]])
+        self.assertTrue(binapprox.evaluate(binapprox.b_bin)["feasible"][0])
+        self.check_eta(binapprox)
+
+
+    def test_continue_b_bin_pre_respects_valid_controls(self):
+
+        from pycombina import CombinaBnB
+
+        # continuing b_bin_pre without switches is infeasible if the control
+        # is invalid later on, so that no solution is found
+
+        binapprox = BinApprox(self.T, [[0.5] * 4, [0.5] * 4])
+        binapprox.set_n_max_switches([0, 2])
+        binapprox.set_b_bin_pre([1, 0])
+        binapprox.set_valid_controls_for_interval((3, 4), [0, 1])
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+
+        assert_array_equal(binapprox.b_bin, 0)
+
+
+    def test_initial_upper_bound_attained(self):
+
+        from pycombina import CombinaBnB
+
+        # the only solution attains the trivial bound max(|eta_pre|) + t_f - t_0
+        # and is not pruned, as the initial upper bound is doubled
+
+        binapprox = BinApprox(self.T, [[1.0] * 4, [0.0] * 4])
+        binapprox.set_valid_controls_for_interval((0, 4), [0, 1])
+        binapprox.set_eta_pre([0.0, -1.0])
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+
+        assert_array_equal(binapprox.b_bin, [[0, 0, 0, 0], [1, 1, 1, 1]])
+        self.assertAlmostEqual(binapprox.eta, 5.0, 10)
+        self.check_eta(binapprox)
+
+
+class CombinaTestWarmStartBnB(unittest.TestCase):
+
+    def setUp(self):
+
+        self.binapprox = BinApprox(CombinaTestSingleInput.T, \
+            CombinaTestSingleInput.b_rel, binary_threshold = 1e-3)
+        self.binapprox.set_n_max_switches(CombinaTestSingleInput.n_max_switches)
+
+
+    def test_warm_start_from_optimum(self):
+
+        from pycombina import CombinaBnB
+
+        CombinaBnB(self.binapprox).solve(verbosity = 0)
+        b_bin = self.binapprox.b_bin.copy()
+        eta = self.binapprox.eta
+
+        CombinaBnB(self.binapprox).solve(use_warm_start = True, verbosity = 0)
+
+        self.assertAlmostEqual(self.binapprox.eta, eta, 10)
+        assert_array_equal(self.binapprox.b_bin, b_bin)
+
+
+    def test_incumbent_callback(self):
+
+        from pycombina import CombinaBnB
+
+        incumbents = []
+
+        CombinaBnB(self.binapprox).solve(verbosity = 0, \
+            incumbent_callback = lambda eta, b_bin: incumbents.append((eta, b_bin)))
+
+        eta = [eta for eta, _ in incumbents]
+
+        self.assertTrue(len(incumbents) > 0)
+        self.assertTrue(np.all(np.diff(eta) < 0))
+        self.assertAlmostEqual(eta[-1], self.binapprox.eta, 10)
+        assert_array_equal(incumbents[-1][1], self.binapprox.b_bin)
+
+
+    def test_warm_start_improved(self):
+
+        from pycombina import CombinaBnB
+
+        b_bin = np.zeros(self.binapprox.b_rel.shape)
+        b_bin[1, :] = 1
+        self.binapprox.set_b_bin(b_bin)
+
+        CombinaBnB(self.binapprox).solve(use_warm_start = True, verbosity = 0)
+        eta = self.binapprox.eta
+
+        CombinaBnB(self.binapprox).solve(verbosity = 0)
+
+        self.assertAlmostEqual(eta, self.binapprox.eta, 10)
+
+
+    def test_warm_start_without_solution(self):
+
+        from pycombina import CombinaBnB
+
+        with self.assertRaises(RuntimeError):
+            CombinaBnB(self.binapprox).solve(use_warm_start = True, verbosity = 0)
+
+
+class CombinaTestMultilevel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+
+        from pycombina import CombinaMultilevel
+
+        self.binapprox = BinApprox(CombinaTestSingleInput.T, \
+            CombinaTestSingleInput.b_rel, binary_threshold = 1e-3)
+        self.binapprox.set_n_max_switches(CombinaTestSingleInput.n_max_switches)
+        self.binapprox.set_min_up_times([2400.0, 0.0])
+
+        self.combina = CombinaMultilevel(self.binapprox, n_t_coarse = 40, \
+            refinement_factor = 3)
+        self.combina.solve(verbosity = 0)
+
+
+    def test_check_levels(self):
+
+        self.assertEqual(self.combina.n_levels, 3)
+
+        eta_levels = self.combina.eta_levels
+
+        self.assertTrue(np.all(np.diff(eta_levels[1:]) <= 1e-10))
+        self.assertEqual(self.combina.status, "Optimal solution found")
+
+
+    def test_check_objective(self):
+
+        b_bin = self.binapprox.b_bin
+        dt = self.binapprox.dt
+
+        eta_check = np.abs(np.cumsum((self.binapprox.b_rel - b_bin) * dt, axis = 1)).max()
+
+        self.assertAlmostEqual(self.binapprox.eta, eta_check, 6)
+
+
+    def test_check_constraints(self):
+
+        b_active, t_start = self.binapprox.switching_sequence
+
+        self.assertTrue(np.count_nonzero(b_active == 0) <= 3)
+
+        t_end = np.append(self.binapprox.t[t_start[1:]], self.binapprox.t[-1])
+        up_times = t_end - self.binapprox.t[t_start]
+
+        self.assertTrue(np.all(up_times[b_active == 0] >= 2400.0))
+
+
+    def test_eta_pre(self):
+
+        from pycombina import CombinaMultilevel
+
+        binapprox = BinApprox(CombinaTestSingleInput.T, \
+            CombinaTestSingleInput.b_rel, binary_threshold = 1e-3)
+        binapprox.set_n_max_switches(CombinaTestSingleInput.n_max_switches)
+        binapprox.set_eta_pre([500.0, -500.0])
+
+        CombinaMultilevel(binapprox, n_t_coarse = 40, refinement_factor = 3).solve(verbosity = 0)
+
+        self.assertAlmostEqual(binapprox.eta, \
+            binapprox.evaluate(binapprox.b_bin)["eta"][0], 6)
+
+
+class CombinaTestWindowed(unittest.TestCase):
+
+    def setUp(self):
+
+        self.binapprox = BinApprox(CombinaTestSingleInput.T, \
+            CombinaTestSingleInput.b_rel, binary_threshold = 1e-3)
+        self.binapprox.set_n_max_switches(CombinaTestSingleInput.n_max_switches)
+
+
+    def test_single_window(self):
+
+        from pycombina import CombinaBnB, CombinaWindowed
+
+        combina = CombinaWindowed(self.binapprox, window_size = self.binapprox.n_t)
+        combina.solve(verbosity = 0)
+
+        self.assertEqual(combina.n_windows, 1)
+        eta = self.binapprox.eta
+
+        CombinaBnB(self.binapprox).solve(verbosity = 0)
+
+        self.assertAlmostEqual(eta, self.binapprox.eta, 10)
+
+
+    def test_check_objective_and_switches(self):
+
+        from pycombina import CombinaWindowed
+
+        for switch_policy in CombinaWindowed.get_switch_policies():
+
+            combina = CombinaWindowed(self.binapprox, window_size = 60, \
+                commit_size = 20, switch_policy = switch_policy)
+            combina.solve(verbosity = 0)
+
+            b_bin = self.binapprox.b_bin
+
+            eta_check = np.abs(np.cumsum((self.binapprox.b_rel - b_bin) \
+                * self.binapprox.dt, axis = 1)).max()
+            n_switches = np.sum(np.absolute(b_bin[0, 1:] - b_bin[0, :-1]))
+
+            self.assertAlmostEqual(self.binapprox.eta, eta_check, 6)
+            self.assertTrue(n_switches <= CombinaTestSingleInput.n_max_switches[0])
+            assert_array_equal(b_bin.sum(axis = 0), 1)
+
+
+    def test_active_control_without_switches(self):
+
+        from pycombina import CombinaWindowed
+
+        # control 1 has no switches left after the first windows, but cannot
+        # be continued until the end of the time horizon, which is reported
+        # instead of returning an infeasible solution
+
+        binapprox = BinApprox(np.arange(13.0), [[0.1] * 12, [0.9] * 12])
+        binapprox.set_n_max_switches([1, 1])
+        binapprox.set_b_bin_pre([1, 0])
+        binapprox.set_valid_controls_for_interval((11, 12), [1, 0])
+
+        combina = CombinaWindowed(binapprox, window_size = 4, commit_size = 2, \
+            switch_policy = "greedy")
+
+        with self.assertRaises(RuntimeError):
+            combina.solve(verbosity = 0)
+
+        # without the restriction, control 1 stays active until the end
+
+        binapprox.set_valid_controls(np.ones((2, 12)))
+        combina.solve(verbosity = 0)
+
+        assert_array_equal(binapprox.b_bin, [[0] * 12, [1] * 12])
+        self.assertTrue(binapprox.evaluate(binapprox.b_bin)["feasible"][0])
+
+
+    def test_max_up_times(self):
+
+        from pycombina import CombinaWindowed
+
+        # the current activation of the active control at the end of the
+        # committed part counts towards its maximum up-time on the next
+        # window, while later activations may use the full maximum up-time
+
+        np.random.seed(0)
+        b_rel = np.random.rand(40)
+
+        binapprox = BinApprox(np.arange(41.0), [b_rel, 1 - b_rel])
+        binapprox.set_max_up_times([3.0, 4.0])
+        binapprox.set_b_bin_pre([1, 0])
+        binapprox.set_up_time_pre(1.0)
+
+        CombinaWindowed(binapprox, window_size = 10, commit_size = 5).solve(verbosity = 0)
+
+        self.assertTrue(binapprox.evaluate(binapprox.b_bin)["feasible"][0])
+
+
+    def test_eta_pre(self):
+
+        from pycombina import CombinaBnB
+
+        eta_pre = np.array([150.0, -150.0])
+
+        self.binapprox.set_eta_pre(eta_pre)
+        CombinaBnB(self.binapprox).solve(verbosity = 0)
+
+        eta_check = np.abs(eta_pre[:, None] + np.cumsum((self.binapprox.b_rel \
+            - self.binapprox.b_bin) * self.binapprox.dt, axis = 1)).max()
+
+        self.assertAlmostEqual(self.binapprox.eta, eta_check, 6)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+import numpy as np
+from numpy.testing import assert_array_equal, assert_allclose
+
+from pycombina import BinApprox
+
+
+class EvaluationTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.binapprox = BinApprox(np.arange(7.0), np.full((2, 6), 0.5))
+
+        # control 1 is active on the first two and the last two intervals
+
+        self.b_bin = np.array([[0, 0, 1, 1, 0, 0], [1, 1, 0, 0, 1, 1]])
+
+
+    def test_check_objective(self):
+
+        self.binapprox.set_eta_pre([0.25, -0.25])
+
+        b_bin_batch = np.array([self.b_bin, 1 - self.b_bin])
+        evaluation = self.binapprox.evaluate(b_bin_batch)
+
+        eta = np.abs(np.array([0.25, -0.25])[None, :, None] + \
+            np.cumsum(0.5 - b_bin_batch, axis = 2))
+
+        assert_allclose(evaluation["eta_norms"]["max_norm"], eta.max(axis = (1, 2)))
+        assert_allclose(evaluation["eta_norms"]["column_sum_norm"], eta.sum(axis = 1).max(axis = 1))
+        assert_allclose(evaluation["eta_norms"]["row_sum_norm"], eta.sum(axis = 2).max(axis = 1))
+        assert_allclose(evaluation["eta"], evaluation["eta_norms"]["max_norm"])
+        assert_array_equal(evaluation["feasible"], [True, True])
+
+
+    def test_single_solution(self):
+
+        evaluation = self.binapprox.evaluate(self.b_bin)
+
+        self.assertEqual(evaluation["eta"].shape, (1,))
+
+
+    def test_invalid_dimensions(self):
+
+        with self.assertRaises(ValueError):
+            self.binapprox.evaluate(self.b_bin[:, :-1])
+
+
+    def test_check_n_max_switches(self):
+
+        self.binapprox.set_n_max_switches([2, 2])
+        self.assertEqual(self.binapprox.evaluate(self.b_bin)["violations"]["n_max_switches"][0], 0)
+
+        # the switch from the control active prior to the time horizon counts
+
+        self.binapprox.set_b_bin_pre([1, 0])
+        evaluation = self.binapprox.evaluate(self.b_bin)
+
+        self.assertEqual(evaluation["violations"]["n_max_switches"][0], 2)
+        self.assertFalse(evaluation["feasible"][0])
+
+
+    def test_check_min_up_and_down_times(self):
+
+        self.binapprox.set_min_up_times([3.0, 2.0])
+        self.binapprox.set_min_down_times([0.0, 3.0])
+
+        violations = self.binapprox.evaluate(self.b_bin)["violations"]
+
+        self.assertEqual(violations["min_up_times"][0], 1)
+        self.assertEqual(violations["min_down_times"][0], 1)
+
+        # activations continued from prior to or reaching the end of the
+        # time horizon are not bound by the minimum up-times
+
+        self.binapprox.set_min_up_times([2.0, 3.0])
+        self.binapprox.set_min_down_times([0.0, 2.0])
+        self.binapprox.set_b_bin_pre([0, 1])
+
+        violations = self.binapprox.evaluate(self.b_bin)["violations"]
+
+        self.assertEqual(violations["min_up_times"][0], 0)
+        self.assertEqual(violations["min_down_times"][0], 0)
+
+
+    def test_check_max_up_times(self):
+
+        self.binapprox.set_max_up_times([3.0, 1.5])
+        self.binapprox.set_total_max_up_times([6.0, 3.0])
+
+        violations = self.binapprox.evaluate([self.b_bin, 1 - self.b_bin])["violations"]
+
+        assert_array_equal(violations["max_up_times"], [2, 1])
+        assert_array_equal(violations["total_max_up_times"], [1, 0])
+
+
+    def test_max_up_times_as_in_solvers(self):
+
+        from pycombina import CombinaBnB, CombinaSUR
+
+        # the maximum up-times apply to each activation, so that activations
+        # of control 0 of two intervals are feasible, while the accumulated
+        # up-time exceeds the maximum up-time
+
+        b_rel = np.tile([[0.9, 0.9, 0.1, 0.1], [0.1, 0.1, 0.9, 0.9]], 3)
+        binapprox = BinApprox(np.arange(13.0), b_rel)
+        binapprox.set_max_up_times([2.0, 12.0])
+
+        b_bin = np.tile([[1, 1, 0, 0], [0, 0, 1, 1]], 3)
+        self.assertTrue(binapprox.evaluate(b_bin)["feasible"][0])
+
+        b_bin[:, 2] = [1, 0]
+        self.assertEqual(binapprox.evaluate(b_bin)["violations"]["max_up_times"][0], 1)
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+
+        assert_array_equal(binapprox.b_bin, np.tile([[1, 1, 0, 0], [0, 0, 1, 1]], 3))
+        self.assertTrue(binapprox.evaluate(binapprox.b_bin)["feasible"][0])
+
+        combina = CombinaSUR(binapprox)
+        combina.solve(strategy = "sur_dt", verbosity = 0)
+
+        self.assertEqual(binapprox.evaluate(binapprox.b_bin)["feasible"][0], \
+            combina.status == "Feasible solution found")
+
+        # the activation of the control active prior to the time horizon
+        # includes its up-time prior to the time horizon
+
+        binapprox.set_b_bin_pre([1, 0])
+        b_bin = np.tile([[1, 1, 0, 0], [0, 0, 1, 1]], 3)
+
+        self.assertTrue(binapprox.evaluate(b_bin)["feasible"][0])
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+
+        assert_array_equal(binapprox.b_bin, b_bin)
+
+        binapprox.set_up_time_pre(1.0)
+
+        self.assertEqual(binapprox.evaluate(b_bin)["violations"]["max_up_times"][0], 1)
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+
+        self.assertEqual(binapprox.b_bin[0, 1], 0)
+        self.assertTrue(binapprox.evaluate(binapprox.b_bin)["feasible"][0])
+
+        self.assertRaises(ValueError, binapprox.set_up_time_pre, -1.0)
+
+
+    def test_check_valid_controls_and_transitions(self):
+
+        b_valid = np.ones((2, 6), dtype = int)
+        b_valid[0, 3] = 0
+
+        self.binapprox.set_valid_controls(b_valid)
+        self.binapprox.set_valid_control_transitions(0, [1, 0])
+
+        b_bin = self.b_bin.copy()
+        b_bin[:, 5] = 0
+
+        violations = self.binapprox.evaluate(b_bin)["violations"]
+
+        self.assertEqual(violations["b_valid"][0], 1)
+        self.assertEqual(violations["b_adjacencies"][0], 1)
+        self.assertEqual(violations["sos1"][0], 1)
+
+
+    def test_check_bnb_solution(self):
+
+        try:
+            from pycombina import CombinaBnB
+
+        except ImportError:
+            self.skipTest("CombinaBnB not available, skipping test.")
+
+        np.random.seed(3)
+        b_rel = np.random.rand(3, 60)
+        b_rel /= b_rel.sum(axis = 0)
+
+        binapprox = BinApprox(np.linspace(0.0, 6.0, 61), b_rel)
+        binapprox.set_n_max_switches([3, 3, 3])
+        binapprox.set_min_up_times([0.5, 0.5, 0.5])
+        binapprox.set_min_down_times([0.3, 0.3, 0.3])
+        binapprox.set_valid_control_transitions(0, [1, 1, 0])
+
+        CombinaBnB(binapprox).solve(verbosity = 0)
+        evaluation = binapprox.evaluate(binapprox.b_bin)
+
+        self.assertTrue(evaluation["feasible"][0])
+        self.assertAlmostEqual(evaluation["eta"][0], binapprox.eta, 10)
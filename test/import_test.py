@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+import subprocess
+import unittest
+
+import pycombina
+
+
+class ImportTest(unittest.TestCase):
+
+    def test_solvers_imported_on_first_use(self):
+
+        # a fresh interpreter is required, as the solvers might have been
+        # imported by other tests already
+
+        code = "import sys, pycombina; print(sorted(m for m in sys.modules " + \
+            "if m.startswith(('pycombina._combina', 'scipy', 'gurobipy'))))"
+
+        output = subprocess.run([sys.executable, "-c", code], check = True, \
+            capture_output = True, text = True, env = dict(os.environ, \
+                PYTHONPATH = os.pathsep.join(sys.path))).stdout
+
+        self.assertEqual(output.strip(), "[]")
+
+
+    def test_is_available(self):
+
+        self.assertEqual(pycombina.is_available("CombinaSUR"), \
+            hasattr(pycombina, "CombinaSUR"))
+
+        if pycombina.is_available("CombinaBnB"):
+
+            from pycombina import CombinaBnB
+            self.assertIs(pycombina.CombinaBnB, CombinaBnB)
+
+        with self.assertRaises(ValueError):
+            pycombina.is_available("BinApprox")
+
+
+    def test_unknown_attribute(self):
+
+        with self.assertRaises(AttributeError):
+            pycombina.CombinaUnknown
+
+        with self.assertRaises(ImportError):
+            from pycombina import CombinaUnknown
+
+
+    def test_dir(self):
+
+        self.assertTrue(set(pycombina.__all__) <= set(dir(pycombina)))
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -17,6 +17,8 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with pycombina. If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import tempfile
 import unittest
 import warnings
 
@@ -105,6 +107,128 @@ class InputTest(unittest.TestCase):
         self.assertRaises(ValueError, BinApprox, T, b_rel)
 
 
+    def test_set_valid_controls(self):
+
+        T = np.array([0, 1, 2, 3])
+        b_rel = np.array([[0.1, 0.3, 0.3], [0.9, 0.7, 0.7]])
+        binapprox = BinApprox(T, b_rel)
+
+        binapprox.set_valid_controls([[1, 0, 1], [1, 1, 0]])
+        np.testing.assert_array_equal(binapprox.b_valid, [[1, 0, 1], [1, 1, 0]])
+
+        self.assertRaises(ValueError, binapprox.set_valid_controls, [[1, 0], [1, 1]])
+        self.assertRaises(ValueError, binapprox.set_valid_controls, [[1, 0, 2], [1, 1, 0]])
+
+
+    def test_b_rel_copy(self):
+
+        T = np.array([0, 1, 2, 3])
+        b_rel = np.array([[0.0001, 0.3, 0.3], [0.9999, 0.7, 0.7]])
+
+        binapprox = BinApprox(T, b_rel, copy = True)
+
+        np.testing.assert_array_equal(binapprox.b_rel, [[0, 0.3, 0.3], [1, 0.7, 0.7]])
+        np.testing.assert_array_equal(b_rel, [[0.0001, 0.3, 0.3], [0.9999, 0.7, 0.7]])
+        self.assertFalse(np.shares_memory(binapprox.b_rel, b_rel))
+
+        binapprox = BinApprox(T, b_rel, copy = False)
+
+        np.testing.assert_array_equal(b_rel, [[0, 0.3, 0.3], [1, 0.7, 0.7]])
+        self.assertTrue(np.shares_memory(binapprox.b_rel, b_rel))
+
+
+    def test_b_rel_read_only(self):
+
+        T = np.array([0, 1, 2, 3])
+        b_rel = np.array([[0.1, 0.3, 0.3], [0.9, 0.7, 0.7]])
+        b_rel.flags.writeable = False
+
+        binapprox = BinApprox(T, b_rel)
+        self.assertTrue(np.shares_memory(binapprox.b_rel, b_rel))
+
+        binapprox = BinApprox(T, b_rel.T)
+        self.assertTrue(np.shares_memory(binapprox.b_rel, b_rel))
+
+        binapprox.set_valid_controls_for_interval((0, 1), [1, 0])
+        np.testing.assert_array_equal(binapprox.b_valid, [[1, 1, 1], [0, 1, 1]])
+
+        b_rel = np.array([[0.0001, 0.3, 0.3], [0.9999, 0.7, 0.7]])
+        b_rel.flags.writeable = False
+
+        binapprox = BinApprox(T, b_rel)
+
+        np.testing.assert_array_equal(binapprox.b_rel, [[0, 0.3, 0.3], [1, 0.7, 0.7]])
+        self.assertFalse(np.shares_memory(binapprox.b_rel, b_rel))
+
+
+    def test_save_load(self):
+
+        T = np.array([0, 1, 2, 3])
+        b_rel = np.array([[0.1, 0.3, 0.3], [0.9, 0.7, 0.7]])
+
+        binapprox = BinApprox(T, b_rel)
+        binapprox.set_n_max_switches([1, 2])
+        binapprox.set_min_up_times([1.5, 0])
+        binapprox.set_eta_pre([0.1, -0.1])
+        binapprox.set_up_time_pre(2.5)
+        binapprox.set_valid_controls_for_interval((0, 1), [0, 1])
+        binapprox.set_valid_control_transitions(0, [0, 1])
+        binapprox.set_cia_norm("column_sum_norm")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+
+            path = os.path.join(tmpdir, "binapprox.npz")
+            binapprox.save(path)
+
+            for mmap in [True, False]:
+
+                binapprox_loaded = BinApprox.load(path, mmap = mmap)
+
+                for attribute in ["t", "b_rel", "b_valid", "b_adjacencies", \
+                    "n_max_switches", "min_up_times", "min_down_times", \
+                    "max_up_times", "total_max_up_times", "b_bin_pre", "eta_pre"]:
+
+                    np.testing.assert_array_equal(getattr(binapprox_loaded, attribute), \
+                        getattr(binapprox, attribute))
+
+                self.assertEqual(binapprox_loaded.up_time_pre, 2.5)
+                self.assertEqual(binapprox_loaded.cia_norm, "column_sum_norm")
+                self.assertEqual(binapprox_loaded.b_rel.flags.writeable, not mmap)
+
+                binapprox_loaded.set_valid_controls_for_interval((1, 2), [1, 0])
+                np.testing.assert_array_equal(binapprox_loaded.b_valid, [[0, 1, 1], [1, 0, 1]])
+
+            del binapprox_loaded
+
+
+    def test_save_load_mmap_resave(self):
+
+        T = np.array([0, 1, 2, 3])
+        b_rel = np.array([[0.1, 0.3, 0.3], [0.9, 0.7, 0.7]])
+
+        binapprox = BinApprox(T, b_rel)
+        binapprox.set_valid_controls_for_interval((0, 1), [0, 1])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+
+            path = os.path.join(tmpdir, "binapprox.npz")
+            binapprox.save(path)
+
+            # the restricted valid controls are read-only after loading,
+            # but must be kept when saving the problem again
+
+            binapprox_loaded = BinApprox.load(path, mmap = True)
+            self.assertFalse(binapprox_loaded.b_valid.flags.writeable)
+
+            path_resaved = os.path.join(tmpdir, "binapprox_resaved.npz")
+            binapprox_loaded.save(path_resaved)
+
+            binapprox_resaved = BinApprox.load(path_resaved)
+            np.testing.assert_array_equal(binapprox_resaved.b_valid, [[0, 1, 1], [1, 1, 1]])
+
+            del binapprox_loaded, binapprox_resaved
+
+
 if __name__ == '__main__':
 
     unittest.main()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import unittest
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from pycombina import BinApprox, CombinaBnB, CombinaMPC
+
+
+class MPCTest(unittest.TestCase):
+
+    n_horizon = 12
+    n_steps = 24
+
+    def setUp(self):
+
+        self.t = np.linspace(0, 9, self.n_horizon + self.n_steps + 1)
+
+        b_rel = 0.5 + 0.45 * np.sin(2 * self.t[:-1])
+        self.b_rel = np.vstack([b_rel, 0.6 * (1 - b_rel), 0.4 * (1 - b_rel)])
+
+
+    def setup_binapprox(self, t, b_rel):
+
+        binapprox = BinApprox(t, b_rel)
+
+        binapprox.set_n_max_switches([6, 6, 4])
+        binapprox.set_min_up_times([0.5, 0.5, 0.5])
+        binapprox.set_min_down_times([0.5, 0.5, 0.5])
+        binapprox.set_b_bin_pre([0, 0, 1])
+
+        return binapprox
+
+
+    def run_mpc(self, use_warm_start):
+
+        n = self.n_horizon
+
+        mpc = CombinaMPC(self.setup_binapprox(self.t[:n+1], self.b_rel[:, :n]), \
+            use_warm_start = use_warm_start)
+
+        b_bin = []
+
+        for k in range(self.n_steps):
+
+            mpc.solve(verbosity = 0)
+            b_bin.append(mpc.b_bin[:, 0])
+
+            mpc.shift(self.t[n+k+1], self.b_rel[:, n+k])
+
+        return mpc, np.array(b_bin).T
+
+
+    def test_applied_solution_feasible(self):
+
+        for use_warm_start in [True, False]:
+
+            mpc, b_bin = self.run_mpc(use_warm_start)
+
+            binapprox = self.setup_binapprox(self.t[:self.n_steps+1], \
+                self.b_rel[:, :self.n_steps])
+
+            evaluation = binapprox.evaluate(b_bin)
+
+            self.assertTrue(evaluation["feasible"][0])
+            self.assertAlmostEqual(evaluation["eta"][0], mpc.eta_max)
+
+            assert_array_equal(mpc.binapprox.t, self.t[self.n_steps:])
+
+
+    def test_warm_start_with_few_switches(self):
+
+        # the solver is shifted along with the horizon and warm-started
+        # while the switches are used up, which must yield the solutions
+        # of a solver set up anew on each horizon
+
+        n = self.n_horizon
+
+        binapprox = self.setup_binapprox(self.t[:n+1], self.b_rel[:, :n])
+        binapprox.set_n_max_switches([2, 2, 1])
+
+        mpc = CombinaMPC(binapprox)
+        mpc.solve(verbosity = 0)
+
+        bnb_solver = mpc._combina._bnb_solver
+
+        for k in range(self.n_steps):
+
+            mpc.shift(self.t[n+k+1], self.b_rel[:, n+k])
+
+            self.assertRaises(RuntimeError, getattr, mpc, "b_bin")
+
+            binapprox_h = copy.deepcopy(mpc.binapprox)
+            CombinaBnB(binapprox_h).solve(verbosity = 0)
+
+            mpc.solve(verbosity = 0)
+
+            self.assertIs(mpc._combina._bnb_solver, bnb_solver)
+            self.assertAlmostEqual(mpc.binapprox.eta, binapprox_h.eta)
+            self.assertTrue(mpc.binapprox.evaluate(mpc.b_bin)["feasible"][0])
+
+        self.assertLessEqual(mpc._state.n_switches_remaining.sum(), 1)
+
+
+    def test_binary_threshold(self):
+
+        # the appended relaxed controls are clamped as those of the
+        # original problem
+
+        binapprox = BinApprox(np.arange(5.0), [[0.5, 0.995, 0.5, 0.5], \
+            [0.5, 0.005, 0.5, 0.5]], binary_threshold = 1e-2)
+
+        mpc = CombinaMPC(binapprox)
+        mpc.solve(verbosity = 0)
+        mpc.shift([5.0, 6.0], [[0.995, 0.4], [0.005, 0.6]])
+
+        assert_array_equal(mpc.binapprox.b_rel, [[0.5, 0.5, 1.0, 0.4], \
+            [0.5, 0.5, 0.0, 0.6]])
+
+
+    def test_invalid_shift(self):
+
+        n = self.n_horizon
+
+        mpc = CombinaMPC(self.setup_binapprox(self.t[:n+1], self.b_rel[:, :n]))
+
+        self.assertRaises(RuntimeError, mpc.shift, self.t[n+1], self.b_rel[:, n])
+
+        mpc.solve(verbosity = 0)
+
+        self.assertRaises(ValueError, mpc.shift, self.t[n-1], self.b_rel[:, n])
+        self.assertRaises(ValueError, mpc.shift, self.t[n+1:2*n+2], self.b_rel[:, n:2*n+1])
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import warnings
+import unittest
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from pycombina._binary_approximation import BinApprox, BinApproxPreprocessed
+
+
+def setup_binapprox(reduce_problem_size_before_solve):
+
+    np.random.seed(7)
+
+    T = np.linspace(0, 10, 121)
+    b_rel = np.random.rand(3, T.size-1)
+    b_rel[2, :] = 0.0
+    b_rel /= b_rel.sum(axis = 0)
+
+    binapprox = BinApprox(T, b_rel, \
+        reduce_problem_size_before_solve = reduce_problem_size_before_solve)
+
+    binapprox.set_n_max_switches([6, 6, 6])
+    binapprox.set_valid_controls_for_interval((2.0, 5.0), [1, 0, 0])
+    binapprox.set_valid_controls_for_interval((5.0, 6.0), [0, 1, 0])
+    binapprox.set_valid_controls_for_interval((7.0, 8.0), [0, 1, 1])
+
+    return binapprox
+
+
+class PreprocessingTest(unittest.TestCase):
+
+    def test_forced_intervals_merged(self):
+
+        binapprox_p = BinApproxPreprocessed(setup_binapprox(True))
+
+        # control 2 is inactive, so 36 + 12 + 12 forced intervals are
+        # merged into three
+        self.assertEqual(binapprox_p.n_t, 120 - 35 - 11 - 11)
+        self.assertEqual(binapprox_p.n_c, 2)
+        self.assertAlmostEqual(binapprox_p.dt.sum(), 10.0)
+
+
+    def test_no_reduction_without_flag(self):
+
+        binapprox_p = BinApproxPreprocessed(setup_binapprox(False))
+
+        self.assertEqual(binapprox_p.n_t, 120)
+
+
+    def test_no_reduction_for_sum_norms(self):
+
+        for cia_norm in ["row_sum_norm", "column_sum_norm"]:
+
+            binapprox = setup_binapprox(True)
+            binapprox.set_cia_norm(cia_norm)
+
+            self.assertEqual(BinApproxPreprocessed(binapprox).n_t, 120)
+
+
+    def test_column_sum_norm_optimum(self):
+
+        from pycombina import CombinaMILP
+
+        # the deviations of the controls change in opposite directions on
+        # the forced intervals, as b_rel does not sum up to one, so that
+        # the maximum of their sum is attained within the forced intervals
+
+        def setup(reduce_problem_size_before_solve):
+
+            np.random.seed(5)
+
+            b_rel = np.random.rand(3, 12) * np.random.uniform(0.1, 1.0, 12)
+            b_rel[0, :3] = 0.9
+
+            binapprox = BinApprox(np.arange(13.0), b_rel, \
+                reduce_problem_size_before_solve = reduce_problem_size_before_solve)
+
+            binapprox.set_n_max_switches([3, 3, 3])
+            binapprox.set_valid_controls_for_interval((0.0, 3.0), [0, 1, 0])
+            binapprox.set_valid_controls_for_interval((3.0, 9.0), [1, 0, 0])
+            binapprox.set_cia_norm("column_sum_norm")
+
+            CombinaMILP(binapprox, solver = "highs").solve( \
+                highs_opts = {"mip_rel_gap": 0.0})
+
+            return binapprox
+
+        with warnings.catch_warnings():
+
+            warnings.simplefilter("ignore")
+
+            binapprox_full = setup(False)
+            binapprox_reduced = setup(True)
+
+        self.assertAlmostEqual(binapprox_reduced.eta, binapprox_full.eta, 6)
+        self.assertAlmostEqual(binapprox_reduced.eta, \
+            binapprox_reduced.evaluate(binapprox_reduced.b_bin)["eta"][0], 6)
+
+
+    def test_reduction_preserves_optimum(self):
+
+        from pycombina import CombinaBnB
+
+        binapprox_full = setup_binapprox(False)
+        CombinaBnB(binapprox_full).solve(verbosity = 0)
+
+        binapprox_reduced = setup_binapprox(True)
+        CombinaBnB(binapprox_reduced).solve(verbosity = 0)
+
+        self.assertAlmostEqual(binapprox_full.eta, binapprox_reduced.eta, 10)
+        self.assertEqual(binapprox_reduced.b_bin.shape, (3, 120))
+        assert_array_equal(binapprox_reduced.b_bin.sum(axis = 0), 1)
+
+        idx_forced = (binapprox_reduced.t[:-1] >= 2.0) & (binapprox_reduced.t[:-1] < 5.0)
+        assert_array_equal(binapprox_reduced.b_bin[0, idx_forced], 1)
+
+        b_active, t_start = binapprox_reduced.switching_sequence
+        assert_array_equal(np.repeat(b_active, np.diff(np.append(t_start, 120))), \
+            np.argmax(binapprox_reduced.b_bin, axis = 0))
+
+
+
+    def test_incumbents_inflated(self):
+
+        from pycombina import CombinaBnB
+
+        binapprox = setup_binapprox(True)
+        incumbents = []
+
+        CombinaBnB(binapprox).solve(verbosity = 0, \
+            incumbent_callback = lambda eta, b_bin: incumbents.append(b_bin))
+
+        self.assertEqual(incumbents[-1].shape, (3, 120))
+        assert_array_equal(incumbents[-1], binapprox.b_bin)
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+import unittest
+import urllib.error
+import urllib.request
+import numpy as np
+from numpy.testing import assert_array_equal
+from unittest import mock
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pycombina import BinApprox, CombinaBnB, SolveService
+
+
+def stdout_name():
+
+    print("output of a worker")
+
+    return sys.stdout.name
+
+
+class ServiceTest(unittest.TestCase):
+
+    def setUp(self):
+
+        t = np.linspace(0, 10, 51)
+        b_rel = 0.5 + 0.45 * np.sin(t[:-1])
+
+        self.problem_definition = {"t": t.tolist(), \
+            "b_rel": np.vstack([b_rel, 1 - b_rel]).tolist(), \
+            "n_max_switches": [6, 6], "solver": "CombinaSUR"}
+
+        self.executor = ThreadPoolExecutor(max_workers = 2)
+
+
+    def tearDown(self):
+
+        self.executor.shutdown()
+
+
+    def run_service(self, coroutine, **kwargs):
+
+        async def run():
+
+            # the service listens on a free port, as the default port may
+            # still be held by the worker processes of a previous service
+
+            service = SolveService(executor = self.executor, **kwargs)
+            await service.start(port = 0)
+
+            async with service:
+
+                return await coroutine(service)
+
+        return asyncio.run(run())
+
+
+    def test_solve(self):
+
+        status, response = self.run_service(lambda service: \
+            service.solve(self.problem_definition))
+
+        self.assertEqual(status, 200)
+        self.assertIsNone(response["errors"])
+
+        binapprox = BinApprox(self.problem_definition["t"], self.problem_definition["b_rel"])
+        binapprox.set_n_max_switches([6, 6])
+
+        from pycombina import CombinaSUR
+        CombinaSUR(binapprox).solve(verbosity = 0)
+
+        assert_array_equal(response["b_bin"], binapprox.b_bin)
+        self.assertAlmostEqual(response["eta"], binapprox.eta)
+
+
+    def test_invalid_problem(self):
+
+        for key, value in [("b_rel", [[2.0]]), ("solver", "CombinaUnknown"), \
+            ("timeout", -1.0), ("n_max_switches", "many")]:
+
+            problem_definition = dict(self.problem_definition, **{key: value})
+
+            status, response = self.run_service(lambda service: \
+                service.solve(problem_definition))
+
+            self.assertEqual(status, 400)
+            self.assertIsNotNone(response["errors"])
+
+        del self.problem_definition["t"]
+
+        status, response = self.run_service(lambda service: \
+            service.solve(self.problem_definition))
+
+        self.assertEqual(status, 400)
+
+
+    def test_backpressure_and_deadline(self):
+
+        release = threading.Event()
+
+        def blocking_solve(problem_definition, time_limit):
+
+            release.wait(5.0)
+            return 200, {}
+
+        async def solve_concurrently(service):
+
+            tasks = [asyncio.ensure_future(service.solve( \
+                dict(self.problem_definition, timeout = timeout))) \
+                for timeout in [0.3, 0.1, 1.0]]
+
+            await asyncio.sleep(0.05)
+            n_running, n_queued = service.n_running, service.n_queued
+
+            try:
+                return n_running, n_queued, [await task for task in tasks]
+
+            finally:
+                release.set()
+
+        with mock.patch("pycombina._service.solve_problem", blocking_solve):
+
+            n_running, n_queued, results = self.run_service(solve_concurrently, \
+                max_workers = 1, max_queue_size = 1)
+
+        self.assertEqual((n_running, n_queued), (1, 1))
+
+        # the first problem exceeds its deadline while solving, the second
+        # one while waiting in the queue, the third one is rejected
+
+        self.assertEqual([status for status, _ in results], [504, 504, 503])
+
+
+    def test_queue_full(self):
+
+        release = threading.Event()
+
+        def blocking_solve(problem_definition, time_limit):
+
+            release.wait(5.0)
+            return 200, {}
+
+        async def solve_concurrently(service):
+
+            running = asyncio.ensure_future(service.solve(self.problem_definition))
+            await asyncio.sleep(0.05)
+
+            rejected = await service.solve(self.problem_definition)
+            release.set()
+
+            return rejected, await running
+
+        with mock.patch("pycombina._service.solve_problem", blocking_solve):
+
+            rejected, accepted = self.run_service(solve_concurrently, \
+                max_workers = 1, max_queue_size = 0)
+
+        self.assertEqual(rejected[0], 503)
+        self.assertEqual(accepted[0], 200)
+
+
+    def test_http(self):
+
+        def request(url, data = None):
+
+            try:
+                with urllib.request.urlopen(url, data = data) as response:
+                    return response.status, json.loads(response.read())
+
+            except urllib.error.HTTPError as err:
+                return err.code, json.loads(err.read())
+
+        async def post(service):
+
+            url = "http://{}:{}/api/".format(*service.address)
+            loop = asyncio.get_running_loop()
+
+            return [await loop.run_in_executor(None, request, *args) for args in [ \
+                (url + "solve/", json.dumps(self.problem_definition).encode()), \
+                (url + "solve/", b"{"), (url + "solve/",), (url + "unknown/",), \
+                (url + "status/",)]]
+
+        async def run():
+
+            service = SolveService(executor = self.executor, max_request_size = 2**16)
+            await service.start(port = 0)
+
+            try:
+                return await post(service)
+
+            finally:
+                await service.close()
+
+        results = asyncio.run(run())
+
+        self.assertEqual([status for status, _ in results], [200, 400, 405, 404, 200])
+        self.assertEqual(np.asarray(results[0][1]["b_bin"]).shape, (2, 50))
+        self.assertEqual(results[4][1]["n_running"], 0)
+
+
+    def test_switching_sequence(self):
+
+        status, response = self.run_service(lambda service: service.solve( \
+            dict(self.problem_definition, solution_format = "switching_sequence")))
+
+        self.assertEqual(status, 200)
+        self.assertIsNone(response["b_bin"])
+
+        binapprox = BinApprox(self.problem_definition["t"], self.problem_definition["b_rel"])
+        binapprox.set_b_bin(self.run_service(lambda service: \
+            service.solve(self.problem_definition))[1]["b_bin"])
+
+        assert_array_equal(response["b_active"], binapprox.switching_sequence[0])
+        assert_array_equal(response["t_start"], binapprox.switching_sequence[1])
+
+        status, response = self.run_service(lambda service: service.solve( \
+            dict(self.problem_definition, solution_format = "run_length")))
+
+        self.assertEqual(status, 400)
+
+
+    def test_npz(self):
+
+        def request(url, data, headers):
+
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, data = data, \
+                    headers = headers)) as response:
+
+                    return response.status, response.headers["Content-Type"], response.read()
+
+            except urllib.error.HTTPError as err:
+                return err.code, err.headers["Content-Type"], err.read()
+
+        content = io.BytesIO()
+        np.savez(content, **{key: np.asarray(value) for key, value \
+            in self.problem_definition.items()})
+
+        headers = {"Content-Type": "application/x-npz", "Accept": "application/x-npz"}
+
+        async def post(service):
+
+            url = "http://{}:{}/api/solve/".format(*service.address)
+            loop = asyncio.get_running_loop()
+
+            return [await loop.run_in_executor(None, request, *args) for args in [ \
+                (url, content.getvalue(), headers), \
+                (url, content.getvalue(), {"Content-Type": "application/x-npz"}), \
+                (url, b"no archive", headers)]]
+
+        async def run():
+
+            service = SolveService(executor = self.executor)
+            await service.start(port = 0)
+
+            try:
+                return await post(service)
+
+            finally:
+                await service.close()
+
+        (status, content_type, content), (status_json, content_type_json, content_json), \
+            (status_invalid, _, content_invalid) = asyncio.run(run())
+
+        self.assertEqual((status, content_type), (200, "application/x-npz"))
+        self.assertEqual((status_json, content_type_json), (200, "application/json"))
+
+        with np.load(io.BytesIO(content)) as response:
+
+            self.assertEqual(response["b_bin"].dtype, np.uint8)
+            assert_array_equal(response["b_bin"], json.loads(content_json)["b_bin"])
+            self.assertEqual(str(response["solver"]), "CombinaSUR")
+            self.assertNotIn("errors", response.files)
+
+        self.assertEqual(status_invalid, 400)
+
+        with np.load(io.BytesIO(content_invalid)) as response:
+            self.assertIn("npz", str(response["errors"]))
+
+
+    def test_process_pool(self):
+
+        async def solve(service):
+
+            return await service.solve(dict(self.problem_definition, solver = "CombinaBnB"))
+
+        async def run():
+
+            service = SolveService(max_workers = 1)
+            await service.start(port = 0)
+
+            async with service:
+
+                return await solve(service)
+
+        status, response = asyncio.run(run())
+
+        self.assertEqual(status, 200)
+        self.assertEqual(response["solver"], "CombinaBnB")
+
+
+    def test_worker_output_discarded(self):
+
+        executor = SolveService(max_workers = 1)._get_executor()
+
+        try:
+            self.assertEqual(executor.submit(stdout_name).result(), os.devnull)
+
+        finally:
+            executor.shutdown()
+
+
+    def test_max_workers(self):
+
+        with mock.patch("pycombina._service._available_processors", return_value = 2):
+
+            self.assertEqual(SolveService(max_workers = 4)._max_workers, 2)
+            self.assertEqual(SolveService(executor = self.executor)._max_workers, 2)
+            self.assertEqual(SolveService(max_workers = 1)._max_workers, 1)
+            self.assertEqual(SolveService()._max_workers, 2)
+
+
+    def test_setup_time_subtracted(self):
+
+        from pycombina._service import solve_problem
+
+        time_limits = []
+        init, run = CombinaBnB.__init__, CombinaBnB.solve
+
+        def slow_init(combina, binapprox):
+
+            time.sleep(0.2)
+            init(combina, binapprox)
+
+        def solve(combina, **kwargs):
+
+            time_limits.append(kwargs["max_cpu_time"])
+            run(combina, **kwargs)
+
+        with mock.patch.object(CombinaBnB, "__init__", slow_init), \
+            mock.patch.object(CombinaBnB, "solve", solve):
+
+            status, _ = solve_problem(dict(self.problem_definition, solver = "CombinaBnB"), 1.0)
+
+        self.assertEqual(status, 200)
+        self.assertLess(time_limits[0], 0.8 + 1e-3)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import pickle
+import unittest
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from concurrent.futures import ProcessPoolExecutor
+
+from pycombina import BinApprox, SharedBinApprox
+
+
+def solve_shared(shared_binapprox, solver):
+
+    from pycombina import CombinaBnB, CombinaSUR
+
+    combina = {"bnb": CombinaBnB, "sur": CombinaSUR}[solver](shared_binapprox)
+    combina.solve(verbosity = 0)
+
+    if isinstance(shared_binapprox, SharedBinApprox):
+
+        return shared_binapprox.binapprox.b_bin, shared_binapprox.binapprox.eta
+
+    return shared_binapprox.b_bin, shared_binapprox.eta
+
+
+class SharedTest(unittest.TestCase):
+
+    def setUp(self):
+
+        T = np.linspace(0, 4, 101)
+        b_rel = 0.5 + 0.4 * np.sin(T[:-1])
+
+        self.binapprox = BinApprox(T, np.vstack([b_rel, 1 - b_rel]))
+        self.binapprox.set_n_max_switches([2, 2])
+        self.binapprox.set_min_up_times([0.4, 0.2])
+        self.binapprox.set_valid_controls_for_interval((0, 0.4), [1, 0])
+
+
+    def test_pickle(self):
+
+        with SharedBinApprox(self.binapprox) as shared_binapprox:
+
+            data = pickle.dumps(shared_binapprox)
+            self.assertLess(len(data), self.binapprox.b_rel.nbytes)
+
+            binapprox = pickle.loads(data).binapprox
+
+            for attribute in ["t", "b_rel", "b_valid", "n_max_switches", \
+                "min_up_times", "b_adjacencies"]:
+
+                assert_array_equal(getattr(binapprox, attribute), \
+                    getattr(self.binapprox, attribute))
+
+            self.assertFalse(binapprox.b_rel.flags.writeable)
+
+        # attached problems remain valid after the block is released
+        assert_array_equal(binapprox.b_rel, self.binapprox.b_rel)
+        self.assertRaises(RuntimeError, shared_binapprox.unlink)
+
+
+    def test_process_pool(self):
+
+        for solver in ["bnb", "sur"]:
+
+            with SharedBinApprox(self.binapprox) as shared_binapprox, \
+                ProcessPoolExecutor(max_workers = 2) as executor:
+
+                b_bin, eta = executor.submit(solve_shared, shared_binapprox, solver).result()
+
+            b_bin_check, eta_check = solve_shared(self.binapprox, solver)
+
+            assert_array_equal(b_bin, b_bin_check)
+            self.assertAlmostEqual(eta, eta_check)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of pycombina.
+#
+# Copyright 2017-2018 Adrian Bürger, Clemens Zeile, Sebastian Sager, Moritz Diehl
+#
+# pycombina is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pycombina is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pycombina. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from pycombina import BinApprox, CombinaSUR, stream_round
+
+
+class StreamTest(unittest.TestCase):
+
+    n_t = 150
+
+    def setUp(self):
+
+        self.t = np.linspace(0, 15, self.n_t + 1)
+
+        b_rel = 0.5 + 0.45 * np.sin(self.t[:-1])
+        self.b_rel = np.vstack([b_rel, 0.7 * (1 - b_rel), 0.3 * (1 - b_rel)])
+
+
+    @staticmethod
+    def setup(binapprox):
+
+        binapprox.set_n_max_switches([12, 12, 8])
+        binapprox.set_min_up_times([0.5, 0.5, 0.5])
+        binapprox.set_b_bin_pre([1, 0, 0])
+
+
+    def chunks(self, chunk_size):
+
+        for k in range(0, self.n_t, chunk_size):
+
+            yield self.t[k+1:k+chunk_size+1], self.b_rel[:, k:k+chunk_size]
+
+
+    def stream(self, chunk_size, **kwargs):
+
+        t, b_bin = zip(*stream_round(self.chunks(chunk_size), t_start = self.t[0], \
+            setup = self.setup, verbosity = 0, **kwargs))
+
+        return np.concatenate(t), np.hstack(b_bin)
+
+
+    def test_sur_matches_full_horizon(self):
+
+        # Sum-Up-Rounding does not depend on the future, so that the
+        # streamed solution equals the solution on the full horizon
+
+        for strategy in ["sur", "sur_dt"]:
+
+            t, b_bin = self.stream(7, look_ahead = 20, commit_size = 5, \
+                strategy = strategy)
+
+            binapprox = BinApprox(self.t, self.b_rel)
+            self.setup(binapprox)
+            CombinaSUR(binapprox).solve(strategy = strategy, verbosity = 0)
+
+            assert_array_equal(t, self.t[1:])
+            assert_array_equal(b_bin, binapprox.b_bin)
+
+
+    def test_default_strategy(self):
+
+        # the default strategy takes the constraints of setup into account
+
+        t, b_bin = self.stream(11, look_ahead = 30)
+
+        binapprox = BinApprox(self.t, self.b_rel)
+        self.setup(binapprox)
+
+        self.assertTrue(binapprox.evaluate(b_bin)["feasible"][0])
+
+
+    def test_constraints_fulfilled(self):
+
+        binapprox = BinApprox(self.t, self.b_rel)
+        self.setup(binapprox)
+
+        for solver, strategy in [("sur", "sur_dt"), ("bnb", "dfs")]:
+
+            t, b_bin = self.stream(11, solver = solver, strategy = strategy, \
+                look_ahead = 30)
+
+            assert_array_equal(t, self.t[1:])
+            self.assertTrue(binapprox.evaluate(b_bin)["feasible"][0])
+
+
+    def test_invalid_input(self):
+
+        self.assertRaises(ValueError, list, stream_round(self.chunks(5), \
+            t_start = self.t[0], solver = "milp"))
+        self.assertRaises(ValueError, list, stream_round(self.chunks(5), \
+            t_start = self.t[0], look_ahead = 5, commit_size = 6))
+        self.assertRaises(ValueError, list, stream_round(self.chunks(5), \
+            t_start = self.t[1]))
+
+
+if __name__ == '__main__':
+
+    unittest.main()